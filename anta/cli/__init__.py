@@ -10,19 +10,25 @@ from __future__ import annotations
 
 import logging
 import pathlib
-from typing import Any, Callable, Literal
+from typing import Any, Callable, Literal, Optional
 
 import click
 
 from anta import __version__
-from anta.cli.debug import commands as debug_commands
-from anta.cli.exec import commands as exec_commands
-from anta.cli.get import commands as get_commands
 from anta.cli.nrfu import commands as check_commands
-from anta.cli.utils import AliasedGroup, IgnoreRequiredWithHelp, parse_catalog, parse_inventory
+from anta.cli.utils import AliasedGroup, IgnoreRequiredWithHelp, parse_catalog, parse_inventory, parse_tags, replay_inventory
+from anta.device import DEFAULT_MAX_BATCH_SIZE, DEFAULT_PROBE_TIMEOUT
+from anta.facts import DEFAULT_FACTS_CACHE_TTL
 from anta.loader import setup_logging
+from anta.models import AntaCommand
+from anta.output_cache import DEFAULT_OUTPUT_CACHE_SIZE, DEFAULT_OUTPUT_CACHE_TTL
+from anta.rate_limit import DEFAULT_CIRCUIT_BREAKER_THRESHOLD, DEFAULT_MAX_RETRIES
 from anta.result_manager import ResultManager
+from anta.result_manager.columnar import ColumnarResults
 from anta.result_manager.models import TestResult
+from anta.result_manager.sinks import JsonLinesSink, ResultSink
+from anta.runner import DEFAULT_MAX_CONCURRENCY, DEFAULT_MAX_DEVICE_CONCURRENCY
+from anta.state import DEFAULT_STATE_MAX_AGE, StateStore
 
 
 @click.group(cls=IgnoreRequiredWithHelp)
@@ -105,6 +111,80 @@ from anta.result_manager.models import TestResult
 )
 @click.option("--ignore-status", help="Always exit with success", show_envvar=True, is_flag=True, default=False)
 @click.option("--ignore-error", help="Only report failures and not errors", show_envvar=True, is_flag=True, default=False)
+@click.option(
+    "--facts-cache",
+    help="Directory of the device facts cache. Cached facts (hardware model, EOS version, serial number) are used instead of querying the devices.",
+    show_envvar=True,
+    type=click.Path(file_okay=False, dir_okay=True, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--facts-cache-ttl",
+    help="Time in seconds a device facts cache entry is valid",
+    default=DEFAULT_FACTS_CACHE_TTL,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--output-cache",
+    help="Directory of the command output cache. Cached outputs are used instead of sending the commands to the devices again.",
+    show_envvar=True,
+    type=click.Path(file_okay=False, dir_okay=True, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--output-cache-ttl",
+    help="Time in seconds a command output cache entry is valid",
+    default=DEFAULT_OUTPUT_CACHE_TTL,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--output-cache-size",
+    help="Maximum number of entries in the command output cache. The least recently used entries are evicted.",
+    default=DEFAULT_OUTPUT_CACHE_SIZE,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--rate-limit",
+    help="Maximum number of eAPI requests per second sent to each device. The rate is reduced while a device is overloaded.",
+    show_envvar=True,
+    type=click.FloatRange(min=0, min_open=True),
+)
+@click.option(
+    "--max-retries",
+    help="Maximum number of retries of an eAPI request when a device is overloaded (HTTP 429 or 503) or cannot be connected to in time",
+    default=DEFAULT_MAX_RETRIES,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--circuit-breaker-threshold",
+    help="Number of consecutive connection failures after which no request is sent to a device for a while. 0 disables the circuit breaker.",
+    default=DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--max-batch-size",
+    help="Maximum number of commands sent to a device in a single eAPI request",
+    default=DEFAULT_MAX_BATCH_SIZE,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--probe-timeout",
+    help="Timeout in seconds of the reachability probe run before connecting to the devices. It does not depend on '--timeout'.",
+    default=DEFAULT_PROBE_TIMEOUT,
+    show_envvar=True,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+)
 def anta(
     ctx: click.Context, inventory: pathlib.Path, log_level: Literal["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"], log_file: pathlib.Path, **kwargs: Any
 ) -> None:
@@ -132,6 +212,7 @@ def anta(
 
     ctx.ensure_object(dict)
     ctx.obj["inventory"] = parse_inventory(ctx, inventory)
+    ctx.obj["probe_timeout"] = ctx.params["probe_timeout"]
 
 
 @anta.group("nrfu", cls=IgnoreRequiredWithHelp)
@@ -145,23 +226,160 @@ def anta(
     required=True,
     callback=parse_catalog,
 )
-def _nrfu(ctx: click.Context, catalog: list[tuple[Callable[..., TestResult], dict[Any, Any]]]) -> None:
+@click.option(
+    "--catalog-cache",
+    help="Directory of the catalog cache. The parsed catalog is saved in this directory and reused while the catalog file does not change.",
+    show_envvar=True,
+    type=click.Path(file_okay=False, dir_okay=True, writable=True, path_type=pathlib.Path),
+    # Processed before --catalog which uses this cache
+    is_eager=True,
+)
+@click.option(
+    "--max-concurrency",
+    help="Maximum number of collections or tests running concurrently for all the devices",
+    default=DEFAULT_MAX_CONCURRENCY,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--max-device-concurrency",
+    help="Maximum number of collections or tests running concurrently on a single device",
+    default=DEFAULT_MAX_DEVICE_CONCURRENCY,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--jsonl",
+    help="Stream the test results to a JSON lines file while the tests are running",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--columnar",
+    help="Save the test results in a columnar file: Parquet if the 'pyarrow' Python package is installed, gzip-compressed JSON otherwise",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--compact-results",
+    help="Store the test results in a compact representation to reduce memory usage while the tests are running",
+    show_envvar=True,
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--save-outputs",
+    help="Save the commands outputs to this directory. Outputs are released from memory once a test is completed: use this option to keep them.",
+    show_envvar=True,
+    type=click.Path(file_okay=False, dir_okay=True, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--replay",
+    help="Run the tests against the commands outputs recorded in this snapshot directory or archive instead of the devices. "
+    "The snapshot can be created with 'anta exec snapshot' or '--save-outputs'.",
+    show_envvar=True,
+    type=click.Path(file_okay=True, dir_okay=True, exists=True, readable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--state-dir",
+    help="Run the tests incrementally using the state saved in this directory: a test only depending on the configuration is not run again "
+    "if the device fingerprint (EOS version, running configuration, interfaces status) and the test inputs have not changed since the previous run.",
+    show_envvar=True,
+    type=click.Path(file_okay=False, dir_okay=True, writable=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--state-max-age",
+    help="Time in seconds a test result saved in the state directory can be reused",
+    default=DEFAULT_STATE_MAX_AGE,
+    show_envvar=True,
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--state-commands",
+    help="Comma separated list of the commands used to compute the device fingerprint with '--state-dir', collected in JSON format. "
+    "Replaces the default commands, e.g. to avoid collecting the full running configuration.",
+    show_envvar=True,
+    type=str,
+    callback=parse_tags,
+)
+def _nrfu(
+    ctx: click.Context,
+    catalog: list[tuple[Callable[..., TestResult], dict[Any, Any]]],
+    catalog_cache: Optional[pathlib.Path],
+    max_concurrency: int,
+    max_device_concurrency: int,
+    jsonl: Optional[pathlib.Path],
+    columnar: Optional[pathlib.Path],
+    compact_results: bool,
+    save_outputs: Optional[pathlib.Path],
+    replay: Optional[pathlib.Path],
+    state_dir: Optional[pathlib.Path],
+    state_max_age: int,
+    state_commands: Optional[list[str]],
+) -> None:
+    # pylint: disable=too-many-arguments
     """Run NRFU against inventory devices"""
+    # The catalog cache is used by the parse_catalog() callback of --catalog
+    del catalog_cache
     ctx.obj["catalog"] = catalog
-    ctx.obj["result_manager"] = ResultManager()
+    if replay is not None and not ctx.obj.get("_anta_help"):
+        ctx.obj["inventory"] = replay_inventory(ctx, ctx.obj["inventory"], replay)
+    ctx.obj["spool_dir"] = save_outputs
+    fingerprint_commands = [AntaCommand(command=command.strip()) for command in state_commands] if state_commands is not None else None
+    ctx.obj["state_store"] = StateStore(state_dir, max_age=state_max_age, commands=fingerprint_commands) if state_dir is not None else None
+    sinks: list[ResultSink] = []
+    if jsonl is not None and not ctx.obj.get("_anta_help"):
+        sink = JsonLinesSink(jsonl)
+        ctx.call_on_close(sink.close)
+        sinks.append(sink)
+    if columnar is not None and not ctx.obj.get("_anta_help"):
+        columnar_sink = ColumnarResults(columnar)
+        ctx.call_on_close(columnar_sink.close)
+        sinks.append(columnar_sink)
+    ctx.obj["result_manager"] = ResultManager(sinks=sinks, compact=compact_results)
+    ctx.obj["max_concurrency"] = max_concurrency
+    ctx.obj["max_device_concurrency"] = max_device_concurrency
 
 
-@anta.group("exec", cls=AliasedGroup)
+# The commands of these groups are loaded lazily: their dependencies (e.g. cvprac) are not imported when running NRFU
+@anta.group(
+    "exec",
+    cls=AliasedGroup,
+    lazy_commands={
+        "clear-counters": "anta.cli.exec.commands:clear_counters",
+        "snapshot": "anta.cli.exec.commands:snapshot",
+        "collect-tech-support": "anta.cli.exec.commands:collect_tech_support",
+    },
+)
 def _exec() -> None:
     """Execute commands to inventory devices"""
 
 
-@anta.group("get", cls=AliasedGroup)
+@anta.group(
+    "get",
+    cls=AliasedGroup,
+    lazy_commands={
+        "from-cvp": "anta.cli.get.commands:from_cvp",
+        "from-ansible": "anta.cli.get.commands:from_ansible",
+        "inventory": "anta.cli.get.commands:inventory",
+        "tags": "anta.cli.get.commands:tags",
+    },
+)
 def _get() -> None:
     """Get data from/to ANTA"""
 
 
-@anta.group("debug", cls=AliasedGroup)
+@anta.group(
+    "debug",
+    cls=AliasedGroup,
+    lazy_commands={
+        "run-cmd": "anta.cli.debug.commands:run_cmd",
+        "run-template": "anta.cli.debug.commands:run_template",
+    },
+)
 def _debug() -> None:
     """Debug commands for building ANTA"""
 
@@ -169,23 +387,12 @@ def _debug() -> None:
 # Load group commands
 # Prefixing with `_` for avoiding the confusion when importing anta.cli.debug.commands as otherwise the debug group has
 # a commands attribute.
-_exec.add_command(exec_commands.clear_counters)
-_exec.add_command(exec_commands.snapshot)
-_exec.add_command(exec_commands.collect_tech_support)
-
-
-_get.add_command(get_commands.from_cvp)
-_get.add_command(get_commands.from_ansible)
-_get.add_command(get_commands.inventory)
-_get.add_command(get_commands.tags)
-
-_debug.add_command(debug_commands.run_cmd)
-_debug.add_command(debug_commands.run_template)
 
 _nrfu.add_command(check_commands.table)
 _nrfu.add_command(check_commands.json)
 _nrfu.add_command(check_commands.text)
 _nrfu.add_command(check_commands.tpl_report)
+_nrfu.add_command(check_commands.diff)
 
 
 # ANTA CLI Execution
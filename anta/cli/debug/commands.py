@@ -77,7 +77,7 @@ def run_template(template: str, params: list[str], ofmt: Literal["json", "text"]
     # I do not assume the following line, but click make me do it
     v: Literal[1, "latest"] = version if version == "latest" else 1
     t = AntaTemplate(template=template, ofmt=ofmt, version=v, revision=revision)
-    c = t.render(**template_params)  # type: ignore
+    c = t.render(**template_params)
     asyncio.run(device.collect(c))
     if ofmt == "json":
         console.print(c.json_output)
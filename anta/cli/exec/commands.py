@@ -28,7 +28,7 @@ logger = logging.getLogger(__name__)
 @click.option("--tags", "-t", help="List of tags using comma as separator: tag1,tag2,tag3", type=str, required=False, callback=parse_tags)
 def clear_counters(ctx: click.Context, tags: Optional[list[str]]) -> None:
     """Clear counter statistics on EOS devices"""
-    asyncio.run(clear_counters_utils(ctx.obj["inventory"], tags=tags))
+    asyncio.run(clear_counters_utils(ctx.obj["inventory"], tags=tags, probe_timeout=ctx.obj["probe_timeout"]))
 
 
 @click.command()
@@ -62,7 +62,7 @@ def snapshot(ctx: click.Context, tags: Optional[list[str]], commands_list: Path,
     except FileNotFoundError:
         logger.error(f"Error reading {commands_list}")
         sys.exit(1)
-    asyncio.run(collect_commands(ctx.obj["inventory"], eos_commands, output, tags=tags))
+    asyncio.run(collect_commands(ctx.obj["inventory"], eos_commands, output, tags=tags, probe_timeout=ctx.obj["probe_timeout"]))
 
 
 @click.command()
@@ -79,4 +79,4 @@ def snapshot(ctx: click.Context, tags: Optional[list[str]], commands_list: Path,
 @click.option("--tags", "-t", help="List of tags using comma as separator: tag1,tag2,tag3", type=str, required=False, callback=parse_tags)
 def collect_tech_support(ctx: click.Context, tags: Optional[list[str]], output: Path, latest: Optional[int], configure: bool) -> None:
     """Collect scheduled tech-support from EOS devices"""
-    asyncio.run(collect_scheduled_show_tech(ctx.obj["inventory"], output, configure, tags=tags, latest=latest))
+    asyncio.run(collect_scheduled_show_tech(ctx.obj["inventory"], output, configure, tags=tags, latest=latest, probe_timeout=ctx.obj["probe_timeout"]))
@@ -9,24 +9,24 @@ from __future__ import annotations
 
 import asyncio
 import itertools
-import json
 import logging
 from pathlib import Path
 from typing import Literal, Optional
 
 from aioeapi import EapiCommandError
 
-from anta.device import AntaDevice, AsyncEOSDevice
+from anta.device import DEFAULT_PROBE_TIMEOUT, AntaDevice, AsyncEOSDevice
 from anta.inventory import AntaInventory
 from anta.models import AntaCommand
 from anta.tools.misc import anta_log_exception, exc_to_str
+from anta.tools.snapshot import save_command_output
 
 EOS_SCHEDULED_TECH_SUPPORT = "/mnt/flash/schedule/tech-support"
 
 logger = logging.getLogger(__name__)
 
 
-async def clear_counters_utils(anta_inventory: AntaInventory, tags: Optional[list[str]] = None) -> None:
+async def clear_counters_utils(anta_inventory: AntaInventory, tags: Optional[list[str]] = None, probe_timeout: float = DEFAULT_PROBE_TIMEOUT) -> None:
     """
     Clear counters
     """
@@ -42,7 +42,7 @@ async def clear_counters_utils(anta_inventory: AntaInventory, tags: Optional[lis
         logger.info(f"Cleared counters on {dev.name} ({dev.hw_model})")
 
     logger.info("Connecting to devices...")
-    await anta_inventory.connect_inventory()
+    await anta_inventory.connect_inventory(probe_timeout=probe_timeout)
     devices = anta_inventory.get_inventory(established_only=True, tags=tags).values()
     logger.info("Clearing counters on remote devices...")
     await asyncio.gather(*(clear(device) for device in devices))
@@ -53,31 +53,23 @@ async def collect_commands(
     commands: dict[str, str],
     root_dir: Path,
     tags: Optional[list[str]] = None,
+    probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
 ) -> None:
     """
     Collect EOS commands
     """
 
     async def collect(dev: AntaDevice, command: str, outformat: Literal["json", "text"]) -> None:
-        outdir = Path() / root_dir / dev.name / outformat
-        outdir.mkdir(parents=True, exist_ok=True)
         c = AntaCommand(command=command, ofmt=outformat)
         await dev.collect(c)
         if not c.collected and c.failed is not None:
             logger.error(f"Could not collect commands on device {dev.name}: {exc_to_str(c.failed)}")
             return
-        if c.ofmt == "json":
-            outfile = outdir / f"{command}.json"
-            content = json.dumps(c.json_output, indent=2)
-        elif c.ofmt == "text":
-            outfile = outdir / f"{command}.log"
-            content = c.text_output
-        with outfile.open(mode="w", encoding="UTF-8") as f:
-            f.write(content)
+        save_command_output(root_dir, dev.name, c)
         logger.info(f"Collected command '{command}' from device {dev.name} ({dev.hw_model})")
 
     logger.info("Connecting to devices...")
-    await inv.connect_inventory()
+    await inv.connect_inventory(probe_timeout=probe_timeout)
     devices = inv.get_inventory(established_only=True, tags=tags).values()
     logger.info("Collecting commands from remote devices")
     coros = []
@@ -92,7 +84,15 @@ async def collect_commands(
             anta_log_exception(r, message, logger)
 
 
-async def collect_scheduled_show_tech(inv: AntaInventory, root_dir: Path, configure: bool, tags: Optional[list[str]] = None, latest: Optional[int] = None) -> None:
+async def collect_scheduled_show_tech(
+    inv: AntaInventory,
+    root_dir: Path,
+    configure: bool,
+    tags: Optional[list[str]] = None,
+    latest: Optional[int] = None,
+    probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> None:
+    # pylint: disable=too-many-arguments
     """
     Collect scheduled show-tech on devices
     """
@@ -159,6 +159,6 @@ async def collect_scheduled_show_tech(inv: AntaInventory, root_dir: Path, config
             anta_log_exception(e, message, logger)
 
     logger.info("Connecting to devices...")
-    await inv.connect_inventory()
+    await inv.connect_inventory(probe_timeout=probe_timeout)
     devices = inv.get_inventory(established_only=True, tags=tags).values()
     await asyncio.gather(*(collect(device) for device in devices))
@@ -114,7 +114,7 @@ def inventory(ctx: click.Context, tags: Optional[list[str]], connected: bool) ->
     console.print("Current inventory content is:", style="white on blue")
 
     if connected:
-        asyncio.run(ctx.obj["inventory"].connect_inventory())
+        asyncio.run(ctx.obj["inventory"].connect_inventory(probe_timeout=ctx.obj["probe_timeout"]))
 
     inventory_result = ctx.obj["inventory"].get_inventory(tags=tags)
     console.print(pretty_repr(inventory_result))
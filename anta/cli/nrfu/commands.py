@@ -17,9 +17,10 @@ import click
 
 from anta.cli.utils import exit_with_code, parse_tags
 from anta.models import AntaTest
+from anta.reporter import DEFAULT_PAGE_SIZE
 from anta.runner import main
 
-from .utils import anta_progress_bar, print_jinja, print_json, print_settings, print_table, print_text
+from .utils import anta_progress_bar, print_diff, print_jinja, print_json, print_settings, print_table, print_text
 
 logger = logging.getLogger(__name__)
 
@@ -32,12 +33,34 @@ logger = logging.getLogger(__name__)
 @click.option(
     "--group-by", default=None, type=click.Choice(["device", "test"], case_sensitive=False), help="Group result by test or host. default none", required=False
 )
-def table(ctx: click.Context, tags: Optional[list[str]], device: Optional[str], test: Optional[str], group_by: str) -> None:
+@click.option("--failures-only", help="Only show the tests in failure or in error", default=False, is_flag=True, show_default=True, required=False)
+@click.option(
+    "--page-size",
+    help="Maximum number of rows of a table: large reports are printed in several tables",
+    type=click.IntRange(min=1),
+    default=DEFAULT_PAGE_SIZE,
+    show_default=True,
+    show_envvar=True,
+)
+def table(ctx: click.Context, tags: Optional[list[str]], device: Optional[str], test: Optional[str], group_by: str, failures_only: bool, page_size: int) -> None:
+    # pylint: disable=too-many-arguments
     """ANTA command to check network states with table result"""
     print_settings(ctx)
     with anta_progress_bar() as AntaTest.progress:
-        asyncio.run(main(ctx.obj["result_manager"], ctx.obj["inventory"], ctx.obj["catalog"], tags=tags))
-    print_table(results=ctx.obj["result_manager"], device=device, group_by=group_by, test=test)
+        asyncio.run(
+            main(
+                ctx.obj["result_manager"],
+                ctx.obj["inventory"],
+                ctx.obj["catalog"],
+                tags=tags,
+                max_concurrency=ctx.obj["max_concurrency"],
+                max_device_concurrency=ctx.obj["max_device_concurrency"],
+                spool_dir=ctx.obj["spool_dir"],
+                state_store=ctx.obj["state_store"],
+                probe_timeout=ctx.obj["probe_timeout"],
+            )
+        )
+    print_table(results=ctx.obj["result_manager"], device=device, group_by=group_by, test=test, failures_only=failures_only, page_size=page_size)
     exit_with_code(ctx)
 
 
@@ -50,14 +73,27 @@ def table(ctx: click.Context, tags: Optional[list[str]], device: Optional[str],
     type=click.Path(file_okay=True, dir_okay=False, exists=False, writable=True, path_type=pathlib.Path),
     show_envvar=True,
     required=False,
-    help="Path to save report as a file",
+    help="Path to save report as a file. The file is gzip-compressed if its name ends with '.gz'",
 )
-def json(ctx: click.Context, tags: Optional[list[str]], output: Optional[pathlib.Path]) -> None:
+@click.option("--ndjson", help="Write report as newline-delimited JSON: one test result per line", default=False, is_flag=True, show_default=True, required=False)
+def json(ctx: click.Context, tags: Optional[list[str]], output: Optional[pathlib.Path], ndjson: bool) -> None:
     """ANTA command to check network state with JSON result"""
     print_settings(ctx)
     with anta_progress_bar() as AntaTest.progress:
-        asyncio.run(main(ctx.obj["result_manager"], ctx.obj["inventory"], ctx.obj["catalog"], tags=tags))
-    print_json(results=ctx.obj["result_manager"], output=output)
+        asyncio.run(
+            main(
+                ctx.obj["result_manager"],
+                ctx.obj["inventory"],
+                ctx.obj["catalog"],
+                tags=tags,
+                max_concurrency=ctx.obj["max_concurrency"],
+                max_device_concurrency=ctx.obj["max_device_concurrency"],
+                spool_dir=ctx.obj["spool_dir"],
+                state_store=ctx.obj["state_store"],
+                probe_timeout=ctx.obj["probe_timeout"],
+            )
+        )
+    print_json(results=ctx.obj["result_manager"], output=output, output_format="ndjson" if ndjson else "json")
     exit_with_code(ctx)
 
 
@@ -70,7 +106,19 @@ def text(ctx: click.Context, tags: Optional[list[str]], search: Optional[str], s
     """ANTA command to check network states with text result"""
     print_settings(ctx)
     with anta_progress_bar() as AntaTest.progress:
-        asyncio.run(main(ctx.obj["result_manager"], ctx.obj["inventory"], ctx.obj["catalog"], tags=tags))
+        asyncio.run(
+            main(
+                ctx.obj["result_manager"],
+                ctx.obj["inventory"],
+                ctx.obj["catalog"],
+                tags=tags,
+                max_concurrency=ctx.obj["max_concurrency"],
+                max_device_concurrency=ctx.obj["max_device_concurrency"],
+                spool_dir=ctx.obj["spool_dir"],
+                state_store=ctx.obj["state_store"],
+                probe_timeout=ctx.obj["probe_timeout"],
+            )
+        )
     print_text(results=ctx.obj["result_manager"], search=search, skip_error=skip_error)
     exit_with_code(ctx)
 
@@ -93,11 +141,73 @@ def text(ctx: click.Context, tags: Optional[list[str]], search: Optional[str], s
     required=False,
     help="Path to save report as a file",
 )
+@click.option(
+    "--file-only",
+    help="Only save the report to the '--output' file without printing it: the report is written to the file as it is rendered",
+    default=False,
+    is_flag=True,
+    show_default=True,
+    required=False,
+)
 @click.option("--tags", "-t", help="List of tags using comma as separator: tag1,tag2,tag3", type=str, required=False, callback=parse_tags)
-def tpl_report(ctx: click.Context, tags: Optional[list[str]], template: pathlib.Path, output: Optional[pathlib.Path]) -> None:
+def tpl_report(ctx: click.Context, tags: Optional[list[str]], template: pathlib.Path, output: Optional[pathlib.Path], file_only: bool) -> None:
     """ANTA command to check network state with templated report"""
+    if file_only and output is None:
+        ctx.fail("'--file-only' requires '--output'")
     print_settings(ctx, template, output)
     with anta_progress_bar() as AntaTest.progress:
-        asyncio.run(main(ctx.obj["result_manager"], ctx.obj["inventory"], ctx.obj["catalog"], tags=tags))
-    print_jinja(results=ctx.obj["result_manager"], template=template, output=output)
+        asyncio.run(
+            main(
+                ctx.obj["result_manager"],
+                ctx.obj["inventory"],
+                ctx.obj["catalog"],
+                tags=tags,
+                max_concurrency=ctx.obj["max_concurrency"],
+                max_device_concurrency=ctx.obj["max_device_concurrency"],
+                spool_dir=ctx.obj["spool_dir"],
+                state_store=ctx.obj["state_store"],
+                probe_timeout=ctx.obj["probe_timeout"],
+            )
+        )
+    print_jinja(results=ctx.obj["result_manager"], template=template, output=output, file_only=file_only)
+    exit_with_code(ctx)
+
+
+@click.command()
+@click.pass_context
+@click.option("--tags", "-t", help="List of tags using comma as separator: tag1,tag2,tag3", type=str, required=False, callback=parse_tags)
+@click.option(
+    "--baseline",
+    "-b",
+    type=click.Path(file_okay=True, dir_okay=False, exists=True, readable=True, path_type=pathlib.Path),
+    show_envvar=True,
+    required=True,
+    help="Path of the test results of the baseline run, saved by 'anta nrfu diff --output', 'anta nrfu json --output' or 'anta nrfu --jsonl'",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(file_okay=True, dir_okay=False, exists=False, writable=True, path_type=pathlib.Path),
+    show_envvar=True,
+    required=False,
+    help="Path to save the test results as a file, to be used as the baseline of a next run. The file is gzip-compressed if its name ends with '.gz'",
+)
+def diff(ctx: click.Context, tags: Optional[list[str]], baseline: pathlib.Path, output: Optional[pathlib.Path]) -> None:
+    """ANTA command to check network states and report the changes since a baseline run"""
+    print_settings(ctx)
+    with anta_progress_bar() as AntaTest.progress:
+        asyncio.run(
+            main(
+                ctx.obj["result_manager"],
+                ctx.obj["inventory"],
+                ctx.obj["catalog"],
+                tags=tags,
+                max_concurrency=ctx.obj["max_concurrency"],
+                max_device_concurrency=ctx.obj["max_device_concurrency"],
+                spool_dir=ctx.obj["spool_dir"],
+                state_store=ctx.obj["state_store"],
+                probe_timeout=ctx.obj["probe_timeout"],
+            )
+        )
+    print_diff(results=ctx.obj["result_manager"], baseline=baseline, output=output)
     exit_with_code(ctx)
@@ -8,10 +8,10 @@
 Utils functions to use with anta.cli.check.commands module.
 """
 
-import json
 import logging
 import pathlib
 import re
+from collections import Counter
 from typing import Optional
 
 import click
@@ -21,8 +21,11 @@ from rich.pretty import pprint
 from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 
 from anta.cli.console import console
-from anta.reporter import ReportJinja, ReportTable
+from anta.custom_types import TestStatus
+from anta.reporter import DEFAULT_PAGE_SIZE, LazyResults, ReportJinja, ReportTable
 from anta.result_manager import ResultManager
+from anta.result_manager.diff import diff_results
+from anta.result_manager.export import ExportFormat, export_results, read_results, write_results
 
 logger = logging.getLogger(__name__)
 
@@ -38,30 +41,49 @@ def print_settings(context: click.Context, report_template: Optional[pathlib.Pat
     console.print()
 
 
-def print_table(results: ResultManager, device: Optional[str] = None, test: Optional[str] = None, group_by: Optional[str] = None) -> None:
-    """Print result in a table"""
+def print_table(
+    results: ResultManager,
+    device: Optional[str] = None,
+    test: Optional[str] = None,
+    group_by: Optional[str] = None,
+    failures_only: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> None:
+    """Print result in a table. The tables of all the results are printed page by page"""
+    # pylint: disable=too-many-arguments
     reporter = ReportTable()
     console.print()
-    if device:
-        console.print(reporter.report_all(result_manager=results, host=device))
-    elif test:
-        console.print(reporter.report_all(result_manager=results, testcase=test))
-    elif group_by == "device":
-        console.print(reporter.report_summary_hosts(result_manager=results, host=None))
-    elif group_by == "test":
-        console.print(reporter.report_summary_tests(result_manager=results, testcase=None))
+    statuses: Optional[list[TestStatus]] = ["failure", "error"] if failures_only else None
+    if group_by == "device" and not device and not test:
+        console.print(reporter.report_summary_hosts(result_manager=results, host=None, statuses=statuses))
+    elif group_by == "test" and not device and not test:
+        console.print(reporter.report_summary_tests(result_manager=results, testcase=None, statuses=statuses))
     else:
-        console.print(reporter.report_all(result_manager=results))
+        for table in reporter.report_all_pages(result_manager=results, host=device, testcase=None if device else test, statuses=statuses, page_size=page_size):
+            console.print(table)
 
 
-def print_json(results: ResultManager, output: Optional[pathlib.Path] = None) -> None:
-    """Print result in a json format"""
+def print_json(results: ResultManager, output: Optional[pathlib.Path] = None, output_format: ExportFormat = "json") -> None:
+    """Stream result in a json format to the console and to the output file if provided"""
     console.print()
     console.print(Panel("JSON results of all tests", style="cyan"))
-    rich.print_json(results.get_results(output_format="json"))
+    write_results(results.get_results(), console.file, output_format=output_format)
+    if output_format == "json":
+        console.file.write("\n")
     if output is not None:
-        with open(output, "w", encoding="utf-8") as fout:
-            fout.write(results.get_results(output_format="json"))
+        export_results(results.get_results(), output, output_format=output_format)
+
+
+def print_diff(results: ResultManager, baseline: pathlib.Path, output: Optional[pathlib.Path] = None) -> None:
+    """Print the changes of the results since the baseline run and save the results to the output file if provided"""
+    console.print()
+    changes = list(diff_results(read_results(baseline), results.get_results()))
+    console.print(ReportTable().report_diff(changes))
+    counters = Counter(change.change for change in changes)
+    summary = ", ".join(f"{counters[change]} {change.replace('_', ' ')}" for change in ("new_failure", "recovery", "status_change", "added", "removed"))
+    console.print(f"{len(changes)} changes since {baseline}: {summary}", highlight=False)
+    if output is not None:
+        export_results(results.get_results(), output)
 
 
 def print_list(results: ResultManager, output: Optional[pathlib.Path] = None) -> None:
@@ -84,12 +106,16 @@ def print_text(results: ResultManager, search: Optional[str] = None, skip_error:
             console.print(f"{line.name} :: {line.test} :: [{line.result}]{line.result.upper()}[/{line.result}]{message}", highlight=False)
 
 
-def print_jinja(results: ResultManager, template: pathlib.Path, output: Optional[pathlib.Path] = None) -> None:
-    """Print result based on template."""
+def print_jinja(results: ResultManager, template: pathlib.Path, output: Optional[pathlib.Path] = None, file_only: bool = False) -> None:
+    """Print result based on template and save it to the output file if provided. With `file_only`, the report is only streamed to the file."""
     console.print()
     reporter = ReportJinja(template_path=template)
-    json_data = json.loads(results.get_results(output_format="json"))
-    report = reporter.render(json_data)
+    data = LazyResults(results.get_results(output_format="list"))
+    if output is not None and file_only:
+        reporter.generate(data, output)
+        console.print(f"Report saved to {output}")
+        return
+    report = reporter.render(data)
     console.print(report)
     if output is not None:
         with open(output, "w", encoding="utf-8") as file:
@@ -9,16 +9,21 @@ Utils functions to use with anta.cli module.
 from __future__ import annotations
 
 import enum
+import importlib
 import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import click
-from yaml import safe_load
+import yaml
 
 import anta.loader
+from anta.device import ReplayDevice
+from anta.facts import DeviceFactsCache
 from anta.inventory import AntaInventory
+from anta.output_cache import CommandOutputCache
 from anta.tools.misc import anta_log_exception
+from anta.tools.snapshot import SnapshotReader
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +68,14 @@ def parse_inventory(ctx: click.Context, path: Path) -> AntaInventory:
             enable_password=ctx.params["enable_password"],
             timeout=ctx.params["timeout"],
             insecure=ctx.params["insecure"],
+            facts_cache=DeviceFactsCache(ctx.params["facts_cache"], ttl=ctx.params["facts_cache_ttl"]) if ctx.params.get("facts_cache") else None,
+            output_cache=CommandOutputCache(ctx.params["output_cache"], ttl=ctx.params["output_cache_ttl"], max_entries=ctx.params["output_cache_size"])
+            if ctx.params.get("output_cache")
+            else None,
+            rate_limit=ctx.params.get("rate_limit"),
+            max_retries=ctx.params.get("max_retries"),
+            circuit_breaker_threshold=ctx.params.get("circuit_breaker_threshold"),
+            max_batch_size=ctx.params.get("max_batch_size"),
         )
     except Exception as e:  # pylint: disable=broad-exception-caught
         message = f"Unable to parse ANTA Inventory file '{path}'"
@@ -71,6 +84,24 @@ def parse_inventory(ctx: click.Context, path: Path) -> AntaInventory:
     return inventory
 
 
+def replay_inventory(ctx: click.Context, inventory: AntaInventory, path: Path) -> AntaInventory:
+    """
+    Helper function to build an ANTA inventory replaying the command outputs recorded in a snapshot.
+    Each device of the inventory is replaced by a ReplayDevice with the same name and tags.
+    """
+    try:
+        snapshot = SnapshotReader(path)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        message = f"Unable to read snapshot '{path}'"
+        anta_log_exception(e, message, logger)
+        ctx.fail(message)
+    ctx.call_on_close(snapshot.close)
+    replay = AntaInventory()
+    for device in inventory.values():
+        replay.add_device(ReplayDevice(name=device.name, snapshot=snapshot, tags=device.tags))
+    return replay
+
+
 def parse_tags(ctx: click.Context, param: Option, value: str) -> list[str] | None:
     # pylint: disable=unused-argument
     """
@@ -81,18 +112,26 @@ def parse_tags(ctx: click.Context, param: Option, value: str) -> list[str] | Non
     return None
 
 
-def parse_catalog(ctx: click.Context, param: Option, value: str) -> list[tuple[AntaTest, dict[str, Any] | None]]:
+def parse_catalog(ctx: click.Context, param: Option, value: str) -> list[tuple[type[AntaTest], dict[str, Any] | None]]:
     # pylint: disable=unused-argument
     """
     Click option callback to parse an ANTA tests catalog YAML file
+    If the `catalog_cache` parameter is set, the parsed catalog is read from and saved to this cache directory.
     """
     if ctx.obj.get("_anta_help"):
         # Currently looking for help for a subcommand so no
         # need to parse the Catalog - return an empty list
         return []
     try:
-        with open(value, "r", encoding="UTF-8") as file:
-            data = safe_load(file)
+        with open(value, "rb") as file:
+            content = file.read()
+        cache = anta.loader.CatalogCache(ctx.params["catalog_cache"]) if ctx.params.get("catalog_cache") else None
+        if cache is not None:
+            tests = cache.get(content)
+            if tests is not None:
+                return tests
+        # Use the libyaml bindings if available: they are much faster than the pure Python loader
+        data = yaml.load(content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     # TODO catch proper exception
     # pylint: disable-next=broad-exception-caught
     except Exception as e:
@@ -100,7 +139,10 @@ def parse_catalog(ctx: click.Context, param: Option, value: str) -> list[tuple[A
         anta_log_exception(e, message, logger)
         ctx.fail(message)
 
-    return anta.loader.parse_catalog(data)
+    tests = anta.loader.parse_catalog(data)
+    if cache is not None:
+        cache.set(content, tests)
+    return tests
 
 
 def exit_with_code(ctx: click.Context) -> None:
@@ -191,18 +233,37 @@ class AliasedGroup(click.Group):
     Implements a subclass of Group that accepts a prefix for a command.
     If there were a command called push, it would accept pus as an alias (so long as it was unique)
     From Click documentation
+
+    Commands can also be registered lazily with `lazy_commands`: a dictionary of command names and import paths
+    ('module:attribute') of the commands. The module of a lazy command is only imported when the command is
+    needed, so the dependencies of a command are not imported when running another one.
     """
 
+    def __init__(self, *args: Any, lazy_commands: dict[str, str] | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands if lazy_commands is not None else {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """List the names of the commands, including the lazy commands"""
+        return sorted([*super().list_commands(ctx), *self.lazy_commands])
+
+    def _get_command(self, ctx: click.Context, cmd_name: str) -> Any:
+        """Get a command by its full name, importing it if it is a lazy command"""
+        if cmd_name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[cmd_name].split(":")
+            return getattr(importlib.import_module(module_name), attribute)
+        return click.Group.get_command(self, ctx, cmd_name)
+
     def get_command(self, ctx: click.Context, cmd_name: str) -> Any:
         """Todo: document code"""
-        rv = click.Group.get_command(self, ctx, cmd_name)
+        rv = self._get_command(ctx, cmd_name)
         if rv is not None:
             return rv
         matches = [x for x in self.list_commands(ctx) if x.startswith(cmd_name)]
         if not matches:
             return None
         if len(matches) == 1:
-            return click.Group.get_command(self, ctx, matches[0])
+            return self._get_command(ctx, matches[0])
         ctx.fail(f"Too many matches: {', '.join(sorted(matches))}")
         return None
 
@@ -60,6 +60,7 @@ def skip_on_platforms(platforms: list[str]) -> Callable[[F], F]:
 
     This decorator factory generates a decorator that will check the hardware model of the device
     the test is run on. If the model is in the list of platforms specified, the test will be skipped.
+    The platforms are exposed as the `skip_platforms` attribute of the decorated function, see `is_skipped_on_platform()`.
 
     Args:
         platforms (list[str]): List of hardware models on which the test should be skipped.
@@ -100,11 +101,27 @@ def skip_on_platforms(platforms: list[str]) -> Callable[[F], F]:
 
             return await function(*args, **kwargs)
 
+        setattr(wrapper, "skip_platforms", platforms)
         return cast(F, wrapper)
 
     return decorator
 
 
+def is_skipped_on_platform(test: AntaTest) -> bool:
+    """
+    Check if a test will be skipped by `skip_on_platforms` on the hardware model of its device.
+
+    The runner uses this function to not collect the commands of the tests which will be skipped.
+
+    Args:
+        test (AntaTest): The AntaTest instance.
+
+    Returns:
+        bool: True if the hardware model of the device is in the platforms of the `skip_on_platforms` decorator of the test.
+    """
+    return test.device.hw_model in getattr(type(test).test, "skip_platforms", [])
+
+
 def check_bgp_family_enable(family: str) -> Callable[[F], F]:
     """
     Return a decorator to conditionally skip a test based on BGP address family availability.
@@ -7,23 +7,46 @@ ANTA Device Abstraction Module
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Literal, Optional, Union
+from typing import TYPE_CHECKING, Any, Literal, Optional, Union
 
-import asyncssh
 from aioeapi import Device, EapiCommandError
-from asyncssh import SSHClientConnection, SSHClientConnectionOptions
-from httpx import ConnectError, HTTPError
+from aioeapi.aio_portcheck import port_check_url
+from httpx import ConnectError, HTTPError, HTTPStatusError, Limits, ReadTimeout, WriteTimeout
+from pydantic import ValidationError
 
 from anta import __DEBUG__
+from anta.facts import DeviceFacts, DeviceFactsCache
 from anta.models import DEFAULT_TAG, AntaCommand
+from anta.output_cache import CommandOutputCache
+from anta.rate_limit import DEFAULT_CIRCUIT_BREAKER_THRESHOLD, DEFAULT_MAX_RETRIES, CircuitBreaker, CircuitBreakerOpenError, TokenBucket, backoff_delay, is_overload
 from anta.tools.misc import anta_log_exception, exc_to_str
+from anta.tools.snapshot import SnapshotReader
+
+if TYPE_CHECKING:
+    from asyncssh import SSHClientConnection, SSHClientConnectionOptions
 
 logger = logging.getLogger(__name__)
 
+# Default time in seconds an idle eAPI connection is kept open to be reused.
+# The default value of httpx (5 seconds) is too short to reuse the connections opened when
+# refreshing a large inventory.
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+# Default limits of the httpx connection pool, used when `max_connections` is not provided
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+# Default timeout in seconds of the reachability probe. It does not depend on the timeout of the device:
+# the probe only opens a TCP connection and must not wait for the eAPI timeout on unreachable devices.
+DEFAULT_PROBE_TIMEOUT = 5.0
+# Default maximum number of commands sent in a single eAPI request. The request timeout applies to the whole request:
+# a large batch would make a single slow command fail all the other ones.
+DEFAULT_MAX_BATCH_SIZE = 20
+
 
 class AntaDevice(ABC):
     """
@@ -37,21 +60,26 @@ class AntaDevice(ABC):
         established: True if remote command execution succeeds
         hw_model: Hardware model of the device
         tags: List of tags for this device
+        refresh_commands: Commands collected by `refresh()`. Their outputs are reused by the tests run after the refresh.
+        output_cache: Cache of the command outputs. See `collect_commands()`.
     """
 
-    def __init__(self, name: str, tags: Optional[list[str]] = None) -> None:
+    def __init__(self, name: str, tags: Optional[list[str]] = None, output_cache: Optional[CommandOutputCache] = None) -> None:
         """
         Constructor of AntaDevice
 
         Args:
             name: Device name
             tags: list of tags for this device
+            output_cache: Cache of the command outputs. If provided, the outputs found in the cache are used instead of collecting the commands.
         """
         self.name: str = name
         self.hw_model: Optional[str] = None
         self.tags: list[str] = tags if tags is not None else []
         self.is_online: bool = False
         self.established: bool = False
+        self.refresh_commands: list[AntaCommand] = []
+        self.output_cache = output_cache
 
         # Ensure tag 'all' is always set
         if DEFAULT_TAG not in self.tags:
@@ -96,10 +124,49 @@ class AntaDevice(ABC):
         """
         Collect multiple commands.
 
+        If an output cache has been provided, the outputs found in the cache are used and the other commands
+        are stored in the cache once collected. Implementations overriding this coroutine or `collect()` should
+        use `_read_output_cache()` and `_write_output_cache()` to do the same.
+
         Args:
             commands: the commands to collect
         """
+        commands = self._read_output_cache(commands)
         await asyncio.gather(*(self.collect(command=command) for command in commands))
+        self._write_output_cache(commands)
+
+    def _read_output_cache(self, commands: list[AntaCommand]) -> list[AntaCommand]:
+        """
+        Set the outputs of the commands found in the output cache.
+
+        Args:
+            commands: the commands to collect
+
+        Returns:
+            list[AntaCommand]: The commands which are not in the cache and need to be collected.
+        """
+        if self.output_cache is None:
+            return commands
+        missing = []
+        for command in commands:
+            output = self.output_cache.get(self.name, command)
+            if output is None:
+                missing.append(command)
+            else:
+                command.output = output
+                logger.debug(f"{self.name}: using cached output of '{command.command}'")
+        return missing
+
+    def _write_output_cache(self, commands: list[AntaCommand]) -> None:
+        """
+        Store the outputs of the collected commands in the output cache.
+
+        Args:
+            commands: the collected commands. Commands which are not collected are ignored.
+        """
+        if self.output_cache is not None:
+            for command in commands:
+                self.output_cache.set(self.name, command)
 
     @abstractmethod
     async def refresh(self) -> None:
@@ -110,7 +177,26 @@ class AntaDevice(ABC):
             - `is_online`: When the device IP is reachable and a port can be open
             - `established`: When a command execution succeeds
             - `hw_model`: The hardware model of the device
+
+        The outputs of the commands sent to the device by this coroutine can be saved in the `refresh_commands`
+        attribute to be reused by the tests.
+        """
+
+    async def probe(self, timeout: float = DEFAULT_PROBE_TIMEOUT) -> bool:  # pylint: disable=unused-argument
         """
+        Check quickly if the device can be reached before running `refresh()`.
+        This coroutine is used by `AntaInventory.connect_inventory()` to avoid running the full `refresh()`
+        on devices that are not reachable.
+        It is not mandatory to implement this for a valid AntaDevice subclass: the default implementation
+        considers that the device is reachable.
+
+        Args:
+            timeout: Timeout in seconds of the probe
+
+        Returns:
+            bool: True if the device is reachable.
+        """
+        return True
 
     async def copy(self, sources: list[Path], destination: Path, direction: Literal["to", "from"] = "from") -> None:
         """
@@ -125,7 +211,7 @@ class AntaDevice(ABC):
         raise NotImplementedError(f"copy() method has not been implemented in {self.__class__.__name__} definition")
 
 
-class AsyncEOSDevice(AntaDevice):
+class AsyncEOSDevice(AntaDevice):  # pylint: disable=too-many-instance-attributes
     """
     Implementation of AntaDevice for EOS using aio-eapi.
 
@@ -135,6 +221,9 @@ class AsyncEOSDevice(AntaDevice):
         established: True if remote command execution succeeds
         hw_model: Hardware model of the device
         tags: List of tags for this device
+        refresh_commands: Commands collected by `refresh()`. Their outputs are reused by the tests run after the refresh.
+        output_cache: Cache of the command outputs, used by `collect()` and `collect_commands()`
+        facts: Facts of the device, gathered by `refresh()` or read from the facts cache
     """
 
     def __init__(  # pylint: disable=R0913
@@ -151,10 +240,23 @@ class AsyncEOSDevice(AntaDevice):
         timeout: Optional[float] = None,
         insecure: bool = False,
         proto: Literal["http", "https"] = "https",
+        max_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        facts_cache: Optional[DeviceFactsCache] = None,
+        output_cache: Optional[CommandOutputCache] = None,
+        rate_limit: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        circuit_breaker_threshold: Optional[int] = DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+        max_batch_size: Optional[int] = DEFAULT_MAX_BATCH_SIZE,
     ) -> None:
         """
         Constructor of AsyncEOSDevice
 
+        The same HTTP client is used for the whole lifetime of the device: the connection opened (and the TLS session negotiated)
+        when refreshing the device is kept alive and reused to collect the commands as long as it is not idle for more than
+        `keepalive_expiry` seconds.
+
         Args:
             host: Device FQDN or IP
             username: Username to connect to eAPI and SSH
@@ -168,17 +270,52 @@ class AsyncEOSDevice(AntaDevice):
             timeout: Timeout value in seconds for outgoing connections. Default to 10 secs.
             insecure: Disable SSH Host Key validation
             proto: eAPI protocol. Value can be 'http' or 'https'
+            max_connections: Maximum number of concurrent eAPI connections to the device, all of them can be kept alive.
+                             Defaults to None: the httpx defaults are used (100 connections, 20 kept alive).
+            keepalive_expiry: Time in seconds an idle eAPI connection is kept open to be reused. None means no expiry.
+            http2: Use HTTP/2 for eAPI. Requires the 'h2' Python package: HTTP/1.1 is used if it is not installed.
+            facts_cache: Cache of the device facts. If provided, `refresh()` uses the cached facts instead of sending `show version` to the device.
+            output_cache: Cache of the command outputs. If provided, the outputs found in the cache are used instead of sending the commands to the device.
+            rate_limit: Maximum number of eAPI requests per second sent to the device. The rate is reduced while the device is overloaded.
+                        Defaults to None (no limit).
+            max_retries: Maximum number of retries of an eAPI request when the device is overloaded (HTTP 429 or 503) or cannot be connected to in time.
+            circuit_breaker_threshold: Number of consecutive connection failures after which no eAPI request is sent to the device for a while:
+                                       the commands fail immediately instead of waiting for the timeout. None disables the circuit breaker.
+            max_batch_size: Maximum number of commands sent in a single eAPI request by `collect_commands()`. None means no limit.
         """
         if name is None:
             name = f"{host}{f':{port}' if port else ''}"
-        super().__init__(name, tags)
+        super().__init__(name, tags, output_cache)
         self.enable = enable
         self._enable_password = enable_password
-        self._session: Device = Device(host=host, port=port, username=username, password=password, proto=proto, timeout=timeout)
-        ssh_params: dict[str, Any] = {}
+        self.facts: Optional[DeviceFacts] = None
+        self._facts_cache = facts_cache
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning(f"HTTP/2 is not available for device {name}: the 'h2' Python package is not installed. Using HTTP/1.1")
+            http2 = False
+        limits = Limits(
+            max_connections=max_connections if max_connections is not None else DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections=max_connections if max_connections is not None else DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._session: Device = Device(host=host, port=port, username=username, password=password, proto=proto, timeout=timeout, limits=limits, http2=http2)
+        self._ssh_params: dict[str, Any] = {"host": host, "port": ssh_port, "username": username, "password": password}
         if insecure:
-            ssh_params.update({"known_hosts": None})
-        self._ssh_opts: SSHClientConnectionOptions = SSHClientConnectionOptions(host=host, port=ssh_port, username=username, password=password, **ssh_params)
+            self._ssh_params.update({"known_hosts": None})
+        self._rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self._max_retries = max_retries
+        self._circuit_breaker = CircuitBreaker(name, circuit_breaker_threshold) if circuit_breaker_threshold else None
+        self._max_batch_size = max_batch_size
+
+    @cached_property
+    def _ssh_opts(self) -> SSHClientConnectionOptions:
+        """
+        SSH connection options of the device.
+        asyncssh is only imported when the options are used, e.g. to copy files, as it is slow to import.
+        """
+        from asyncssh import SSHClientConnectionOptions  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        return SSHClientConnectionOptions(**self._ssh_params)
 
     def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
         """
@@ -210,6 +347,17 @@ class AsyncEOSDevice(AntaDevice):
             return False
         return self._session.host == other._session.host and self._session.port == other._session.port
 
+    def _enable_commands(self) -> list[dict[str, Any]]:
+        """
+        Build the eAPI commands to gain privileged access if required.
+        """
+        if self.enable and self._enable_password is not None:
+            return [{"cmd": "enable", "input": str(self._enable_password)}]
+        if self.enable:
+            # No password
+            return [{"cmd": "enable"}]
+        return []
+
     async def collect(self, command: AntaCommand) -> None:
         """
         Collect device command output from EOS using aio-eapi.
@@ -221,48 +369,160 @@ class AsyncEOSDevice(AntaDevice):
         Args:
             command: the command to collect
         """
-        try:
-            commands = []
-            if self.enable and self._enable_password is not None:
-                commands.append(
-                    {
-                        "cmd": "enable",
-                        "input": str(self._enable_password),
-                    }
-                )
-            elif self.enable:
-                # No password
-                commands.append({"cmd": "enable"})
-            if command.revision:
-                commands.append({"cmd": command.command, "revision": command.revision})
+        await self._collect_batch([command])
+
+    async def collect_commands(self, commands: list[AntaCommand]) -> None:
+        """
+        Collect multiple commands from EOS using aio-eapi.
+
+        eAPI output format and version are defined per request: commands are grouped by `ofmt` and `version`
+        and each group is sent in eAPI requests of at most `max_batch_size` commands, each with a single `enable` command.
+
+        Args:
+            commands: the commands to collect
+        """
+        groups: dict[tuple[str, Union[int, str]], list[AntaCommand]] = {}
+        for command in commands:
+            groups.setdefault((command.ofmt, command.version), []).append(command)
+        batches: list[list[AntaCommand]] = []
+        for group in groups.values():
+            size = self._max_batch_size or len(group)
+            while group:
+                batches.append(group[:size])
+                group = group[size:]
+        await asyncio.gather(*(self._collect_batch(batch) for batch in batches))
+
+    async def _collect_batch(self, commands: list[AntaCommand]) -> None:
+        """
+        Collect commands sharing the same `ofmt` and `version` in a single eAPI request.
+        The outputs found in the output cache are used and the commands are not sent to the device.
+
+        If a command fails, EOS does not run the following commands of the request:
+        the outputs of the commands that passed are saved, the failing command is flagged as failed
+        and the commands that have not been executed are sent again in a new request.
+        If the request times out while waiting for the response, the commands are sent again in two smaller batches
+        so a single slow command only fails itself.
+
+        Args:
+            commands: the commands to collect, all with the same `ofmt` and `version`
+        """
+        enable_commands = self._enable_commands()
+        nb_enable = len(enable_commands)
+        # Copy the list as it is consumed when commands fail
+        commands = list(self._read_output_cache(commands))
+        while commands:
+            eapi_commands = enable_commands + [
+                {"cmd": command.command, "revision": command.revision} if command.revision else {"cmd": command.command} for command in commands
+            ]
+            try:
+                response = await self._cli(eapi_commands, ofmt=commands[0].ofmt, version=commands[0].version)
+            except EapiCommandError as e:
+                # e.passed contains the outputs of the commands that have been run before the failing one
+                failed_index = len(e.passed) - nb_enable
+                if failed_index < 0:
+                    message = f"Cannot gain privileged access on {self.name}"
+                    self._set_failed(commands, e, message)
+                    return
+                self._set_outputs(commands[:failed_index], e.passed[nb_enable:])
+                message = f"Command '{commands[failed_index].command}' failed on {self.name}"
+                self._set_failed([commands[failed_index]], e, message)
+                del commands[: failed_index + 1]
+            except CircuitBreakerOpenError as e:
+                # The circuit breaker logs a warning when it opens: do not log every command
+                logger.debug(f"Command(s) {', '.join(repr(command.command) for command in commands)} not sent to device {self.name}: {e}")
+                for command in commands:
+                    command.failed = e
+                return
+            except (HTTPError, ConnectError) as e:
+                if isinstance(e, ReadTimeout) and len(commands) > 1:
+                    logger.debug(f"Request of {len(commands)} commands timed out on device {self.name}: sending them again in smaller batches")
+                    middle = len(commands) // 2
+                    await asyncio.gather(self._collect_batch(commands[:middle]), self._collect_batch(commands[middle:]))
+                    return
+                message = f"Cannot connect to device {self.name}"
+                self._set_failed(commands, e, message)
+                # The device may have been replaced or reconfigured: the cached facts cannot be trusted anymore
+                if self._facts_cache is not None:
+                    self._facts_cache.invalidate(self._session.host, self._session.port)
+                return
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                message = f"Exception raised while collecting command(s) {', '.join(repr(command.command) for command in commands)} on device {self.name}"
+                self._set_failed(commands, e, message)
+                return
+            else:
+                # remove the outputs related to the enable command
+                self._set_outputs(commands, response[nb_enable:])
+                return
+
+    async def _cli(self, commands: list[dict[str, Any]], ofmt: str, version: Union[int, str]) -> list[Any]:
+        """
+        Send an eAPI request to the device.
+
+        The request is delayed to respect the rate limit and retried with an exponential backoff when the device
+        is overloaded or cannot be connected to in time, see `is_overload()`. No request is sent while the circuit breaker is open.
+
+        Args:
+            commands: eAPI commands
+            ofmt: eAPI output format
+            version: eAPI version
+
+        Returns:
+            list[Any]: The outputs of the commands
+
+        Raises:
+            CircuitBreakerOpenError: The circuit breaker of the device is open.
+        """
+        attempt = 0
+        while True:
+            if self._circuit_breaker is not None and self._circuit_breaker.is_open:
+                raise CircuitBreakerOpenError(f"Device {self.name} is unavailable")
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire()
+            try:
+                response = await self._session.cli(commands=commands, ofmt=ofmt, version=version)
+            except EapiCommandError:
+                # The device is available
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.record_success()
+                raise
+            except HTTPError as e:
+                # An HTTP error status or a read timeout means that the device is reachable
+                if self._circuit_breaker is not None and not isinstance(e, (HTTPStatusError, ReadTimeout, WriteTimeout)):
+                    self._circuit_breaker.record_failure()
+                if not is_overload(e) or attempt >= self._max_retries:
+                    raise
+                if self._rate_limiter is not None:
+                    self._rate_limiter.slow_down()
+                delay = backoff_delay(attempt)
+                logger.debug(f"Device {self.name} is overloaded ({exc_to_str(e)}): retrying in {delay:.2f} seconds")
+                await asyncio.sleep(delay)
+                attempt += 1
             else:
-                commands.append({"cmd": command.command})
-            response = await self._session.cli(
-                commands=commands,
-                ofmt=command.ofmt,
-                version=command.version,
-            )
-            # remove first dict related to enable command
-            # only applicable to json output
-            if command.ofmt in ["json", "text"]:
-                # selecting only our command output
-                response = response[-1]
-            command.output = response
+                if self._circuit_breaker is not None:
+                    self._circuit_breaker.record_success()
+                if self._rate_limiter is not None:
+                    self._rate_limiter.speed_up()
+                return response
+
+    def _set_outputs(self, commands: list[AntaCommand], outputs: list[Any]) -> None:
+        """
+        Save the outputs of an eAPI request in the corresponding commands.
+        """
+        for command, output in zip(commands, outputs):
+            command.output = output
             logger.debug(f"{self.name}: {command}")
+            if self._facts_cache is not None and command.command == "show version" and command.ofmt == "json":
+                # Keep the cached facts up to date with the latest output
+                self._update_facts(command.json_output)
+        self._write_output_cache(commands)
 
-        except EapiCommandError as e:
-            message = f"Command '{command.command}' failed on {self.name}"
-            anta_log_exception(e, message, logger)
-            command.failed = e
-        except (HTTPError, ConnectError) as e:
-            message = f"Cannot connect to device {self.name}"
-            anta_log_exception(e, message, logger)
-            command.failed = e
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            message = f"Exception raised while collecting command '{command.command}' on device {self.name}"
-            anta_log_exception(e, message, logger)
-            command.failed = e
-            logger.debug(command)
+    def _set_failed(self, commands: list[AntaCommand], exception: Exception, message: str) -> None:
+        """
+        Log an exception raised when collecting commands and flag the commands as failed.
+        """
+        anta_log_exception(exception, message, logger)
+        for command in commands:
+            command.failed = exception
 
     async def refresh(self) -> None:
         """
@@ -272,29 +532,93 @@ class AsyncEOSDevice(AntaDevice):
         - is_online: When a device IP is reachable and a port can be open
         - established: When a command execution succeeds
         - hw_model: The hardware model of the device
+
+        If a facts cache has been provided and holds a valid entry for this device, the cached facts are used
+        and `show version` is not sent to the device: the cheaper `show hostname` command is sent instead to check
+        that eAPI is enabled and that the credentials are valid. The tests requiring `show version` collect it again:
+        the cache only holds the facts, not the full output, as some values (e.g. `memFree`) change between runs.
+        Otherwise, the `show version` output is saved in `refresh_commands` and in the facts cache.
         """
         # Refresh command
         COMMAND: str = "show version"
-        # Hardware model definition in show version
-        HW_MODEL_KEY: str = "modelName"
         logger.debug(f"Refreshing device {self.name}")
+        self.refresh_commands = []
         self.is_online = await self._session.check_connection()
         if self.is_online:
-            try:
-                response = await self._session.cli(command=COMMAND)
-            except EapiCommandError as e:
-                logger.warning(f"Cannot get hardware information from device {self.name}: {e.errmsg}")
-            except (HTTPError, ConnectError) as e:
-                logger.warning(f"Cannot get hardware information from device {self.name}: {exc_to_str(e)}")
+            facts = self._facts_cache.get(self._session.host, self._session.port) if self._facts_cache is not None else None
+            if facts is not None:
+                if await self._check_eapi_access():
+                    logger.debug(f"Using cached facts for device {self.name}")
+                    self.facts = facts
+                    self.hw_model = facts.hw_model
             else:
-                if HW_MODEL_KEY in response:
-                    self.hw_model = response[HW_MODEL_KEY]
+                try:
+                    response = await self._session.cli(command=COMMAND)
+                except EapiCommandError as e:
+                    logger.warning(f"Cannot get hardware information from device {self.name}: {e.errmsg}")
+                except (HTTPError, ConnectError) as e:
+                    logger.warning(f"Cannot get hardware information from device {self.name}: {exc_to_str(e)}")
                 else:
-                    logger.warning(f"Cannot get hardware information from device {self.name}: cannot parse '{COMMAND}'")
+                    if isinstance(response, dict) and "modelName" in response:
+                        self._update_facts(response)
+                        self.refresh_commands = [AntaCommand(command=COMMAND, output=response)]
+                    else:
+                        logger.warning(f"Cannot get hardware information from device {self.name}: cannot parse '{COMMAND}'")
         else:
             logger.warning(f"Could not connect to device {self.name}: cannot open eAPI port")
         self.established = bool(self.is_online and self.hw_model)
 
+    async def _check_eapi_access(self) -> bool:
+        """
+        Send the cheap `show hostname` command to check that eAPI is enabled and that the credentials are valid.
+        Used by `refresh()` when the facts of the device are cached. The cache entry is removed if the request fails.
+
+        Returns:
+            bool: True if the command succeeded.
+        """
+        try:
+            await self._session.cli(command="show hostname")
+        except EapiCommandError as e:
+            logger.warning(f"Cannot run commands on device {self.name}: {e.errmsg}")
+            return False
+        except (HTTPError, ConnectError) as e:
+            logger.warning(f"Cannot run commands on device {self.name}: {exc_to_str(e)}")
+            if self._facts_cache is not None:
+                self._facts_cache.invalidate(self._session.host, self._session.port)
+            return False
+        return True
+
+    def _update_facts(self, show_version: dict[str, Any]) -> None:
+        """
+        Update the facts of the device and the facts cache from a `show version` output.
+
+        Args:
+            show_version: JSON output of `show version`
+        """
+        try:
+            self.facts = DeviceFacts.from_show_version(show_version)
+        except (KeyError, ValidationError) as e:
+            message = f"Cannot parse facts of device {self.name}"
+            anta_log_exception(e, message, logger)
+            return
+        self.hw_model = self.facts.hw_model
+        if self._facts_cache is not None:
+            self._facts_cache.set(self._session.host, self._session.port, self.facts)
+
+    async def probe(self, timeout: float = DEFAULT_PROBE_TIMEOUT) -> bool:
+        """
+        Check if the eAPI port of the device can be open within `timeout` seconds.
+        Updates the `is_online` attribute of the device.
+
+        Args:
+            timeout: Timeout in seconds to open the eAPI port
+
+        Returns:
+            bool: True if the eAPI port can be open.
+        """
+        self.is_online = await port_check_url(self._session.base_url, timeout=timeout)
+        return self.is_online
+
     async def copy(self, sources: list[Path], destination: Path, direction: Literal["to", "from"] = "from") -> None:
         """
         Copy files to and from the device using asyncssh.scp().
@@ -304,6 +628,8 @@ class AsyncEOSDevice(AntaDevice):
             destination: Local or remote destination when copying the files. Can be a folder.
             direction: Defines if this coroutine copies files to or from the device.
         """
+        import asyncssh  # pylint: disable=import-outside-toplevel
+
         async with asyncssh.connect(
             host=self._ssh_opts.host,
             port=self._ssh_opts.port,
@@ -328,3 +654,86 @@ class AsyncEOSDevice(AntaDevice):
                 logger.critical(f"'direction' argument to copy() fonction is invalid: {direction}")
                 return
             await asyncssh.scp(src, dst)
+
+
+class ReplayDevice(AntaDevice):
+    """
+    Implementation of AntaDevice replaying command outputs recorded in a snapshot.
+
+    The snapshot can be created with `anta exec snapshot` or `anta nrfu --save-outputs`.
+    The outputs are read from `<snapshot>/<device name>/json/<command>.json` or `<snapshot>/<device name>/text/<command>.log`:
+    the command version and revision are not part of the file name so the recorded output is used for any of them.
+
+    Attributes:
+        name: Device name
+        is_online: True if the snapshot contains outputs for this device
+        established: True if the snapshot contains outputs for this device
+        hw_model: Hardware model of the device, read from the recorded `show version` output if available
+        tags: List of tags for this device
+        snapshot: SnapshotReader of the recorded outputs
+    """
+
+    def __init__(self, name: str, snapshot: SnapshotReader, tags: Optional[list[str]] = None) -> None:
+        """
+        Constructor of ReplayDevice
+
+        Args:
+            name: Device name. Must match the name of a device directory in the snapshot.
+            snapshot: SnapshotReader of the recorded outputs
+            tags: List of tags for this device
+        """
+        super().__init__(name, tags)
+        self.snapshot = snapshot
+
+    def __rich_repr__(self) -> Iterator[tuple[str, Any]]:
+        """
+        Implements Rich Repr Protocol
+        https://rich.readthedocs.io/en/stable/pretty.html#rich-repr-protocol
+        """
+        yield from super().__rich_repr__()
+        yield "snapshot", self.snapshot.path
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Two ReplayDevice objects are equal if they have the same name and replay the same snapshot.
+        """
+        if not isinstance(other, ReplayDevice):
+            return False
+        return self.name == other.name and self.snapshot.path == other.snapshot.path
+
+    async def collect(self, command: AntaCommand) -> None:
+        """
+        Read the output of a command from the snapshot.
+        The command is flagged as failed if its output has not been recorded.
+
+        Args:
+            command: the command to collect
+        """
+        try:
+            command.output = self.snapshot.read(self.name, command)
+        except FileNotFoundError as e:
+            command.failed = e
+            logger.warning(f"No recorded output for command '{command.command}' on device {self.name}")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            command.failed = e
+            message = f"Cannot replay command '{command.command}' on device {self.name}"
+            anta_log_exception(e, message, logger)
+        else:
+            logger.debug(f"{self.name}: {command}")
+
+    async def refresh(self) -> None:
+        """
+        Update attributes of a ReplayDevice instance.
+
+        The device is online and established if the snapshot contains outputs for this device.
+        The hardware model is read from the recorded `show version` output if available.
+        """
+        self.is_online = self.established = self.name in self.snapshot.devices
+        if not self.is_online:
+            logger.warning(f"No recorded outputs for device {self.name} in snapshot {self.snapshot.path}")
+            return
+        try:
+            show_version = self.snapshot.read(self.name, AntaCommand(command="show version"))
+            self.hw_model = show_version["modelName"]
+        except (OSError, KeyError, TypeError, ValueError):
+            logger.debug(f"Cannot read hardware model of device {self.name} from snapshot {self.snapshot.path}")
@@ -0,0 +1,143 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Device facts cache for ANTA.
+
+Facts gathered when refreshing a device (hardware model, EOS version, serial number, uptime) are stored
+on disk so they can be reused across ANTA runs without sending `show version` to the device.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from anta.tools.misc import anta_log_exception
+
+logger = logging.getLogger(__name__)
+
+# Default time in seconds a device facts cache entry is valid
+DEFAULT_FACTS_CACHE_TTL = 3600
+
+
+class DeviceFacts(BaseModel):
+    """
+    Facts of a device
+
+    Attributes:
+        hw_model: Hardware model of the device
+        version: EOS version of the device
+        serial_number: Serial number of the device
+        uptime: Uptime of the device in seconds when the facts were gathered
+        timestamp: UNIX timestamp of the facts gathering
+    """
+
+    hw_model: str
+    version: Optional[str] = None
+    serial_number: Optional[str] = None
+    uptime: Optional[float] = None
+    timestamp: float
+
+    @classmethod
+    def from_show_version(cls, output: dict[str, Any]) -> DeviceFacts:
+        """
+        Build a DeviceFacts instance from the JSON output of `show version`.
+
+        Args:
+            output: JSON output of `show version`
+
+        Returns:
+            DeviceFacts: The facts of the device
+        """
+        return cls(
+            hw_model=output["modelName"],
+            version=output.get("version"),
+            serial_number=output.get("serialNumber"),
+            uptime=output.get("uptime"),
+            timestamp=time.time(),
+        )
+
+
+class DeviceFactsCache:
+    """
+    On-disk cache of device facts.
+
+    Each entry is a JSON file named after the host and the port of the device.
+    An entry is considered stale once it is older than the cache TTL.
+
+    Attributes:
+        directory: Directory of the cache files
+        ttl: Time in seconds a cache entry is valid
+    """
+
+    def __init__(self, directory: Path, ttl: float = DEFAULT_FACTS_CACHE_TTL) -> None:
+        """
+        Constructor of DeviceFactsCache
+
+        Args:
+            directory: Directory of the cache files. Created if it does not exist.
+            ttl: Time in seconds a cache entry is valid
+        """
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, host: str, port: Optional[int]) -> Path:
+        """Return the path of the cache file of a device"""
+        # ':' is not allowed in file names on some platforms (IPv6 addresses)
+        return self.directory / f"{host.replace(':', '_')}_{port if port is not None else 'default'}.json"
+
+    def get(self, host: str, port: Optional[int]) -> Optional[DeviceFacts]:
+        """
+        Get the facts of a device from the cache.
+
+        Args:
+            host: Device host
+            port: Device eAPI port
+
+        Returns:
+            DeviceFacts: The facts of the device or None if there is no valid entry for this device in the cache.
+        """
+        path = self._path(host, port)
+        try:
+            facts = DeviceFacts.model_validate_json(path.read_text(encoding="UTF-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            message = f"Cannot read device facts cache entry {path}"
+            anta_log_exception(e, message, logger)
+            return None
+        if time.time() - facts.timestamp > self.ttl:
+            logger.debug(f"Device facts cache entry {path} has expired")
+            return None
+        return facts
+
+    def set(self, host: str, port: Optional[int], facts: DeviceFacts) -> None:
+        """
+        Store the facts of a device in the cache.
+
+        Args:
+            host: Device host
+            port: Device eAPI port
+            facts: Facts of the device
+        """
+        path = self._path(host, port)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(facts.model_dump_json(), encoding="UTF-8")
+        except OSError as e:
+            message = f"Cannot write device facts cache entry {path}"
+            anta_log_exception(e, message, logger)
+
+    def invalidate(self, host: str, port: Optional[int]) -> None:
+        """
+        Remove the facts of a device from the cache.
+
+        Args:
+            host: Device host
+            port: Device eAPI port
+        """
+        self._path(host, port).unlink(missing_ok=True)
@@ -10,18 +10,25 @@ from __future__ import annotations
 import asyncio
 import logging
 from ipaddress import ip_address, ip_network
-from typing import Any, Optional
+from typing import Any, Coroutine, Optional, TypeVar
 
 from pydantic import ValidationError
 from yaml import safe_load
 
-from anta.device import AntaDevice, AsyncEOSDevice
+from anta.device import DEFAULT_KEEPALIVE_EXPIRY, DEFAULT_PROBE_TIMEOUT, AntaDevice, AsyncEOSDevice
+from anta.facts import DeviceFactsCache
 from anta.inventory.exceptions import InventoryIncorrectSchema, InventoryRootKeyError
 from anta.inventory.models import AntaInventoryInput
+from anta.output_cache import CommandOutputCache
 from anta.tools.misc import anta_log_exception
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Default maximum number of devices probed or refreshed concurrently
+DEFAULT_REFRESH_CONCURRENCY = 500
+
 
 class AntaInventory(dict):  # type: ignore
     # dict[str, AntaDevice] - not working in python 3.8 hence the ignore
@@ -128,6 +135,15 @@ class AntaInventory(dict):  # type: ignore
         enable_password: Optional[str] = None,
         timeout: Optional[float] = None,
         insecure: bool = False,
+        max_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        facts_cache: Optional[DeviceFactsCache] = None,
+        output_cache: Optional[CommandOutputCache] = None,
+        rate_limit: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        circuit_breaker_threshold: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
     ) -> AntaInventory:
         # pylint: disable=too-many-arguments
         """
@@ -140,6 +156,16 @@ class AntaInventory(dict):  # type: ignore
             password (str): Password to use to connect to devices
             enable (bool): Whether or not the commands need to be run in enable mode towards the devices
             timeout (float, optional): timeout in seconds for every API call.
+            max_connections (int, optional): Maximum number of concurrent eAPI connections per device.
+            keepalive_expiry (float, optional): Time in seconds an idle eAPI connection is kept open to be reused. None means no expiry.
+            http2 (bool): Use HTTP/2 for eAPI. Requires the 'h2' Python package.
+            facts_cache (DeviceFactsCache, optional): Cache of the device facts shared by all the devices.
+            output_cache (CommandOutputCache, optional): Cache of the command outputs shared by all the devices.
+            rate_limit (float, optional): Maximum number of eAPI requests per second sent to each device.
+            max_retries (int, optional): Maximum number of retries of an eAPI request when a device is overloaded or cannot be connected to in time.
+            circuit_breaker_threshold (int, optional): Number of consecutive connection failures after which no request is sent to a device for a while.
+                                                       0 disables the circuit breaker.
+            max_batch_size (int, optional): Maximum number of commands sent in a single eAPI request.
 
         Raises:
             InventoryRootKeyError: Root key of inventory is missing.
@@ -155,8 +181,18 @@ class AntaInventory(dict):  # type: ignore
             "enable_password": enable_password,
             "timeout": timeout,
             "insecure": insecure,
+            "max_connections": max_connections,
+            "http2": http2,
+            "facts_cache": facts_cache,
+            "output_cache": output_cache,
+            "rate_limit": rate_limit,
+            "max_retries": max_retries,
+            "circuit_breaker_threshold": circuit_breaker_threshold,
+            "max_batch_size": max_batch_size,
         }
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        # keepalive_expiry is kept when None: the idle connections do not expire
+        kwargs["keepalive_expiry"] = keepalive_expiry
 
         with open(inventory_file, "r", encoding="UTF-8") as file:
             data = safe_load(file)
@@ -234,11 +270,52 @@ class AntaInventory(dict):  # type: ignore
     # MISC methods
     ###########################################################################
 
-    async def connect_inventory(self) -> None:
-        """Run `refresh()` coroutines for all AntaDevice objects in this inventory."""
-        logger.debug("Refreshing devices...")
+    async def connect_inventory(
+        self, probe: bool = True, probe_timeout: float = DEFAULT_PROBE_TIMEOUT, max_concurrency: Optional[int] = DEFAULT_REFRESH_CONCURRENCY
+    ) -> None:
+        """
+        Run `refresh()` coroutines for all AntaDevice objects in this inventory.
+
+        Devices are refreshed in two stages to quickly settle inventories containing many unreachable devices
+        (e.g. inventories built from `networks` or `ranges`):
+            1. A cheap reachability probe (TCP connection to the eAPI port for AsyncEOSDevice) is run on all devices.
+            2. `refresh()` is run only on the devices that answered the probe.
+
+        Args:
+            probe: Run the reachability probe. If False, the probe stage is skipped and all devices are refreshed.
+            probe_timeout: Timeout in seconds of the reachability probe. It does not depend on the timeout of the devices.
+            max_concurrency: Maximum number of devices probed or refreshed concurrently. If None, all devices are processed at once.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+
+        async def bounded(coro: Coroutine[Any, Any, T]) -> T:
+            """Run a coroutine once a slot is available in the semaphore"""
+            if semaphore is None:
+                return await coro
+            async with semaphore:
+                return await coro
+
+        devices = list(self.values())
+        if probe:
+            logger.debug(f"Probing {len(devices)} devices...")
+            probes = await asyncio.gather(*(bounded(device.probe(probe_timeout)) for device in devices), return_exceptions=True)
+            reachable = []
+            for device, answer in zip(devices, probes):
+                if isinstance(answer, Exception):
+                    message = f"Error when probing device {device.name}"
+                    anta_log_exception(answer, message, logger)
+                elif answer:
+                    reachable.append(device)
+                    continue
+                else:
+                    logger.warning(f"Could not connect to device {device.name}: device did not answer the reachability probe")
+                device.is_online = False
+                device.established = False
+            devices = reachable
+
+        logger.debug(f"Refreshing {len(devices)} devices...")
         results = await asyncio.gather(
-            *(device.refresh() for device in self.values()),
+            *(bounded(device.refresh()) for device in devices),
             return_exceptions=True,
         )
         for r in results:
@@ -6,16 +6,19 @@ Loader that parses a YAML test catalog and imports corresponding Python function
 """
 from __future__ import annotations
 
+import hashlib
 import importlib
+import json
 import logging
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from rich.logging import RichHandler
 
 from anta import __DEBUG__
 from anta.models import AntaTest
+from anta.tools.misc import anta_log_exception
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +78,7 @@ def setup_logging(level: str = logging.getLevelName(logging.INFO), file: Path |
         logger.debug("ANTA Debug Mode enabled")
 
 
-def parse_catalog(test_catalog: dict[str, Any], package: str | None = None) -> list[tuple[AntaTest, dict[str, Any] | None]]:
+def parse_catalog(test_catalog: dict[str, Any], package: str | None = None) -> list[tuple[type[AntaTest], dict[str, Any] | None]]:
     """
     Function to parse the catalog and return a list of tests with their inputs
 
@@ -120,7 +123,7 @@ def parse_catalog(test_catalog: dict[str, Any], package: str | None = None) -> l
         tests: List of tuples (test, inputs) where test is a reference of an AntaTest subclass
               and inputs is a dictionary
     """
-    tests: list[tuple[AntaTest, dict[str, Any] | None]] = []
+    tests: list[tuple[type[AntaTest], dict[str, Any] | None]] = []
     if not test_catalog:
         return tests
     for key, value in test_catalog.items():
@@ -155,3 +158,83 @@ def parse_catalog(test_catalog: dict[str, Any], package: str | None = None) -> l
             # This is an inner Python module
             tests.extend(parse_catalog(value, package=module.__name__))
     return tests
+
+
+class CatalogCache:
+    """
+    On-disk cache of parsed test catalogs.
+
+    Parsing a large YAML catalog is slow: the cache stores the output of `parse_catalog()` as JSON, keyed by the SHA-256
+    hash of the catalog file content. Each entry is a JSON list of `[module, test name, inputs]`. When reading an entry,
+    the test modules are imported and the tests classes are looked up without parsing the YAML file.
+
+    Attributes:
+        directory: Directory of the cache files
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Constructor of CatalogCache
+
+        Args:
+            directory: Directory of the cache files. Created if it does not exist.
+        """
+        self.directory = directory
+
+    def _path(self, content: bytes) -> Path:
+        """Return the path of the cache file of a catalog"""
+        return self.directory / f"{hashlib.sha256(content).hexdigest()}.json"
+
+    def get(self, content: bytes) -> Optional[list[tuple[type[AntaTest], dict[str, Any] | None]]]:
+        """
+        Get a parsed catalog from the cache.
+
+        Args:
+            content: Content of the catalog file
+
+        Returns:
+            list[tuple[type[AntaTest], dict[str, Any] | None]]: The output of `parse_catalog()` or None if there is no valid entry for this catalog in the cache.
+        """
+        path = self._path(content)
+        try:
+            entries = json.loads(path.read_text(encoding="UTF-8"))
+            tests = []
+            for module_name, test_name, inputs in entries:
+                test = getattr(importlib.import_module(module_name), test_name)
+                if not issubclass(test, AntaTest):
+                    raise TypeError(f"'{module_name}.{test_name}' is not an AntaTest subclass")
+                tests.append((test, inputs))
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            message = f"Cannot read catalog cache entry {path}"
+            anta_log_exception(e, message, logger)
+            return None
+        logger.debug(f"Catalog read from cache entry {path}")
+        return tests
+
+    def set(self, content: bytes, tests: list[tuple[type[AntaTest], dict[str, Any] | None]]) -> None:
+        """
+        Store a parsed catalog in the cache.
+        The catalog is not stored if the tests inputs contain values which cannot be represented in JSON (e.g. dates).
+
+        Args:
+            content: Content of the catalog file
+            tests: Output of `parse_catalog()` for this catalog
+        """
+        path = self._path(content)
+        entries = [[test.__module__, test.__name__, inputs] for test, inputs in tests]
+        try:
+            data = json.dumps(entries)
+        except (TypeError, ValueError):
+            logger.debug("Catalog is not cached: the tests inputs cannot be represented in JSON")
+            return
+        if json.loads(data) != entries:
+            logger.debug("Catalog is not cached: the tests inputs cannot be represented in JSON")
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(data, encoding="UTF-8")
+        except OSError as e:
+            message = f"Cannot write catalog cache entry {path}"
+            anta_log_exception(e, message, logger)
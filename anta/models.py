@@ -6,17 +6,18 @@ Models to define a TestStructure
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import time
 from abc import ABC, abstractmethod
-from copy import deepcopy
 from datetime import timedelta
 from functools import wraps
 
 # Need to keep Dict and List for pydantic in python 3.8
 from typing import TYPE_CHECKING, Any, Callable, ClassVar, Coroutine, Dict, List, Literal, Optional, TypeVar, Union
 
-from pydantic import BaseModel, ConfigDict, ValidationError, conint
+from pydantic import BaseModel, ConfigDict, PrivateAttr, ValidationError, conint
 from rich.progress import Progress, TaskID
 
 from anta.result_manager.models import TestResult
@@ -36,6 +37,21 @@ DEFAULT_TAG = "all"
 logger = logging.getLogger(__name__)
 
 
+def inputs_hash(inputs: Optional[dict[str, Any]]) -> str:
+    """Generate a hash of the inputs of a test from the catalog.
+
+    Two tests of the same class with the same inputs share the same hash:
+    with the device name and the test name, it identifies a test result across ANTA runs.
+
+    Args:
+        inputs: dictionary of attributes used to instantiate the AntaTest.Input instance
+
+    Returns:
+        str: The inputs hash
+    """
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
 class AntaTemplate(BaseModel):
     """Class to define a command template as Python f-string.
     Can render a command from parameters.
@@ -52,7 +68,7 @@ class AntaTemplate(BaseModel):
     revision: Optional[conint(ge=1, le=99)] = None  # type: ignore
     ofmt: Literal["json", "text"] = "json"
 
-    def render(self, **params: dict[str, Any]) -> AntaCommand:
+    def render(self, **params: Any) -> AntaCommand:
         """Render an AntaCommand from an AntaTemplate instance.
         Keep the parameters used in the AntaTemplate instance.
 
@@ -106,6 +122,15 @@ class AntaCommand(BaseModel):
     failed: Optional[Exception] = None
     params: Optional[Dict[str, Any]] = None
 
+    @property
+    def uid(self) -> str:
+        """Generate a unique identifier for this command.
+
+        Two commands with the same `command`, `ofmt`, `version` and `revision` attributes
+        return the same output from a device and share the same identifier."""
+        uid_str = f"{self.command}_{self.version}_{self.revision or 'NA'}_{self.ofmt}"
+        return hashlib.sha1(uid_str.encode()).hexdigest()
+
     @property
     def json_output(self) -> dict[str, Any]:
         """Get the command output as JSON"""
@@ -223,6 +248,9 @@ class AntaTest(ABC):
     commands: ClassVar[list[Union[AntaTemplate, AntaCommand]]]
     # Optional class attributes
     test_filters: ClassVar[list[AntaTestFilter]]
+    # True if the result of the test only depends on the configuration and the EOS version of the device.
+    # Incremental runs only reuse the stored results of these tests, see anta.state.StateStore.
+    config_only: ClassVar[bool] = False
     # Class attributes to handle the progress bar of ANTA CLI
     progress: Optional[Progress] = None
     nrfu_task: Optional[TaskID] = None
@@ -247,6 +275,8 @@ class AntaTest(ABC):
 
         model_config = ConfigDict(extra="forbid")
         result_overwrite: Optional[ResultOverwrite] = None
+        # Hash of the inputs dictionary, set by AntaTest.validate_inputs()
+        _inputs_hash: Optional[str] = PrivateAttr(default=None)
 
         class ResultOverwrite(BaseModel):
             """Test inputs model to overwrite result fields
@@ -264,14 +294,16 @@ class AntaTest(ABC):
     def __init__(
         self,
         device: AntaDevice,
-        inputs: Optional[dict[str, Any]],
+        inputs: Optional[dict[str, Any] | AntaTest.Input],
         eos_data: Optional[list[dict[Any, Any] | str]] = None,
     ):
         """AntaTest Constructor
 
         Args:
             device: AntaDevice instance on which the test will be run
-            inputs: dictionary of attributes used to instantiate the AntaTest.Input instance
+            inputs: dictionary of attributes used to instantiate the AntaTest.Input instance,
+                    or an AntaTest.Input instance already validated with `validate_inputs()`.
+                    A validated AntaTest.Input instance is not copied: it can be shared by the instances of the test on several devices.
             eos_data: Populate outputs of the test commands instead of collecting from devices.
                       This list must have the same length and order than the `instance_commands` instance attribute.
         """
@@ -279,24 +311,52 @@ class AntaTest(ABC):
         self.device: AntaDevice = device
         self.inputs: AntaTest.Input
         self.instance_commands: list[AntaCommand] = []
-        self.result: TestResult = TestResult(name=device.name, test=self.name, categories=self.categories, description=self.description)
+        if isinstance(inputs, AntaTest.Input):
+            # pylint: disable-next=protected-access
+            digest = inputs._inputs_hash if inputs._inputs_hash is not None else inputs_hash(inputs.model_dump(exclude_unset=True))
+        else:
+            digest = inputs_hash(inputs)
+        self.result: TestResult = TestResult(name=device.name, test=self.name, categories=self.categories, description=self.description, inputs_hash=digest)
         self._init_inputs(inputs)
         if self.result.result == "unset":
             self._init_commands(eos_data)
 
-    def _init_inputs(self, inputs: Optional[dict[str, Any]]) -> None:
+    @classmethod
+    def validate_inputs(cls, inputs: Optional[dict[str, Any]]) -> AntaTest.Input:
+        """Validate test inputs from the catalog with the `Input` model of the test.
+
+        The returned AntaTest.Input instance can be provided to the constructor of the test for several devices:
+        the inputs are validated once and shared read-only by the test instances.
+
+        Args:
+            inputs: dictionary of attributes used to instantiate the AntaTest.Input instance
+
+        Returns:
+            AntaTest.Input: The validated inputs
+
+        Raises:
+            ValidationError: The inputs are not valid.
+        """
+        validated = cls.Input(**inputs) if inputs is not None else cls.Input()
+        validated._inputs_hash = inputs_hash(inputs)  # pylint: disable=protected-access
+        return validated
+
+    def _init_inputs(self, inputs: Optional[dict[str, Any] | AntaTest.Input]) -> None:
         """Instantiate the `inputs` instance attribute with an `AntaTest.Input` instance
         to validate test inputs from defined model.
         Overwrite result fields based on `ResultOverwrite` input definition.
 
         Any input validation error will set this test result status as 'error'."""
-        try:
-            self.inputs = self.Input(**inputs) if inputs is not None else self.Input()
-        except ValidationError as e:
-            message = f"{self.__module__}.{self.__class__.__name__}: Inputs are not valid\n{e}"
-            self.logger.error(message)
-            self.result.is_error(message=message, exception=e)
-            return
+        if isinstance(inputs, AntaTest.Input):
+            self.inputs = inputs
+        else:
+            try:
+                self.inputs = self.Input(**inputs) if inputs is not None else self.Input()
+            except ValidationError as e:
+                message = f"{self.__module__}.{self.__class__.__name__}: Inputs are not valid\n{e}"
+                self.logger.error(message)
+                self.result.is_error(message=message, exception=e)
+                return
         if res_ow := self.inputs.result_overwrite:
             if res_ow.categories:
                 self.result.categories = res_ow.categories
@@ -306,7 +366,8 @@ class AntaTest(ABC):
 
     def _init_commands(self, eos_data: Optional[list[dict[Any, Any] | str]]) -> None:
         """Instantiate the `instance_commands` instance attribute from the `commands` class attribute.
-        - Copy of the `AntaCommand` instances
+        - Shallow copy of the `AntaCommand` instances: the command definition is shared with the class attribute,
+          only the `output` and `failed` attributes are set per instance
         - Render all `AntaTemplate` instances using the `render()` method
 
         Any template rendering error will set this test result status as 'error'.
@@ -315,7 +376,7 @@ class AntaTest(ABC):
         if self.__class__.commands:
             for cmd in self.__class__.commands:
                 if isinstance(cmd, AntaCommand):
-                    self.instance_commands.append(deepcopy(cmd))
+                    self.instance_commands.append(cmd.model_copy())
                 elif isinstance(cmd, AntaTemplate):
                     try:
                         self.instance_commands.extend(self.render(cmd))
@@ -374,9 +435,10 @@ class AntaTest(ABC):
     async def collect(self) -> None:
         """
         Method used to collect outputs of all commands of this test class from the device of this test instance.
+        Commands that already have an output or that already failed are not collected again.
         """
         try:
-            await self.device.collect_commands(self.instance_commands)
+            await self.device.collect_commands([command for command in self.instance_commands if command.output is None and command.failed is None])
         except Exception as e:  # pylint: disable=broad-exception-caught
             message = f"Exception raised while collecting commands for test {self.name} (on device {self.device.name})"
             anta_log_exception(e, message, self.logger)
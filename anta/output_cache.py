@@ -0,0 +1,230 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Command output cache for ANTA.
+
+The outputs of the commands collected from a device are stored, in memory or on disk, and reused while they are
+not older than the cache TTL. The on-disk cache is shared by the ANTA commands run with the same cache directory,
+e.g. `anta exec snapshot`, `anta debug run-cmd` and `anta nrfu`, so a heavy command is not sent again to the same
+device during a troubleshooting session.
+
+Only the outputs of read-only `show` commands are cached, see `is_cacheable()`: commands changing the state of the
+device, e.g. `clear`, `configure` or `bash`, are always sent to the device.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from anta.models import AntaCommand
+from anta.tools.misc import anta_log_exception
+
+logger = logging.getLogger(__name__)
+
+# Default time in seconds a command output cache entry is valid
+DEFAULT_OUTPUT_CACHE_TTL = 300
+# Default maximum number of entries of a command output cache
+DEFAULT_OUTPUT_CACHE_SIZE = 10000
+# Fraction of the maximum number of entries evicted at once when the on-disk cache is full
+OUTPUT_CACHE_EVICTION_RATIO = 0.1
+# Output modifiers which can be appended to a cached `show` command: they only filter or format the output
+READ_ONLY_OUTPUT_MODIFIERS = ("begin", "count", "exclude", "include", "json", "no-more", "section")
+
+
+def is_cacheable(command: AntaCommand) -> bool:
+    """
+    Check if the output of a command can be cached.
+
+    Only `show` commands are cached, optionally followed by output modifiers filtering the output, e.g. `| include`.
+    Modifiers writing the output somewhere else, e.g. `| redirect` or `| tee`, are not allowed.
+
+    Args:
+        command: The command
+
+    Returns:
+        bool: True if the command is read-only and its output can be cached.
+    """
+    show, *modifiers = command.command.split("|")
+    if show.split()[:1] != ["show"]:
+        return False
+    return all(next(iter(modifier.split()), None) in READ_ONLY_OUTPUT_MODIFIERS for modifier in modifiers)
+
+
+class CachedOutput(BaseModel):
+    """
+    Command output stored in the cache
+
+    Attributes:
+        timestamp: UNIX timestamp of the collection of the command
+        output: Output of the command
+    """
+
+    timestamp: float
+    output: Any
+
+
+class CommandOutputCache:
+    """
+    Cache of command outputs, in memory or on disk.
+
+    An entry is identified by the device name and the `command`, `ofmt`, `version` and `revision` attributes of the command.
+    Only the commands accepted by `is_cacheable()` are cached. An entry is considered stale once it is older than the cache TTL.
+    When the cache holds more than `max_entries` entries, the least recently used entries are evicted. On disk, each entry
+    is a JSON file and the modification time of the file is the time of the last use of the entry: the number of files is
+    tracked and a tenth of the entries are evicted at once when the cache is full, so the directory is not listed on each write.
+
+    Attributes:
+        directory: Directory of the cache files. None for an in-memory cache.
+        ttl: Time in seconds a cache entry is valid
+        max_entries: Maximum number of entries in the cache
+    """
+
+    def __init__(self, directory: Optional[Path] = None, ttl: float = DEFAULT_OUTPUT_CACHE_TTL, max_entries: int = DEFAULT_OUTPUT_CACHE_SIZE) -> None:
+        """
+        Constructor of CommandOutputCache
+
+        Args:
+            directory: Directory of the cache files. Created if it does not exist. Defaults to None: the entries are kept in memory.
+            ttl: Time in seconds a cache entry is valid
+            max_entries: Maximum number of entries in the cache
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedOutput] = OrderedDict()
+        # Number of entries of the on-disk cache, counted on the first write
+        self._disk_entries: Optional[int] = None
+
+    @staticmethod
+    def key(device: str, command: AntaCommand) -> str:
+        """
+        Return the key of the cache entry of a command.
+
+        Args:
+            device: Device name
+            command: The command
+
+        Returns:
+            str: The key of the cache entry
+        """
+        return hashlib.sha256(json.dumps([device, command.command, command.ofmt, command.version, command.revision]).encode()).hexdigest()
+
+    def _read(self, key: str) -> Optional[CachedOutput]:
+        """
+        Read an entry from the cache and mark it as recently used.
+        """
+        if self.directory is None:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+        path = self.directory / f"{key}.json"
+        try:
+            entry = CachedOutput.model_validate_json(path.read_text(encoding="UTF-8"))
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            message = f"Cannot read command output cache entry {path}"
+            anta_log_exception(e, message, logger)
+            return None
+        return entry
+
+    def _delete(self, key: str) -> None:
+        """
+        Remove an entry from the cache.
+        """
+        if self.directory is None:
+            self._entries.pop(key, None)
+        else:
+            try:
+                (self.directory / f"{key}.json").unlink()
+            except FileNotFoundError:
+                return
+            if self._disk_entries is not None:
+                self._disk_entries -= 1
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used entries of the on-disk cache, down to `max_entries` minus the eviction batch.
+        """
+        if self.directory is None:
+            return
+        files = sorted(self.directory.glob("*.json"), key=lambda file: file.stat().st_mtime)
+        keep = self.max_entries - int(self.max_entries * OUTPUT_CACHE_EVICTION_RATIO)
+        for file in files[: max(0, len(files) - keep)]:
+            file.unlink(missing_ok=True)
+        self._disk_entries = min(len(files), keep)
+
+    def get(self, device: str, command: AntaCommand) -> Optional[Any]:
+        """
+        Get the output of a command from the cache.
+
+        Args:
+            device: Device name
+            command: The command
+
+        Returns:
+            Any: The output of the command or None if there is no valid entry for this command in the cache.
+        """
+        if not is_cacheable(command):
+            return None
+        key = self.key(device, command)
+        entry = self._read(key)
+        if entry is None:
+            return None
+        if time.time() - entry.timestamp > self.ttl:
+            logger.debug(f"Command output cache entry of '{command.command}' on device {device} has expired")
+            self._delete(key)
+            return None
+        return entry.output
+
+    def set(self, device: str, command: AntaCommand) -> None:
+        """
+        Store the output of a collected command in the cache. The least recently used entries are evicted if the cache is full.
+        Commands which are not collected or not accepted by `is_cacheable()` are ignored.
+
+        Args:
+            device: Device name
+            command: The collected command
+        """
+        if not command.collected or not is_cacheable(command):
+            return
+        key = self.key(device, command)
+        entry = CachedOutput(timestamp=time.time(), output=command.output)
+        if self.directory is None:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return
+        path = self.directory / f"{key}.json"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if self._disk_entries is None:
+                self._disk_entries = len(list(self.directory.glob("*.json")))
+            if not path.exists():
+                self._disk_entries += 1
+            path.write_text(entry.model_dump_json(), encoding="UTF-8")
+            if self._disk_entries > self.max_entries:
+                self._evict()
+        except OSError as e:
+            message = f"Cannot write command output cache entry {path}"
+            anta_log_exception(e, message, logger)
+
+    def __len__(self) -> int:
+        """
+        Number of entries in the cache, including the expired entries not yet removed
+        """
+        if self.directory is None:
+            return len(self._entries)
+        return len(list(self.directory.glob("*.json"))) if self.directory.is_dir() else 0
@@ -0,0 +1,196 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Rate limiting, retries and circuit breaker of the requests sent to a device.
+
+- TokenBucket limits the number of requests per second sent to a device. The rate is halved when the device
+  is overloaded and increased back to the configured rate as the requests succeed.
+- Requests failing because the device is overloaded (HTTP 429 or 503) or because no connection could be established
+  in time are retried after an exponential backoff delay with jitter, see `backoff_delay()`. Read timeouts are not
+  retried: the device may still be running the commands and sending them again would only add to its load.
+- CircuitBreaker stops sending requests to a device after consecutive connection failures, so the queued
+  commands fail immediately instead of waiting for the timeout.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+from httpx import ConnectTimeout, HTTPStatusError, PoolTimeout
+
+logger = logging.getLogger(__name__)
+
+# Default maximum number of retries of a request when the device is overloaded
+DEFAULT_MAX_RETRIES = 3
+# Default base and maximum backoff delays in seconds
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 10.0
+# Default number of consecutive connection failures opening the circuit breaker of a device
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+# Default time in seconds before sending requests again to a device once its circuit breaker is open
+DEFAULT_CIRCUIT_BREAKER_RESET = 60.0
+
+# HTTP status codes returned by an overloaded device
+OVERLOAD_STATUS_CODES = (429, 503)
+# Timeouts raised before the request is sent to the device
+OVERLOAD_TIMEOUTS = (ConnectTimeout, PoolTimeout)
+
+
+class CircuitBreakerOpenError(Exception):
+    """
+    Exception raised when a request is not sent to a device because its circuit breaker is open
+    """
+
+
+def is_overload(exception: Exception) -> bool:
+    """
+    Check if an exception raised by a request means that the device is overloaded and the request can be retried.
+
+    Args:
+        exception: The exception raised by the request
+
+    Returns:
+        bool: True for HTTP 429 or 503 responses and connect or pool timeouts.
+    """
+    if isinstance(exception, HTTPStatusError):
+        return exception.response.status_code in OVERLOAD_STATUS_CODES
+    return isinstance(exception, OVERLOAD_TIMEOUTS)
+
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF_BASE, maximum: float = DEFAULT_BACKOFF_MAX) -> float:
+    """
+    Compute the delay before retrying a request: exponential backoff with full jitter.
+
+    Args:
+        attempt: Number of the failed attempt, starting at 0
+        base: Base delay in seconds
+        maximum: Maximum delay in seconds
+
+    Returns:
+        float: A random delay in seconds between 0 and `min(maximum, base * 2 ** attempt)`
+    """
+    return random.uniform(0, min(maximum, base * 2**attempt))
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket rate limiter.
+
+    A token is consumed by each request and the tokens are refilled at `rate` tokens per second, up to `burst` tokens.
+    The rate is halved by `slow_down()`, down to `min_rate`, and increased back to the configured rate by `speed_up()`.
+
+    Attributes:
+        max_rate: Configured rate in requests per second
+        rate: Current rate in requests per second
+        burst: Maximum number of requests sent at once
+        min_rate: Minimum rate in requests per second
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, min_rate: Optional[float] = None) -> None:
+        """
+        Constructor of TokenBucket
+
+        Args:
+            rate: Maximum number of requests per second
+            burst: Maximum number of requests sent at once. Defaults to `rate` (at least 1).
+            min_rate: Minimum rate when the device is overloaded. Defaults to a tenth of `rate`.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self._tokens = self.burst
+        self._last = time.monotonic()
+
+    def _refill(self) -> None:
+        """
+        Add the tokens accumulated since the last refill.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and consume it.
+        """
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def slow_down(self) -> None:
+        """
+        Halve the rate. Called when the device is overloaded.
+        """
+        self._refill()
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def speed_up(self) -> None:
+        """
+        Increase the rate by a tenth of the configured rate, up to the configured rate. Called when a request succeeds.
+        """
+        if self.rate < self.max_rate:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of the requests sent to a device.
+
+    The circuit is opened after `threshold` consecutive failures: no request is sent to the device for `reset_timeout` seconds.
+    Requests are then allowed again: the circuit is closed by a success and opened again by a failure.
+
+    Attributes:
+        name: Device name, used in the logs
+        threshold: Number of consecutive failures opening the circuit
+        reset_timeout: Time in seconds the circuit stays open
+        failures: Number of consecutive failures
+    """
+
+    def __init__(self, name: str, threshold: int = DEFAULT_CIRCUIT_BREAKER_THRESHOLD, reset_timeout: float = DEFAULT_CIRCUIT_BREAKER_RESET) -> None:
+        """
+        Constructor of CircuitBreaker
+
+        Args:
+            name: Device name, used in the logs
+            threshold: Number of consecutive failures opening the circuit
+            reset_timeout: Time in seconds the circuit stays open
+        """
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        True if requests must not be sent to the device
+        """
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def record_success(self) -> None:
+        """
+        Record a successful request: the circuit is closed.
+        """
+        if self._opened_at is not None:
+            logger.info(f"Device {self.name} is available again")
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """
+        Record a failed request: the circuit is opened after `threshold` consecutive failures.
+        """
+        self.failures += 1
+        if self.failures >= self.threshold and not self.is_open:
+            logger.warning(f"Device {self.name} is unavailable after {self.failures} consecutive failures: no request is sent for {self.reset_timeout} seconds")
+            self._opened_at = time.monotonic()
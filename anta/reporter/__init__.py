@@ -10,18 +10,28 @@ from __future__ import annotations
 import logging
 import os.path
 import pathlib
-from typing import Any, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Sequence, overload
 
-from jinja2 import Template
 from rich.table import Table
 
 from anta import RICH_COLOR_PALETTE
+from anta.custom_types import TestStatus
 from anta.result_manager import ResultManager
+from anta.result_manager.diff import ResultChange
+from anta.result_manager.models import TestResult
+from anta.tools.pydantic import pydantic_result_to_dict
 
 from .models import ColorManager
 
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
 logger = logging.getLogger(__name__)
 
+# Default number of rows of a table page, see ReportTable.report_all_pages()
+DEFAULT_PAGE_SIZE = 500
+
 
 class ReportTable:
     """TableReport Generate a Table based on TestResult."""
@@ -90,12 +100,71 @@ class ReportTable:
             return code.style_rich() if output_type == "Text" else code.string()
         return None
 
+    def _select_results(
+        self, result_manager: ResultManager, host: Optional[str] = None, testcase: Optional[str] = None, statuses: Optional[list[TestStatus]] = None
+    ) -> list[TestResult]:
+        """
+        Select the results to report using the ResultManager indexes.
+
+        Args:
+            result_manager (ResultManager): A manager with a list of tests.
+            host (str, optional): IP Address of a host to search for. Defaults to None.
+            testcase (str, optional): A test name to search for. Defaults to None.
+            statuses (list[TestStatus], optional): Only select the results with one of these statuses. Defaults to None.
+
+        Returns:
+            list[TestResult]: The selected results
+        """
+        if statuses is not None and host is None and testcase is None:
+            # Only the results with the requested statuses are read from the ResultManager
+            return [result for status in statuses for result in result_manager.get_result_by_status(status, output_format="list")]
+        if host is None and testcase is None:
+            results = result_manager.get_results(output_format="list")
+        elif testcase is None:
+            results = result_manager.get_result_by_host(str(host), output_format="list")
+        elif host is None:
+            results = result_manager.get_result_by_test(testcase, output_format="list")
+        else:
+            results = [result for result in result_manager.get_results(output_format="list") if str(result.name) == host or str(result.test) == testcase]
+        if statuses is not None:
+            results = [result for result in results if result.result in statuses]
+        return results
+
+    def _add_rows(self, table: Table, results: list[TestResult]) -> Table:
+        """
+        Add a row per result to a table created by `_build_headers()` with the `report_all()` headers.
+
+        Args:
+            table (Table): A rich Table instance
+            results (list[TestResult]): The results to add
+
+        Returns:
+            Table: The rich Table instance with the new rows
+        """
+        # The colored status only depends on the status: compute it once per status
+        states: dict[str, Any] = {}
+        for result in results:
+            if result.result not in states:
+                states[result.result] = self._color_result(status=str(result.result), output_type="str")
+            message = self._split_list_to_txt_list(result.messages) if len(result.messages) > 0 else ""
+            categories = ", ".join(result.categories)
+            table.add_row(str(result.name), result.test, states[result.result], message, result.description, categories)
+        return table
+
+    def _build_report_all_table(self, title: str) -> Table:
+        """
+        Create an empty table with the `report_all()` headers.
+        """
+        headers = ["Device", "Test Name", "Test Status", "Message(s)", "Test description", "Test category"]
+        return self._build_headers(headers=headers, table=Table(title=title))
+
     def report_all(
         self,
         result_manager: ResultManager,
         host: Optional[str] = None,
         testcase: Optional[str] = None,
         title: str = "All tests results",
+        statuses: Optional[list[TestStatus]] = None,
     ) -> Table:
         """
         Create a table report with all tests for one or all devices.
@@ -107,28 +176,59 @@ class ReportTable:
             host (str, optional): IP Address of a host to search for. Defaults to None.
             testcase (str, optional): A test name to search for. Defaults to None.
             title (str, optional): Title for the report. Defaults to 'All tests results'.
+            statuses (list[TestStatus], optional): Only report the results with one of these statuses. Defaults to None.
+                                                   Without host and test case, the results are grouped by status.
 
         Returns:
             Table: A fully populated rich Table
         """
-        table = Table(title=title)
-        headers = ["Device", "Test Name", "Test Status", "Message(s)", "Test description", "Test category"]
-        table = self._build_headers(headers=headers, table=table)
+        # pylint: disable=too-many-arguments
+        table = self._build_report_all_table(title)
+        return self._add_rows(table, self._select_results(result_manager, host, testcase, statuses))
 
-        for result in result_manager.get_results(output_format="list"):
-            # pylint: disable=R0916
-            if (host is None and testcase is None) or (host is not None and str(result.name) == host) or (testcase is not None and testcase == str(result.test)):
-                state = self._color_result(status=str(result.result), output_type="str")
-                message = self._split_list_to_txt_list(result.messages) if len(result.messages) > 0 else ""
-                categories = ", ".join(result.categories)
-                table.add_row(str(result.name), result.test, state, message, result.description, categories)
-        return table
+    def report_all_pages(
+        self,
+        result_manager: ResultManager,
+        host: Optional[str] = None,
+        testcase: Optional[str] = None,
+        title: str = "All tests results",
+        statuses: Optional[list[TestStatus]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Table]:
+        """
+        Create the `report_all()` table report in pages of `page_size` rows.
+
+        The rows of a page are only built when the page is requested, so the first page can be printed
+        without building the rows of all the results, and the width of the columns of each page is computed
+        on its own rows only. The page number is added to the title if there is more than one page.
+
+        Args:
+            result_manager (ResultManager): A manager with a list of tests.
+            host (str, optional): IP Address of a host to search for. Defaults to None.
+            testcase (str, optional): A test name to search for. Defaults to None.
+            title (str, optional): Title for the report. Defaults to 'All tests results'.
+            statuses (list[TestStatus], optional): Only report the results with one of these statuses. Defaults to None.
+            page_size (int, optional): Maximum number of rows of a page. Defaults to DEFAULT_PAGE_SIZE.
+
+        Yields:
+            Table: A rich Table with the rows of a page. An empty table is yielded if there is no result.
+        """
+        # pylint: disable=too-many-arguments
+        results = self._select_results(result_manager, host, testcase, statuses)
+        pages = max(1, -(-len(results) // page_size))
+        for page in range(pages):
+            page_title = f"{title} ({page + 1}/{pages})" if pages > 1 else title
+            table = self._build_report_all_table(page_title)
+            start = page * page_size
+            end = start + page_size
+            yield self._add_rows(table, results[start:end])
 
     def report_summary_tests(
         self,
         result_manager: ResultManager,
         testcase: Optional[str] = None,
         title: str = "Summary per test case",
+        statuses: Optional[list[TestStatus]] = None,
     ) -> Table:
         """
         Create a table report with result agregated per test.
@@ -139,6 +239,7 @@ class ReportTable:
             result_manager (ResultManager): A manager with a list of tests.
             testcase (str, optional): A test name to search for. Defaults to None.
             title (str, optional): Title for the report. Defaults to 'All tests results'.
+            statuses (list[TestStatus], optional): Only report the test cases with at least one result with one of these statuses. Defaults to None.
 
         Returns:
             Table: A fully populated rich Table
@@ -154,22 +255,21 @@ class ReportTable:
             "List of failed or error nodes",
         ]
         table = self._build_headers(headers=headers, table=table)
-        for testcase_read in result_manager.get_testcases():
-            if testcase is None or str(testcase_read) == testcase:
-                results = result_manager.get_result_by_test(testcase_read)
-                nb_failure = len([result for result in results if result.result == "failure"])
-                nb_error = len([result for result in results if result.result == "error"])
-                list_failure = [str(result.name) for result in results if result.result in ["failure", "error"]]
-                nb_success = len([result for result in results if result.result == "success"])
-                nb_skipped = len([result for result in results if result.result == "skipped"])
-                table.add_row(
-                    testcase_read,
-                    str(nb_success),
-                    str(nb_skipped),
-                    str(nb_failure),
-                    str(nb_error),
-                    str(list_failure),
-                )
+        for testcase_read in [testcase] if testcase is not None else result_manager.get_testcases():
+            counters = result_manager.get_counters(test_name=testcase_read)
+            if not counters or (statuses is not None and not any(counters.get(status) for status in statuses)):
+                continue
+            list_failure = [
+                str(result.name) for result in result_manager.get_result_by_test(testcase_read, output_format="list") if result.result in ["failure", "error"]
+            ]
+            table.add_row(
+                testcase_read,
+                str(counters.get("success", 0)),
+                str(counters.get("skipped", 0)),
+                str(counters.get("failure", 0)),
+                str(counters.get("error", 0)),
+                str(list_failure),
+            )
         return table
 
     def report_summary_hosts(
@@ -177,6 +277,7 @@ class ReportTable:
         result_manager: ResultManager,
         host: Optional[str] = None,
         title: str = "Summary per host",
+        statuses: Optional[list[TestStatus]] = None,
     ) -> Table:
         """
         Create a table report with result agregated per host.
@@ -187,6 +288,7 @@ class ReportTable:
             result_manager (ResultManager): A manager with a list of tests.
             host (str, optional): IP Address of a host to search for. Defaults to None.
             title (str, optional): Title for the report. Defaults to 'All tests results'.
+            statuses (list[TestStatus], optional): Only report the hosts with at least one result with one of these statuses. Defaults to None.
 
         Returns:
             Table: A fully populated rich Table
@@ -201,26 +303,101 @@ class ReportTable:
             "List of failed or error test cases",
         ]
         table = self._build_headers(headers=headers, table=table)
-        for host_read in result_manager.get_hosts():
-            if host is None or str(host_read) == host:
-                results = result_manager.get_result_by_host(host_read)
-                logger.debug("data to use for computation")
-                logger.debug(f"{host}: {results}")
-                nb_failure = len([result for result in results if result.result == "failure"])
-                nb_error = len([result for result in results if result.result == "error"])
-                list_failure = [str(result.test) for result in results if result.result in ["failure", "error"]]
-                nb_success = len([result for result in results if result.result == "success"])
-                nb_skipped = len([result for result in results if result.result == "skipped"])
-                table.add_row(
-                    str(host_read),
-                    str(nb_success),
-                    str(nb_skipped),
-                    str(nb_failure),
-                    str(nb_error),
-                    str(list_failure),
-                )
+        for host_read in [host] if host is not None else result_manager.get_hosts():
+            counters = result_manager.get_counters(host_ip=host_read)
+            if not counters or (statuses is not None and not any(counters.get(status) for status in statuses)):
+                continue
+            list_failure = [
+                str(result.test) for result in result_manager.get_result_by_host(host_read, output_format="list") if result.result in ["failure", "error"]
+            ]
+            table.add_row(
+                str(host_read),
+                str(counters.get("success", 0)),
+                str(counters.get("skipped", 0)),
+                str(counters.get("failure", 0)),
+                str(counters.get("error", 0)),
+                str(list_failure),
+            )
         return table
 
+    def report_diff(self, changes: Iterable[ResultChange], title: str = "Changes since baseline") -> Table:
+        """
+        Create a table report with the changes of the test results since a baseline run.
+
+        Create table with full output: Device / Test Name / Change / Previous Status / Current Status
+
+        Args:
+            changes (Iterable[ResultChange]): The changes, output of anta.result_manager.diff.diff_results().
+            title (str, optional): Title for the report. Defaults to 'Changes since baseline'.
+
+        Returns:
+            Table: A fully populated rich Table
+        """
+        table = Table(title=title)
+        headers = ["Device", "Test Name", "Change", "Previous Status", "Current Status"]
+        table = self._build_headers(headers=headers, table=table)
+        for change in changes:
+            before = (self._color_result(status=change.before, output_type="str") or change.before) if change.before is not None else "-"
+            after = (self._color_result(status=change.after, output_type="str") or change.after) if change.after is not None else "-"
+            table.add_row(change.name, change.test, change.change.replace("_", " "), before, after)
+        return table
+
+
+class LazyResults(Sequence[Dict[str, Any]]):
+    """
+    Read-only sequence of test results provided to a Jinja2 template.
+
+    Each TestResult is converted to a dictionary, as in `ResultManager.get_results(output_format="json")`,
+    only when it is accessed by the template: the dictionaries of all the results are never built at once.
+    """
+
+    def __init__(self, results: Sequence[TestResult]) -> None:
+        """
+        Args:
+            results: The test results
+        """
+        self._results = results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(index, slice):
+            return [pydantic_result_to_dict(result) for result in self._results[index]]
+        return pydantic_result_to_dict(self._results[index])
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for result in self._results:
+            yield pydantic_result_to_dict(result)
+
+
+@lru_cache(maxsize=None)
+def _jinja_environment(directory: pathlib.Path, trim_blocks: bool, lstrip_blocks: bool) -> Environment:
+    """
+    Return the Jinja2 Environment loading the templates of a directory.
+
+    Environments are shared by the ReportJinja instances: a template is only compiled once and reloaded if the file changes.
+    The compiled templates are also cached on disk to be reused across ANTA runs.
+    Jinja2 is only imported when a template is rendered.
+    """
+    # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    try:
+        bytecode_cache: Optional[FileSystemBytecodeCache] = FileSystemBytecodeCache()
+    except RuntimeError as e:
+        logger.debug(f"Jinja2 templates bytecode cache is disabled: {e}")
+        bytecode_cache = None
+    return Environment(loader=FileSystemLoader(directory), trim_blocks=trim_blocks, lstrip_blocks=lstrip_blocks, bytecode_cache=bytecode_cache)
+
 
 class ReportJinja:
     """Report builder based on a Jinja2 template."""
@@ -231,7 +408,14 @@ class ReportJinja:
         else:
             raise FileNotFoundError(f"template file is not found: {template_path}")
 
-    def render(self, data: list[dict[str, Any]], trim_blocks: bool = True, lstrip_blocks: bool = True) -> str:
+    def _template(self, trim_blocks: bool, lstrip_blocks: bool) -> Template:
+        """
+        Get the compiled template.
+        """
+        path = pathlib.Path(self.tempalte_path).resolve()
+        return _jinja_environment(path.parent, trim_blocks, lstrip_blocks).get_template(path.name)
+
+    def render(self, data: Iterable[dict[str, Any]], trim_blocks: bool = True, lstrip_blocks: bool = True) -> str:
         """
         Build a report based on a Jinja2 template
 
@@ -252,14 +436,27 @@ class ReportJinja:
         ]
 
         Args:
-            data (list[dict[str, Any]]): List of results from ResultManager.get_results
+            data (Iterable[dict[str, Any]]): Results from ResultManager.get_results, e.g. a LazyResults instance
             trim_blocks (bool, optional): enable trim_blocks for J2 rendering. Defaults to True.
             lstrip_blocks (bool, optional): enable lstrip_blocks for J2 rendering. Defaults to True.
 
         Returns:
             str: rendered template
         """
-        with open(self.tempalte_path, encoding="utf-8") as file_:
-            template = Template(file_.read(), trim_blocks=trim_blocks, lstrip_blocks=lstrip_blocks)
+        return self._template(trim_blocks, lstrip_blocks).render({"data": data})
+
+    def generate(self, data: Iterable[dict[str, Any]], output: pathlib.Path, trim_blocks: bool = True, lstrip_blocks: bool = True) -> None:
+        """
+        Build a report based on a Jinja2 template and stream it to a file.
 
-        return template.render({"data": data})
+        The report is written to the file as it is rendered, without building the whole report in memory.
+        See `render()` for the data structure sent to the template.
+
+        Args:
+            data (Iterable[dict[str, Any]]): Results from ResultManager.get_results, e.g. a LazyResults instance
+            output (pathlib.Path): Path of the report file. The file is truncated if it exists.
+            trim_blocks (bool, optional): enable trim_blocks for J2 rendering. Defaults to True.
+            lstrip_blocks (bool, optional): enable lstrip_blocks for J2 rendering. Defaults to True.
+        """
+        with open(output, "w", encoding="utf-8") as file:
+            file.writelines(self._template(trim_blocks, lstrip_blocks).generate({"data": data}))
@@ -8,18 +8,28 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence, Union, cast
 
 from pydantic import TypeAdapter
 
 from anta.custom_types import TestStatus
-from anta.result_manager.models import ListResult, TestResult
+from anta.result_manager.models import CompactTestResult, ListResult, TestResult
 from anta.tools.pydantic import pydantic_to_dict
 
+if TYPE_CHECKING:
+    from anta.result_manager.sinks import ResultSink
+
 logger = logging.getLogger(__name__)
 
+# Validator of the test statuses, built once as building a TypeAdapter is expensive
+TEST_STATUS_VALIDATOR: TypeAdapter[TestStatus] = TypeAdapter(TestStatus)  # type: ignore[arg-type]
+
+# A result stored by the ResultManager
+ResultEntry = Union[TestResult, CompactTestResult]
 
-class ResultManager:
+
+class ResultManager:  # pylint: disable=too-many-instance-attributes
     """
     Helper to manage Test Results and generate reports.
 
@@ -67,7 +77,7 @@ class ResultManager:
             ]
     """
 
-    def __init__(self) -> None:
+    def __init__(self, sinks: Optional[list[ResultSink]] = None, compact: bool = False) -> None:
         """
         Class constructor.
 
@@ -88,8 +98,34 @@ class ResultManager:
 
         If the status of the added test is error, the status is untouched and the
         error_status is set to True.
+
+        The results are indexed by device name, test name, category and status as they are added,
+        and the number of results per status is counted, so the results can be filtered and summarized
+        without scanning all the results. A TestResult must not be modified once added to the ResultManager.
+
+        With `compact`, the results are stored as CompactTestResult instances to reduce memory usage on large runs:
+        they are converted back to new TestResult instances each time they are retrieved, so the memory used by
+        the results is only reduced until a report is rendered. The categories are shared through an intern table
+        owned by this instance.
+
+        Args:
+            sinks: ResultSink objects receiving each TestResult as soon as it is added. Defaults to None.
+            compact: Store the results as CompactTestResult instances. Defaults to False.
         """
         self._result_entries = ListResult()
+        self._compact_entries: list[CompactTestResult] = []
+        self._categories_table: dict[tuple[str, ...], tuple[str, ...]] = {}
+        self.compact = compact
+        self.sinks: list[ResultSink] = sinks if sinks is not None else []
+        # Indexes of the results. Dictionaries keep the order in which the keys have been added.
+        self._results_by_host: dict[str, list[ResultEntry]] = {}
+        self._results_by_test: dict[str, list[ResultEntry]] = {}
+        self._results_by_category: dict[str, list[ResultEntry]] = {}
+        self._results_by_status: dict[str, list[ResultEntry]] = {}
+        # Number of results per status, for all the results and per device name and test name
+        self._counters: Counter[str] = Counter()
+        self._counters_by_host: dict[str, Counter[str]] = {}
+        self._counters_by_test: dict[str, Counter[str]] = {}
         # Initialize status
         self.status: TestStatus = "unset"
         self.error_status = False
@@ -98,14 +134,13 @@ class ResultManager:
         """
         Implement __len__ method to count number of results.
         """
-        return len(self._result_entries)
+        return len(self._compact_entries) if self.compact else len(self._result_entries)
 
     def _update_status(self, test_status: TestStatus) -> None:
         """
         Update ResultManager status based on the table above.
         """
-        ResultValidator = TypeAdapter(TestStatus)
-        ResultValidator.validate_python(test_status)
+        TEST_STATUS_VALIDATOR.validate_python(test_status)
         if test_status == "error":
             self.error_status = True
             return
@@ -116,23 +151,64 @@ class ResultManager:
         elif self.status == "success" and test_status == "failure":
             self.status = "failure"
 
+    def _index(self, entry: ResultEntry) -> None:
+        """
+        Add a result to the indexes and update the counters.
+        """
+        host = str(entry.name)
+        test = str(entry.test)
+        self._results_by_host.setdefault(host, []).append(entry)
+        self._results_by_test.setdefault(test, []).append(entry)
+        for category in entry.categories:
+            self._results_by_category.setdefault(category, []).append(entry)
+        self._results_by_status.setdefault(entry.result, []).append(entry)
+        self._counters[entry.result] += 1
+        self._counters_by_host.setdefault(host, Counter())[entry.result] += 1
+        self._counters_by_test.setdefault(test, Counter())[entry.result] += 1
+
     def add_test_result(self, entry: TestResult) -> None:
         """Add a result to the list
 
         Args:
             entry (TestResult): TestResult data to add to the report
         """
-        self._result_entries.append(entry)
+        stored: ResultEntry = entry
+        if self.compact:
+            stored = CompactTestResult.from_test_result(entry, self._categories_table)
+            self._compact_entries.append(stored)
+        else:
+            self._result_entries.append(entry)
         self._update_status(entry.result)
+        self._index(stored)
+        for sink in self.sinks:
+            sink.write(entry)
 
-    def add_test_results(self, entries: list[TestResult]) -> None:
+    def add_test_results(self, entries: Iterable[TestResult]) -> None:
         """Add a list of results to the list
 
+        Fast path for bulk ingestion: the ResultManager status is updated once per distinct
+        status of the entries instead of validating the status of each entry.
+
         Args:
-            entries (list[TestResult]): List of TestResult data to add to the report
+            entries (Iterable[TestResult]): TestResult data to add to the report, e.g. a list or a ListResult
         """
-        for e in entries:
-            self.add_test_result(e)
+        entries = list(entries)
+        stored: list[ResultEntry]
+        if self.compact:
+            compact_entries = [CompactTestResult.from_test_result(entry, self._categories_table) for entry in entries]
+            self._compact_entries.extend(compact_entries)
+            stored = list(compact_entries)
+        else:
+            self._result_entries.extend(entries)
+            stored = list(entries)
+        statuses: set[TestStatus] = set()
+        for entry, stored_entry in zip(entries, stored):
+            statuses.add(entry.result)
+            self._index(stored_entry)
+            for sink in self.sinks:
+                sink.write(entry)
+        for status in statuses:
+            self._update_status(status)
 
     def get_status(self, ignore_error: bool = False) -> str:
         """
@@ -155,6 +231,9 @@ class ResultManager:
         Returns:
             any: List of results.
         """
+        if self.compact:
+            return self._results_in_format(self._compact_entries, output_format)
+
         if output_format == "list":
             return list(self._result_entries)
 
@@ -166,6 +245,31 @@ class ResultManager:
             return self._result_entries
         raise ValueError(f"{output_format} is not a valid value ['list', 'json', 'native']")
 
+    def _results_in_format(self, results: Sequence[ResultEntry], output_format: str) -> Any:
+        """
+        Return stored results in the requested format: native (ListResult), list or json.
+        CompactTestResult instances are converted to TestResult instances.
+        """
+        if self.compact:
+            test_results = [cast(CompactTestResult, entry).to_test_result() for entry in results]
+        else:
+            test_results = cast("list[TestResult]", results)
+        if output_format == "list":
+            return list(test_results)
+        if output_format == "json":
+            return json.dumps(pydantic_to_dict(test_results), indent=4)
+        if output_format == "native":
+            result_manager_filtered = ListResult()
+            result_manager_filtered.extend(test_results)
+            return result_manager_filtered
+        raise ValueError(f"{output_format} is not a valid value ['list', 'json', 'native']")
+
+    def _filtered_results(self, results: list[ResultEntry], output_format: str) -> Any:
+        """
+        Return indexed results in the requested format: native (ListResult) or list.
+        """
+        return self._results_in_format(results, "list" if output_format == "list" else "native")
+
     def get_result_by_test(self, test_name: str, output_format: str = "native") -> Any:
         """
         Get list of test result for a given test.
@@ -177,14 +281,7 @@ class ResultManager:
         Returns:
             list[TestResult]: List of results related to the test.
         """
-        if output_format == "list":
-            return [result for result in self._result_entries if str(result.test) == test_name]
-
-        result_manager_filtered = ListResult()
-        for result in self._result_entries:
-            if result.test == test_name:
-                result_manager_filtered.append(result)
-        return result_manager_filtered
+        return self._filtered_results(self._results_by_test.get(test_name, []), output_format)
 
     def get_result_by_host(self, host_ip: str, output_format: str = "native") -> Any:
         """
@@ -197,14 +294,51 @@ class ResultManager:
         Returns:
             Any: List of results related to the host.
         """
-        if output_format == "list":
-            return [result for result in self._result_entries if str(result.name) == host_ip]
+        return self._filtered_results(self._results_by_host.get(host_ip, []), output_format)
+
+    def get_result_by_category(self, category: str, output_format: str = "native") -> Any:
+        """
+        Get list of test result for a given category.
+
+        Args:
+            category (str): Category to use to filter results.
+            output_format (str, optional): format selector. Can be either native/list. Defaults to 'native'.
+
+        Returns:
+            Any: List of results related to the category.
+        """
+        return self._filtered_results(self._results_by_category.get(category, []), output_format)
+
+    def get_result_by_status(self, status: TestStatus, output_format: str = "native") -> Any:
+        """
+        Get list of test result for a given status.
+
+        Args:
+            status (TestStatus): Status to use to filter results.
+            output_format (str, optional): format selector. Can be either native/list. Defaults to 'native'.
+
+        Returns:
+            Any: List of results with this status.
+        """
+        return self._filtered_results(self._results_by_status.get(status, []), output_format)
 
-        result_manager_filtered = ListResult()
-        for result in self._result_entries:
-            if str(result.name) == host_ip:
-                result_manager_filtered.append(result)
-        return result_manager_filtered
+    def get_counters(self, host_ip: Optional[str] = None, test_name: Optional[str] = None) -> dict[str, int]:
+        """
+        Get the number of results per status.
+
+        Args:
+            host_ip (str, optional): Only count the results of this host. Defaults to None.
+            test_name (str, optional): Only count the results of this test. Defaults to None.
+                                       Ignored if `host_ip` is provided.
+
+        Returns:
+            dict[str, int]: Number of results per status. Statuses without results are not included.
+        """
+        if host_ip is not None:
+            return dict(self._counters_by_host.get(host_ip, {}))
+        if test_name is not None:
+            return dict(self._counters_by_test.get(test_name, {}))
+        return dict(self._counters)
 
     def get_testcases(self) -> list[str]:
         """
@@ -213,11 +347,7 @@ class ResultManager:
         Returns:
             list[str]: List of names for all tests.
         """
-        result_list = []
-        for testcase in self._result_entries:
-            if str(testcase.test) not in result_list:
-                result_list.append(str(testcase.test))
-        return result_list
+        return list(self._results_by_test)
 
     def get_hosts(self) -> list[str]:
         """
@@ -226,8 +356,13 @@ class ResultManager:
         Returns:
             list[str]: List of IP addresses.
         """
-        result_list = []
-        for testcase in self._result_entries:
-            if str(testcase.name) not in result_list:
-                result_list.append(str(testcase.name))
-        return result_list
+        return list(self._results_by_host)
+
+    def get_categories(self) -> list[str]:
+        """
+        Get list of categories in current manager.
+
+        Returns:
+            list[str]: List of categories.
+        """
+        return list(self._results_by_category)
@@ -0,0 +1,231 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Columnar store of test results.
+
+The device names, test names, statuses, descriptions, categories and inputs hashes of the results are dictionary-encoded:
+each distinct value is stored once and each result only stores an integer code per column.
+The store can be exported to a Parquet file if pyarrow is installed, or to a gzip-compressed JSON document otherwise.
+"""
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import json
+import logging
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from anta.result_manager.models import TestResult
+from anta.result_manager.sinks import ResultSink
+
+if TYPE_CHECKING:
+    import pyarrow
+
+logger = logging.getLogger(__name__)
+
+ColumnarFormat = Literal["parquet", "json"]
+
+# Dictionary-encoded columns. The categories of a result are encoded as a tuple.
+DICTIONARY_COLUMNS = ("name", "test", "result", "description", "categories", "inputs_hash")
+# Columns stored as is
+PLAIN_COLUMNS = ("messages", "error", "custom_field")
+
+
+class ColumnarResults(ResultSink):
+    """
+    Store test results in a columnar layout.
+
+    This is a ResultSink: provide it to a ResultManager to keep the results in a columnar layout as they are added.
+    If a path is provided, the results are exported to this file when the sink is closed.
+
+    Attributes:
+        path: Path of the file the results are exported to when the sink is closed
+        export_format: Format of the exported file. See `export()`.
+        dictionaries: Distinct values of each dictionary-encoded column, in order of appearance
+        codes: Codes of each dictionary-encoded column: index of the value of each result in the column dictionary
+        plain: Values of the columns that are not dictionary-encoded. The exception of an error is stored as a string.
+    """
+
+    def __init__(self, path: Optional[Path] = None, export_format: Optional[ColumnarFormat] = None) -> None:
+        """
+        Constructor of ColumnarResults
+
+        Args:
+            path: Path of the file the results are exported to when the sink is closed. Defaults to None.
+            export_format: Format of the exported file. See `export()`.
+        """
+        self.path = path
+        self.export_format = export_format
+        self.dictionaries: dict[str, list[Any]] = {column: [] for column in DICTIONARY_COLUMNS}
+        self.codes: dict[str, array[int]] = {column: array("I") for column in DICTIONARY_COLUMNS}
+        self.plain: dict[str, list[Any]] = {column: [] for column in PLAIN_COLUMNS}
+        self._lookups: dict[str, dict[Any, int]] = {column: {} for column in DICTIONARY_COLUMNS}
+
+    def __len__(self) -> int:
+        """
+        Number of results in the store
+        """
+        return len(self.codes["name"])
+
+    def _encode(self, column: str, value: Any) -> None:
+        """
+        Append a value to a dictionary-encoded column.
+        """
+        lookup = self._lookups[column]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+            self.dictionaries[column].append(value)
+        self.codes[column].append(code)
+
+    def write(self, result: TestResult) -> None:
+        """
+        Append a TestResult to the columns.
+
+        Args:
+            result: TestResult to append
+        """
+        self._encode("name", result.name)
+        self._encode("test", result.test)
+        self._encode("result", result.result)
+        self._encode("description", result.description)
+        self._encode("categories", tuple(result.categories))
+        self._encode("inputs_hash", result.inputs_hash)
+        self.plain["messages"].append(tuple(result.messages))
+        self.plain["error"].append(str(result.error) if result.error is not None else None)
+        self.plain["custom_field"].append(result.custom_field)
+
+    def column(self, column: str) -> list[Any]:
+        """
+        Get the decoded values of a column.
+
+        Args:
+            column: Name of the column. One of the TestResult fields.
+
+        Returns:
+            list[Any]: The value of each result. Categories and messages are returned as lists.
+        """
+        if column in self.plain:
+            values = self.plain[column]
+            return [list(value) for value in values] if column == "messages" else list(values)
+        dictionary = self.dictionaries[column]
+        if column == "categories":
+            return [list(dictionary[code]) for code in self.codes[column]]
+        return [dictionary[code] for code in self.codes[column]]
+
+    def counts(self, column: str) -> dict[Any, int]:
+        """
+        Count the results per value of a dictionary-encoded column without decoding the column.
+
+        Args:
+            column: Name of a dictionary-encoded column.
+
+        Returns:
+            dict[Any, int]: Number of results per value of the column. The categories are counted per tuple of categories.
+        """
+        dictionary = self.dictionaries[column]
+        return {dictionary[code]: count for code, count in Counter(self.codes[column]).items()}
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the columns as a JSON serializable dictionary. This is the content of the exported JSON document.
+
+        Returns:
+            dict[str, Any]: A dictionary with the 'dictionaries' and 'codes' of the dictionary-encoded columns and the values of the 'plain' columns.
+        """
+        return {
+            "dictionaries": {column: [list(value) if column == "categories" else value for value in values] for column, values in self.dictionaries.items()},
+            "codes": {column: codes.tolist() for column, codes in self.codes.items()},
+            "plain": {column: [list(value) if column == "messages" else value for value in values] for column, values in self.plain.items()},
+        }
+
+    def to_arrow(self) -> pyarrow.Table:
+        """
+        Build a pyarrow Table from the columns. The dictionary-encoded columns are built as Arrow dictionary arrays.
+        Requires the 'pyarrow' Python package.
+
+        Returns:
+            pyarrow.Table: The results table
+        """
+        import pyarrow  # pylint: disable=import-outside-toplevel,redefined-outer-name,import-error
+
+        arrays = {}
+        for column in DICTIONARY_COLUMNS:
+            if column == "categories":
+                # Parquet does not support dictionary-encoded lists
+                arrays[column] = pyarrow.array(self.column(column), type=pyarrow.list_(pyarrow.string()))
+            else:
+                dictionary = self.dictionaries[column]
+                codes: Any = self.codes[column]
+                if None in dictionary:
+                    # Missing values (e.g. no inputs hash) are encoded as null indices
+                    null_code = dictionary.index(None)
+                    codes = [None if code == null_code else code for code in codes]
+                    dictionary = ["" if value is None else value for value in dictionary]
+                arrays[column] = pyarrow.DictionaryArray.from_arrays(pyarrow.array(codes, type=pyarrow.uint32()), pyarrow.array(dictionary, type=pyarrow.string()))
+        arrays["messages"] = pyarrow.array(self.column("messages"), type=pyarrow.list_(pyarrow.string()))
+        arrays["error"] = pyarrow.array(self.plain["error"], type=pyarrow.string())
+        arrays["custom_field"] = pyarrow.array(self.plain["custom_field"], type=pyarrow.string())
+        return pyarrow.table(arrays)
+
+    def export(self, path: Path, export_format: Optional[ColumnarFormat] = None) -> ColumnarFormat:
+        """
+        Export the columns to a file.
+
+        Args:
+            path: Path of the file. The file is truncated if it exists.
+            export_format: 'parquet' writes a Parquet file and requires the 'pyarrow' Python package.
+                           'json' writes a gzip-compressed JSON document, see `to_dict()`.
+                           By default, 'parquet' is used if pyarrow is installed, 'json' otherwise.
+
+        Returns:
+            ColumnarFormat: The format of the exported file.
+        """
+        if export_format is None:
+            export_format = "parquet" if importlib.util.find_spec("pyarrow") is not None else "json"
+            if export_format == "json":
+                logger.info(f"The 'pyarrow' Python package is not installed: test results are exported to {path} as gzip-compressed JSON")
+        if export_format == "parquet":
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel,redefined-outer-name,import-error
+
+            pyarrow.parquet.write_table(self.to_arrow(), path)
+        else:
+            with gzip.open(path, "wt", encoding="utf-8") as file:
+                json.dump(self.to_dict(), file)
+        logger.debug(f"{len(self)} test results exported to {path} in {export_format} format")
+        return export_format
+
+    @classmethod
+    def load(cls, path: Path) -> ColumnarResults:
+        """
+        Load the columns from a gzip-compressed JSON document written by `export()`.
+
+        Args:
+            path: Path of the file.
+
+        Returns:
+            ColumnarResults: The results store
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            data = json.load(file)
+        store = cls()
+        for column in DICTIONARY_COLUMNS:
+            values = data["dictionaries"][column]
+            store.dictionaries[column] = [tuple(value) for value in values] if column == "categories" else values
+            store._lookups[column] = {value: code for code, value in enumerate(store.dictionaries[column])}
+            store.codes[column] = array("I", data["codes"][column])
+        for column in PLAIN_COLUMNS:
+            values = data["plain"][column]
+            store.plain[column] = [tuple(value) for value in values] if column == "messages" else values
+        return store
+
+    def close(self) -> None:
+        """
+        Export the results to `path` if provided.
+        """
+        if self.path is not None:
+            self.export(self.path, self.export_format)
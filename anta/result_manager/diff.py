@@ -0,0 +1,119 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Comparison of the test results of two ANTA runs.
+
+A test result is identified by its device name, its test name and its inputs hash. The baseline results
+are indexed by this key and the current results are compared to the baseline as they are read:
+only the key and the status of the baseline results are kept in memory.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, Literal, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from anta.custom_types import TestStatus
+from anta.result_manager.models import CompactTestResult, TestResult
+
+logger = logging.getLogger(__name__)
+
+ChangeType = Literal["new_failure", "recovery", "status_change", "added", "removed"]
+# A test result: TestResult instance or dictionary from an exported file
+ResultLike = Union[TestResult, CompactTestResult, Dict[str, Any]]
+ResultKey = Tuple[str, str, Optional[str]]
+
+FAILING_STATUSES = ("failure", "error")
+
+
+class ResultChange(BaseModel):
+    """
+    Change of a test result between two runs.
+
+    Attributes:
+        name: Device name
+        test: Test name
+        inputs_hash: Hash of the test inputs
+        change: Type of change:
+                - new_failure: the test is now in failure or in error, or is a new test in failure or in error
+                - recovery: the test was in failure or in error and is not anymore
+                - status_change: any other status change
+                - added: new test which is not in failure or in error
+                - removed: the test is not in the current results anymore
+        before: Status in the baseline results. None for an added test.
+        after: Status in the current results. None for a removed test.
+    """
+
+    name: str
+    test: str
+    inputs_hash: Optional[str] = None
+    change: ChangeType
+    before: Optional[TestStatus] = None
+    after: Optional[TestStatus] = None
+
+
+def _key_status(result: ResultLike) -> tuple[ResultKey, TestStatus]:
+    """
+    Return the key identifying a test result and its status.
+    """
+    if isinstance(result, dict):
+        # Exported files contain the string "None" for missing values
+        digest = result.get("inputs_hash")
+        return (result["name"], result["test"], None if digest in (None, "None") else digest), result["result"]
+    return (result.name, result.test, result.inputs_hash), result.result
+
+
+def _change_type(before: Optional[TestStatus], after: Optional[TestStatus]) -> Optional[ChangeType]:
+    """
+    Classify the change of status of a test result. Return None if the status has not changed.
+    """
+    if before == after:
+        return None
+    if after is None:
+        return "removed"
+    if after in FAILING_STATUSES and before not in FAILING_STATUSES:
+        return "new_failure"
+    if before is None:
+        return "added"
+    if before in FAILING_STATUSES and after not in FAILING_STATUSES:
+        return "recovery"
+    return "status_change"
+
+
+def diff_results(baseline: Iterable[ResultLike], current: Iterable[ResultLike]) -> Iterator[ResultChange]:
+    """
+    Compare test results to baseline results.
+
+    Both inputs are iterated once: they can be the results of a ResultManager, the output of `anta.result_manager.export.read_results()`
+    or any iterable of TestResult instances or dictionaries. The changes are yielded as the current results are read,
+    the removed tests are yielded last. If a key identifies several test results, they are compared in order.
+
+    Args:
+        baseline: The baseline test results.
+        current: The current test results.
+
+    Yields:
+        ResultChange: The changes, in the order of the current results.
+    """
+    index: dict[ResultKey, list[TestStatus]] = {}
+    for result in baseline:
+        key, status = _key_status(result)
+        index.setdefault(key, []).append(status)
+
+    for result in current:
+        key, after = _key_status(result)
+        statuses = index.get(key)
+        before: Optional[TestStatus] = None
+        if statuses:
+            before = statuses.pop(0)
+            if not statuses:
+                del index[key]
+        change = _change_type(before, after)
+        if change is not None:
+            yield ResultChange(name=key[0], test=key[1], inputs_hash=key[2], change=change, before=before, after=after)
+
+    for key, statuses in index.items():
+        for before in statuses:
+            yield ResultChange(name=key[0], test=key[1], inputs_hash=key[2], change="removed", before=before, after=None)
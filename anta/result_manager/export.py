@@ -0,0 +1,145 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Export of test results to JSON files.
+
+The results are serialized one by one and written to the file as they are serialized:
+the whole document is never built in memory. Exported files are read back the same way.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import textwrap
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Literal, Optional
+
+from anta.result_manager.models import TestResult
+from anta.tools.pydantic import pydantic_result_to_dict
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["json", "ndjson"]
+
+# Size of the chunks read from the exported files
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def write_results(results: Iterable[TestResult], file: IO[str], output_format: ExportFormat = "json", indent: Optional[int] = 4) -> int:
+    """
+    Write test results to a file object.
+
+    Args:
+        results: The test results to write.
+        file: A text file object.
+        output_format: 'json' writes a JSON array, identical to `ResultManager.get_results(output_format="json")`.
+                       'ndjson' writes one JSON object per line.
+        indent: Indentation of the JSON array. Ignored with the 'ndjson' format.
+
+    Returns:
+        int: The number of results written.
+    """
+    count = 0
+    if output_format == "ndjson":
+        for count, result in enumerate(results, start=1):
+            file.write(json.dumps(pydantic_result_to_dict(result)))
+            file.write("\n")
+        return count
+    separator = ",\n" if indent is not None else ", "
+    prefix = " " * indent if indent else ""
+    for count, result in enumerate(results, start=1):
+        file.write(separator if count > 1 else ("[\n" if indent is not None else "["))
+        file.write(textwrap.indent(json.dumps(pydantic_result_to_dict(result), indent=indent), prefix))
+    if count == 0:
+        file.write("[]")
+    else:
+        file.write("\n]" if indent is not None else "]")
+    return count
+
+
+def export_results(
+    results: Iterable[TestResult], path: Path, output_format: ExportFormat = "json", indent: Optional[int] = 4, compress: Optional[bool] = None
+) -> int:
+    """
+    Export test results to a file.
+
+    Args:
+        results: The test results to export.
+        path: Path of the file. The file is truncated if it exists.
+        output_format: 'json' or 'ndjson'. See `write_results()`.
+        indent: Indentation of the JSON array. Ignored with the 'ndjson' format.
+        compress: Compress the file with gzip. By default, the file is compressed if its name ends with '.gz'.
+
+    Returns:
+        int: The number of results exported.
+    """
+    # pylint: disable=too-many-arguments
+    if compress is None:
+        compress = path.suffix == ".gz"
+    with gzip.open(path, "wt", encoding="utf-8") if compress else open(path, "w", encoding="utf-8") as file:
+        count = write_results(results, file, output_format=output_format, indent=indent)
+    logger.debug(f"{count} test results exported to {path}")
+    return count
+
+
+def _iter_json_array(file: IO[str]) -> Iterator[dict[str, Any]]:
+    """
+    Decode the objects of a JSON array chunk by chunk.
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(READ_CHUNK_SIZE).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("JSON document is not an array")
+    position = 1
+    eof = False
+    while True:
+        # Skip the whitespaces and the separator between two objects
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            entry, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = file.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield entry
+        position = end
+
+
+def read_results(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    Read test results from a file exported by `export_results()` or written by the JSON lines sink.
+
+    The format is detected from the content of the file: JSON array or one JSON object per line,
+    gzip-compressed or not. The results are decoded one by one: the whole document is never loaded in memory.
+
+    Args:
+        path: Path of the file.
+
+    Yields:
+        dict[str, Any]: The test results, as in `ResultManager.get_results(output_format="json")`.
+    """
+    with open(path, "rb") as binary:
+        compressed = binary.read(2) == b"\x1f\x8b"
+    with gzip.open(path, "rt", encoding="utf-8") if compressed else open(path, encoding="utf-8") as file:
+        first = ""
+        while not first:
+            char = file.read(1)
+            if not char:
+                return
+            first = char.strip()
+        file.seek(0)
+        if first == "[":
+            yield from _iter_json_array(file)
+            return
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
@@ -4,10 +4,11 @@
 """Models related to anta.result_manager module."""
 from __future__ import annotations
 
+import sys
 from collections.abc import Iterator
 
 # Need to keep List for pydantic in 3.8
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict, RootModel
 
@@ -27,6 +28,7 @@ class TestResult(BaseModel):
         message: Message to report after the test if any.
         error: Exception object if the test result is "error" and an Exception occured
         custom_field: Custom field to store a string for flexibility in integrating with ANTA
+        inputs_hash: Hash of the test inputs. With the device name and the test name, it identifies the test in a catalog.
     """
 
     # This is required if we want to keep an Exception object in the error field
@@ -40,6 +42,7 @@ class TestResult(BaseModel):
     messages: List[str] = []
     error: Optional[Exception] = None
     custom_field: Optional[str] = None
+    inputs_hash: Optional[str] = None
 
     def is_success(self, message: str | None = None) -> None:
         """
@@ -97,6 +100,118 @@ class TestResult(BaseModel):
         return f"Test {self.test} on device {self.name} has result {self.result}"
 
 
+class CompactError(Exception):
+    """
+    Exception of a CompactTestResult converted back to a TestResult.
+    Only the type name and the message of the original exception are kept.
+
+    Attributes:
+        error_type: Type name of the original exception
+    """
+
+    def __init__(self, error_type: str, message: str) -> None:
+        super().__init__(message)
+        self.error_type = error_type
+
+    def __repr__(self) -> str:
+        return f"{self.error_type}({str(self)!r})"
+
+
+class CompactTestResult:  # pylint: disable=too-many-instance-attributes
+    """
+    Memory-efficient representation of a TestResult for large runs.
+
+    Compared to TestResult, instances have no `__dict__`, the device name, test name and description
+    are interned so they are shared by all the results of a device or a test, the categories can be shared
+    through an intern table, the messages are stored as a tuple and the exception of an error is reduced
+    to its type name and message. A result with one message takes about 10 times less memory.
+
+    Use `from_test_result()` to build an instance and `to_test_result()` to convert it back to a TestResult.
+    """
+
+    __slots__ = ("name", "test", "categories", "description", "result", "messages", "error_type", "error_message", "custom_field", "inputs_hash")
+
+    def __init__(
+        self,
+        name: str,
+        test: str,
+        categories: Tuple[str, ...],
+        description: str,
+        result: TestStatus = "unset",
+        messages: Tuple[str, ...] = (),
+        error_type: Optional[str] = None,
+        error_message: Optional[str] = None,
+        custom_field: Optional[str] = None,
+        inputs_hash: Optional[str] = None,
+    ) -> None:
+        # pylint: disable=too-many-arguments
+        self.name = name
+        self.test = test
+        self.categories = categories
+        self.description = description
+        self.result: TestStatus = result
+        self.messages = messages
+        self.error_type = error_type
+        self.error_message = error_message
+        self.custom_field = custom_field
+        self.inputs_hash = inputs_hash
+
+    @classmethod
+    def from_test_result(cls, result: TestResult, categories_table: Optional[dict[Tuple[str, ...], Tuple[str, ...]]] = None) -> CompactTestResult:
+        """
+        Build a CompactTestResult from a TestResult.
+
+        Args:
+            result: The TestResult to compact
+            categories_table: Intern table of the categories tuples, shared by the results of a ResultManager.
+                              Defaults to None: the categories tuple is not shared.
+
+        Returns:
+            CompactTestResult: The compact representation of the TestResult
+        """
+        categories = tuple(result.categories)
+        if categories_table is not None:
+            categories = categories_table.setdefault(categories, categories)
+        error = result.error
+        return cls(
+            name=sys.intern(result.name),
+            test=sys.intern(result.test),
+            categories=categories,
+            description=sys.intern(result.description),
+            result=result.result,
+            messages=tuple(result.messages),
+            error_type=type(error).__name__ if error is not None else None,
+            error_message=str(error) if error is not None else None,
+            custom_field=result.custom_field,
+            inputs_hash=sys.intern(result.inputs_hash) if result.inputs_hash is not None else None,
+        )
+
+    def to_test_result(self) -> TestResult:
+        """
+        Convert this CompactTestResult back to a TestResult. The exception of an error is rebuilt as a CompactError.
+
+        Returns:
+            TestResult: A new TestResult instance
+        """
+        return TestResult.model_construct(
+            name=self.name,
+            test=self.test,
+            categories=list(self.categories),
+            description=self.description,
+            result=self.result,
+            messages=list(self.messages),
+            error=CompactError(self.error_type, self.error_message or "") if self.error_type is not None else None,
+            custom_field=self.custom_field,
+            inputs_hash=self.inputs_hash,
+        )
+
+    def __str__(self) -> str:
+        """
+        Returns a human readable string of this CompactTestResult
+        """
+        return f"Test {self.test} on device {self.name} has result {self.result}"
+
+
 class ListResult(RootModel[List[TestResult]]):
     """
     list result for all tests on all devices.
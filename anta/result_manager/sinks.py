@@ -0,0 +1,77 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Result sinks for ANTA.
+
+A sink receives each TestResult as soon as it is added to a ResultManager.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from anta.result_manager.models import TestResult
+from anta.tools.pydantic import pydantic_result_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+class ResultSink(ABC):
+    """
+    Abstract class defining a destination for test results.
+
+    An implementation of this class must override the `write()` method.
+    """
+
+    @abstractmethod
+    def write(self, result: TestResult) -> None:
+        """
+        Send a TestResult to this sink.
+
+        Args:
+            result: TestResult to send
+        """
+
+    def close(self) -> None:
+        """
+        Release the resources of this sink. Does nothing by default.
+        """
+
+
+class JsonLinesSink(ResultSink):
+    """
+    Write test results to a file in JSON lines format: one JSON object per test result.
+    The file is flushed after each result so it can be read while the tests are running.
+
+    Attributes:
+        path: Path of the JSON lines file
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Constructor of JsonLinesSink
+
+        Args:
+            path: Path of the JSON lines file. The file is truncated if it exists.
+        """
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def write(self, result: TestResult) -> None:
+        """
+        Write a TestResult as a JSON line.
+
+        Args:
+            result: TestResult to write
+        """
+        self._file.write(json.dumps(pydantic_result_to_dict(result)) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Close the JSON lines file.
+        """
+        self._file.close()
@@ -7,66 +7,322 @@ ANTA runner function
 from __future__ import annotations
 
 import asyncio
-import itertools
 import logging
-from typing import Optional
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Optional, Sequence, TypeVar, Union
 
+from anta.decorators import is_skipped_on_platform
+from anta.device import DEFAULT_PROBE_TIMEOUT, AntaDevice
 from anta.inventory import AntaInventory
-from anta.models import AntaTest
+from anta.models import AntaCommand, AntaTest
 from anta.result_manager import ResultManager
+from anta.result_manager.models import TestResult
+from anta.state import StateStore, StoredResult, device_fingerprint
 from anta.tools.misc import anta_log_exception
+from anta.tools.snapshot import save_command_output
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Default maximum number of collections or tests running concurrently for the whole run
+DEFAULT_MAX_CONCURRENCY = 1000
+# Default maximum number of collections or tests running concurrently on a single device
+DEFAULT_MAX_DEVICE_CONCURRENCY = 10
+
+
+async def limit_concurrency(coro: Coroutine[Any, Any, T], semaphores: list[asyncio.Semaphore]) -> T:
+    """
+    Run a coroutine once a slot has been acquired in each provided semaphore.
+
+    Semaphores are acquired in order: the per-device semaphore must be provided before the global one
+    so a device waiting for its own slots does not hold global slots and cannot starve other devices.
+
+    Args:
+        coro: The coroutine to run.
+        semaphores: The semaphores to acquire before running the coroutine.
+
+    Returns:
+        The return value of the coroutine.
+    """
+    acquired: list[asyncio.Semaphore] = []
+    try:
+        for semaphore in semaphores:
+            await semaphore.acquire()
+            acquired.append(semaphore)
+        return await coro
+    finally:
+        for semaphore in reversed(acquired):
+            semaphore.release()
+        # Close the coroutine if it has never been awaited (e.g. task cancelled while waiting for a slot)
+        coro.close()
+
+
+async def collect_tests_commands(device: AntaDevice, tests: Sequence[AntaTest], collected_commands: Optional[list[AntaCommand]] = None) -> None:
+    """
+    Collect the commands of all the tests scheduled on a device.
+
+    Identical commands (same `command`, `ofmt`, `version` and `revision`) requested by different tests
+    are only sent once to the device: the output (or the failure) is then shared with every test
+    requesting this command.
+
+    Tests with a result already set (e.g. inputs validation error), tests skipped on the hardware model of the device
+    (see `skip_on_platforms`) and commands that already have an output (e.g. `eos_data` has been provided) are ignored.
+    Commands already collected by `AntaDevice.refresh()` (e.g. `show version`) or provided in `collected_commands`
+    are not sent again to the device.
+    If the collection fails, each test will try to collect its own commands when run.
+
+    Args:
+        device: AntaDevice instance on which the tests are run.
+        tests: AntaTest instances scheduled on this device.
+        collected_commands: Commands already collected from this device, e.g. the fingerprint commands of the state store. Defaults to None.
+    """
+    commands: dict[str, list[AntaCommand]] = {}
+    for test in tests:
+        if test.result.result != "unset" or is_skipped_on_platform(test):
+            continue
+        for command in test.instance_commands:
+            if command.output is None and command.failed is None:
+                commands.setdefault(command.uid, []).append(command)
+    for collected_command in [*device.refresh_commands, *(collected_commands or [])]:
+        if collected_command.collected and collected_command.uid in commands:
+            for command in commands.pop(collected_command.uid):
+                command.output = collected_command.output
+    if not commands:
+        return
+    unique_commands = [duplicates[0] for duplicates in commands.values()]
+    logger.debug(f"Collecting {len(unique_commands)} unique commands for {len(tests)} tests on device {device.name}")
+    try:
+        await device.collect_commands(unique_commands)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        message = f"Error when collecting commands on device {device.name}"
+        anta_log_exception(e, message, logger)
+        return
+    for reference, *duplicates in commands.values():
+        for command in duplicates:
+            command.output = reference.output
+            command.failed = reference.failed
+
+
+def release_commands_outputs(test: AntaTest, spool_dir: Optional[Path] = None, spooled: Optional[set[str]] = None) -> None:
+    """
+    Release the command outputs of a completed test to free memory. Only the TestResult is kept.
+
+    Args:
+        test: The completed AntaTest instance.
+        spool_dir: If provided, the collected outputs are saved in this directory before being released,
+                   using the `anta exec snapshot` directory structure.
+        spooled: UIDs of the commands already saved in `spool_dir`. Updated by this function. Defaults to None.
+    """
+    for command in test.instance_commands:
+        if spool_dir is not None and command.collected and (spooled is None or command.uid not in spooled):
+            try:
+                save_command_output(spool_dir, test.device.name, command)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                message = f"Cannot save output of command '{command.command}' on device {test.device.name}"
+                anta_log_exception(e, message, logger)
+            else:
+                if spooled is not None:
+                    spooled.add(command.uid)
+        command.output = None
+
+
+def validate_catalog(tests: Sequence[tuple[type[AntaTest], Any]]) -> list[tuple[type[AntaTest], Any]]:
+    """
+    Validate the inputs of each test of the catalog once for all the devices.
+
+    Args:
+        tests: ANTA test catalog. Output of anta.loader.parse_catalog().
+
+    Returns:
+        list[tuple[type[AntaTest], Any]]: The catalog where the inputs dictionaries are replaced by the AntaTest.Input instances returned by
+                                    `AntaTest.validate_inputs()`. Tests with invalid inputs are kept as is: the error is reported by each test instance.
+    """
+    validated: list[tuple[type[AntaTest], Any]] = []
+    for test_class, test_inputs in tests:
+        try:
+            validated.append((test_class, test_class.validate_inputs(test_inputs)))
+        except Exception:  # pylint: disable=broad-exception-caught
+            validated.append((test_class, test_inputs))
+    return validated
+
+
+def instantiate_tests(device: AntaDevice, tests: Sequence[tuple[type[AntaTest], Any]]) -> list[AntaTest]:
+    """
+    Instantiate the tests of the catalog on a device.
+
+    Args:
+        device: AntaDevice instance on which the tests are run.
+        tests: ANTA test catalog. The inputs can be dictionaries or AntaTest.Input instances, see `validate_catalog()`.
+
+    Returns:
+        list[AntaTest]: The AntaTest instances. Errors when creating a test are logged and the test is not run.
+    """
+    instances: list[AntaTest] = []
+    for test_class, test_inputs in tests:
+        try:
+            instances.append(test_class(device=device, inputs=test_inputs))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            message = "Error when creating ANTA tests"
+            anta_log_exception(e, message, logger)
+            # This test will never be run
+            AntaTest.update_progress()
+    return instances
+
+
+async def run_device_tests(
+    manager: ResultManager,
+    device: AntaDevice,
+    tests: Union[Sequence[AntaTest], Callable[[], Sequence[AntaTest]]],
+    max_device_concurrency: Optional[int] = None,
+    global_semaphore: Optional[asyncio.Semaphore] = None,
+    spool_dir: Optional[Path] = None,
+    state_store: Optional[StateStore] = None,
+    devices_semaphore: Optional[asyncio.Semaphore] = None,
+) -> None:
+    # pylint: disable=too-many-arguments
+    """
+    Run all the tests scheduled on a device.
+    Commands are first collected once for all the tests using `collect_tests_commands()`.
+    Each TestResult is added to the ResultManager as soon as the test is completed
+    and the command outputs of the test are released using `release_commands_outputs()`.
+
+    If a state store is provided, the fingerprint of the device is collected first: the stored results of the tests
+    which can be reused are added to the ResultManager and only the other tests are run.
+    The state store is then updated with the fingerprint and the test results.
+
+    Args:
+        manager: ResultManager object to populate with the test results.
+        device: AntaDevice instance on which the tests are run.
+        tests: AntaTest instances scheduled on this device, or a function returning them. A function is only called
+               once a slot is available to collect the commands, so the tests of the devices waiting for a slot are not instantiated.
+        max_device_concurrency: Maximum number of collections or tests running concurrently on this device. Defaults to None (no limit).
+        global_semaphore: Semaphore shared by all the devices to limit the number of collections or tests running concurrently. Defaults to None (no limit).
+        spool_dir: Directory to save the command outputs to before releasing them. Defaults to None.
+        state_store: Store of the device fingerprints and test results of the previous runs. Defaults to None.
+        devices_semaphore: Semaphore shared by all the devices to limit the number of devices in flight. A slot is held from the instantiation
+                           of the tests until all of them are completed, so the tests of at most this number of devices are in memory.
+                           Defaults to None (no limit).
+    """
+    fingerprint: Optional[str] = None
+    completed: list[StoredResult] = []
+
+    async def prepare() -> Sequence[AntaTest]:
+        """Instantiate the tests, add the stored results which can be reused and collect the commands of the other tests"""
+        nonlocal fingerprint
+        device_tests = tests() if callable(tests) else tests
+        fingerprint_commands: list[AntaCommand] = []
+        if state_store is not None:
+            fingerprint_commands = await state_store.collect_fingerprint(device)
+            fingerprint = device_fingerprint(fingerprint_commands)
+            if fingerprint is None:
+                logger.debug(f"Cannot collect the fingerprint of device {device.name}: all the tests are run")
+            device_tests, reused = state_store.reuse(device.name, fingerprint, device_tests)
+            for entry in reused:
+                manager.add_test_result(entry.result)
+                AntaTest.update_progress()
+            completed.extend(reused)
+        await collect_tests_commands(device, device_tests, fingerprint_commands)
+        return device_tests
+
+    async def run_test(test: AntaTest) -> TestResult:
+        """Run a test and release its command outputs once completed"""
+        try:
+            return await test.test()
+        finally:
+            release_commands_outputs(test, spool_dir, spooled)
+
+    async def run_tests() -> None:
+        """Prepare and run the tests, adding each result to the ResultManager as soon as the test is completed"""
+        for coro in asyncio.as_completed([limit_concurrency(run_test(test), semaphores) for test in await limit_concurrency(prepare(), semaphores)]):
+            try:
+                result = await coro
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                message = "Error in main ANTA Runner"
+                anta_log_exception(e, message, logger)
+            else:
+                manager.add_test_result(result)
+                if fingerprint is not None:
+                    completed.append(StoredResult(timestamp=time.time(), result=result))
+
+    spooled: set[str] = set()
+    semaphores = []
+    if max_device_concurrency is not None:
+        semaphores.append(asyncio.Semaphore(max_device_concurrency))
+    if global_semaphore is not None:
+        semaphores.append(global_semaphore)
+    await limit_concurrency(run_tests(), [devices_semaphore] if devices_semaphore is not None else [])
+    if state_store is not None and fingerprint is not None:
+        state_store.update(device.name, fingerprint, completed)
+
 
 async def main(
     manager: ResultManager,
     inventory: AntaInventory,
-    tests: list[tuple[AntaTest, AntaTest.Input]],
+    tests: Sequence[tuple[type[AntaTest], Any]],
     tags: Optional[list[str]] = None,
     established_only: bool = True,
+    max_concurrency: Optional[int] = DEFAULT_MAX_CONCURRENCY,
+    max_device_concurrency: Optional[int] = DEFAULT_MAX_DEVICE_CONCURRENCY,
+    spool_dir: Optional[Path] = None,
+    state_store: Optional[StateStore] = None,
+    probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
 ) -> None:
+    # pylint: disable=too-many-arguments
     """
     Main coroutine to run ANTA.
     Use this as an entrypoint to the test framwork in your script.
 
+    The inputs of the tests are validated once for all the devices, see `validate_catalog()`.
+    At most `max_concurrency` devices are in flight: the tests of a device are only instantiated when a device slot is available
+    and the slot is released once all the tests of the device are completed. The number of AntaTest instances in memory
+    is therefore bounded by `max_concurrency` times the number of tests per device, whatever the size of the inventory.
+
     Args:
         manager: ResultManager object to populate with the test results.
         inventory: AntaInventory object that includes the device(s).
         tests: ANTA test catalog. Output of anta.loader.parse_catalog().
         tags: List of tags to filter devices from the inventory. Defaults to None.
         established_only: Include only established device(s). Defaults to True.
+        max_concurrency: Maximum number of collections or tests running concurrently for all the devices, and maximum number of devices in flight.
+                         None means no limit.
+        max_device_concurrency: Maximum number of collections or tests running concurrently on a single device. None means no limit.
+        spool_dir: Command outputs are released from memory once a test is completed. If a directory is provided,
+                   the outputs are saved in this directory first, using the `anta exec snapshot` directory structure. Defaults to None.
+        state_store: Store of the device fingerprints and test results of the previous runs. If provided, the tests are run incrementally:
+                     the stored result of a test is reused if the device fingerprint and the test inputs have not changed. Defaults to None.
+        probe_timeout: Timeout in seconds of the reachability probe run before connecting to the devices.
 
     Returns:
         any: ResultManager object gets updated with the test results.
     """
 
-    await inventory.connect_inventory()
-
-    # asyncio.gather takes an iterator of the function to run concurrently.
-    # we get the cross product of the devices and tests to build that iterator.
+    await inventory.connect_inventory(probe_timeout=probe_timeout)
 
-    coros = []
-    for device, test in itertools.product(inventory.get_inventory(established_only=established_only, tags=tags).values(), tests):
-        test_class = test[0]
-        test_inputs = test[1]
-        try:
-            # Instantiate AntaTest object
-            test_instance = test_class(device=device, inputs=test_inputs)
-            coros.append(test_instance.test(eos_data=None))
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            message = "Error when creating ANTA tests"
-            anta_log_exception(e, message, logger)
+    catalog = validate_catalog(tests)
+    devices = list(inventory.get_inventory(established_only=established_only, tags=tags).values())
 
     if AntaTest.progress is not None:
-        AntaTest.nrfu_task = AntaTest.progress.add_task("Running NRFU Tests...", total=len(coros))
+        AntaTest.nrfu_task = AntaTest.progress.add_task("Running NRFU Tests...", total=len(devices) * len(catalog))
 
     logger.info("Running ANTA tests...")
-    res = await asyncio.gather(*coros, return_exceptions=True)
-    logger.debug(res)
+    global_semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+    # A device in flight holds at least one slot of the global semaphore while its commands are collected or its tests are run:
+    # more devices in flight than global slots would only keep more tests in memory without running more of them.
+    devices_semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+    # The tests are grouped per device so the commands can be collected once per device.
+    res = await asyncio.gather(
+        *(
+            run_device_tests(
+                manager, device, partial(instantiate_tests, device, catalog), max_device_concurrency, global_semaphore, spool_dir, state_store, devices_semaphore
+            )
+            for device in devices
+        ),
+        return_exceptions=True,
+    )
     for r in res:
         if isinstance(r, Exception):
             message = "Error in main ANTA Runner"
             anta_log_exception(r, message, logger)
-        else:
-            manager.add_test_result(r)
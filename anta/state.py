@@ -0,0 +1,229 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+State store for incremental ANTA runs.
+
+For each device, the store keeps a fingerprint of the device state, computed from the ANTA version and the outputs of
+a few commands (`show version`, `show running-config`, `show interfaces status` by default), and the last result of each
+test run on the device. When the fingerprint of a device has not changed since the previous run, the stored results of the
+tests with the same inputs are reused instead of collecting the commands and running the tests again.
+
+The fingerprint does not cover the operational state of the device (e.g. routing protocol neighbors, counters, memory usage):
+only the results of the tests flagged with the `config_only` class attribute, whose result only depends on the configuration
+and the EOS version, are reused. The other tests are always run.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+from pydantic import BaseModel, ValidationError
+
+from anta import __version__
+from anta.device import AntaDevice
+from anta.models import AntaCommand, AntaTest
+from anta.result_manager.models import TestResult
+from anta.tools.misc import anta_log_exception
+
+logger = logging.getLogger(__name__)
+
+# Default time in seconds a stored test result can be reused
+DEFAULT_STATE_MAX_AGE = 3600
+
+# Default commands used to compute the fingerprint of a device:
+# - show version: a reload or an upgrade of the device
+# - show running-config: a configuration change. This is the most expensive command on large configurations,
+#   use the `commands` argument of StateStore to replace it with cheaper commands, e.g. a section of the configuration.
+# - show interfaces status: a change of the link status of an interface
+FINGERPRINT_COMMANDS = [
+    AntaCommand(command="show version"),
+    AntaCommand(command="show running-config", ofmt="text"),
+    AntaCommand(command="show interfaces status"),
+]
+
+# Keys of the JSON outputs that change continuously and are ignored in the fingerprint
+VOLATILE_KEYS = ("uptime", "memFree")
+
+
+class StoredResult(BaseModel):
+    """
+    Test result saved in the state store
+
+    Attributes:
+        timestamp: UNIX timestamp of the test run
+        result: Result of the test
+    """
+
+    timestamp: float
+    result: TestResult
+
+
+class DeviceState(BaseModel):
+    """
+    State of a device saved in the state store
+
+    Attributes:
+        fingerprint: Fingerprint of the device when the tests were run
+        results: Last result of each test run on the device
+    """
+
+    fingerprint: str
+    results: List[StoredResult] = []
+
+
+def device_fingerprint(commands: list[AntaCommand]) -> Optional[str]:
+    """
+    Compute the fingerprint of a device from the ANTA version and the outputs of the fingerprint commands.
+    The results stored by another ANTA version are not reused as the tests may have changed.
+
+    Args:
+        commands: The collected fingerprint commands.
+
+    Returns:
+        str: The fingerprint or None if a command has not been collected.
+    """
+    digest = hashlib.sha1(__version__.encode())
+    for command in commands:
+        if not command.collected:
+            return None
+        output: Any = command.output
+        if isinstance(output, dict):
+            output = {key: value for key, value in output.items() if key not in VOLATILE_KEYS}
+        digest.update(json.dumps([command.command, command.ofmt, output], sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class StateStore:
+    """
+    On-disk store of the device fingerprints and test results of the previous ANTA runs.
+
+    Each device state is a JSON file named after the device.
+    A stored test result is reused when the test is flagged with the `config_only` class attribute, the fingerprint of the device
+    has not changed, the test has the same inputs and the result is not older than `max_age`. Results in error are never stored.
+
+    Attributes:
+        directory: Directory of the state files
+        max_age: Time in seconds a stored test result can be reused
+        commands: Commands used to compute the fingerprint of a device
+    """
+
+    def __init__(self, directory: Path, max_age: float = DEFAULT_STATE_MAX_AGE, commands: Optional[list[AntaCommand]] = None) -> None:
+        """
+        Constructor of StateStore
+
+        Args:
+            directory: Directory of the state files. Created if it does not exist.
+            max_age: Time in seconds a stored test result can be reused
+            commands: Commands used to compute the fingerprint of a device. Defaults to `FINGERPRINT_COMMANDS`.
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self.commands = commands if commands is not None else FINGERPRINT_COMMANDS
+
+    def _path(self, name: str) -> Path:
+        """Return the path of the state file of a device"""
+        return self.directory / f"{name.replace('/', '_').replace(':', '_')}.json"
+
+    def get(self, name: str) -> Optional[DeviceState]:
+        """
+        Get the state of a device from the store.
+
+        Args:
+            name: Device name
+
+        Returns:
+            DeviceState: The state of the device or None if there is no valid state for this device in the store.
+        """
+        path = self._path(name)
+        try:
+            return DeviceState.model_validate_json(path.read_text(encoding="UTF-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            message = f"Cannot read state file {path}"
+            anta_log_exception(e, message, logger)
+            return None
+
+    def set(self, name: str, state: DeviceState) -> None:
+        """
+        Save the state of a device in the store.
+
+        Args:
+            name: Device name
+            state: State of the device
+        """
+        path = self._path(name)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(state.model_dump_json(), encoding="UTF-8")
+        except OSError as e:
+            message = f"Cannot write state file {path}"
+            anta_log_exception(e, message, logger)
+
+    async def collect_fingerprint(self, device: AntaDevice) -> list[AntaCommand]:
+        """
+        Collect the fingerprint commands from a device. Commands already collected by `AntaDevice.refresh()` are not sent again to the device.
+        Use `device_fingerprint()` to compute the fingerprint from the returned commands.
+
+        Args:
+            device: The device
+
+        Returns:
+            list[AntaCommand]: The fingerprint commands. A command which cannot be collected has no output.
+        """
+        refreshed = {command.uid: command for command in device.refresh_commands if command.collected}
+        commands = [refreshed[command.uid] if command.uid in refreshed else command.model_copy() for command in self.commands]
+        try:
+            await device.collect_commands([command for command in commands if not command.collected])
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            message = f"Cannot collect the fingerprint of device {device.name}"
+            anta_log_exception(e, message, logger)
+        return commands
+
+    def reuse(self, name: str, fingerprint: Optional[str], tests: Sequence[AntaTest]) -> tuple[list[AntaTest], list[StoredResult]]:
+        """
+        Find the tests whose stored result can be reused. Only the results of the `config_only` tests are reused.
+
+        Args:
+            name: Device name
+            fingerprint: Current fingerprint of the device. If None, no result is reused.
+            tests: AntaTest instances scheduled on the device
+
+        Returns:
+            tuple[list[AntaTest], list[StoredResult]]: The tests to run and the stored results which are reused for the other tests.
+        """
+        state = self.get(name) if fingerprint is not None else None
+        if state is None or state.fingerprint != fingerprint:
+            return list(tests), []
+        oldest = time.time() - self.max_age
+        stored: dict[tuple[str, Optional[str]], list[StoredResult]] = {}
+        for entry in state.results:
+            if entry.timestamp >= oldest and entry.result.inputs_hash is not None:
+                stored.setdefault((entry.result.test, entry.result.inputs_hash), []).append(entry)
+        to_run: list[AntaTest] = []
+        reused: list[StoredResult] = []
+        for test in tests:
+            entries = stored.get((test.result.test, test.result.inputs_hash))
+            if test.result.result == "unset" and test.config_only and entries:
+                entry = entries.pop(0)
+                reused.append(StoredResult(timestamp=entry.timestamp, result=entry.result.model_copy(deep=True)))
+            else:
+                to_run.append(test)
+        logger.debug(f"Reusing {len(reused)} stored test results on device {name}")
+        return to_run, reused
+
+    def update(self, name: str, fingerprint: str, results: list[StoredResult]) -> None:
+        """
+        Save the fingerprint of a device and the results of the tests run on this device. Results in error are not saved.
+
+        Args:
+            name: Device name
+            fingerprint: Fingerprint of the device when the tests were run
+            results: Results of the tests
+        """
+        self.set(name, DeviceState(fingerprint=fingerprint, results=[entry for entry in results if entry.result.result != "error"]))
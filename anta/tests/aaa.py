@@ -30,6 +30,7 @@ class VerifyTacacsSourceIntf(AntaTest):
     description = "Verifies TACACS source-interface for a specified VRF."
     categories = ["aaa"]
     commands = [AntaCommand(command="show tacacs")]
+    config_only = True
 
     class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
         intf: str
@@ -62,6 +63,7 @@ class VerifyTacacsServers(AntaTest):
     description = "Verifies TACACS servers are configured for a specified VRF."
     categories = ["aaa"]
     commands = [AntaCommand(command="show tacacs")]
+    config_only = True
 
     class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
         servers: List[IPv4Address]
@@ -102,6 +104,7 @@ class VerifyTacacsServerGroups(AntaTest):
     description = "Verifies if the provided TACACS server group(s) are configured."
     categories = ["aaa"]
     commands = [AntaCommand(command="show tacacs")]
+    config_only = True
 
     class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
         groups: List[str]
@@ -134,6 +137,7 @@ class VerifyAuthenMethods(AntaTest):
     description = "Verifies the AAA authentication method lists for different authentication types (login, enable, dot1x)."
     categories = ["aaa"]
     commands = [AntaCommand(command="show aaa methods authentication")]
+    config_only = True
 
     class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
         methods: List[AAAAuthMethod]
@@ -179,6 +183,7 @@ class VerifyAuthzMethods(AntaTest):
     description = "Verifies the AAA authorization method lists for different authorization types (commands, exec)."
     categories = ["aaa"]
     commands = [AntaCommand(command="show aaa methods authorization")]
+    config_only = True
 
     class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
         methods: List[AAAAuthMethod]
@@ -217,6 +222,7 @@ class VerifyAcctDefaultMethods(AntaTest):
     description = "Verifies the AAA accounting default method lists for different accounting types (system, exec, commands, dot1x)."
     categories = ["aaa"]
     commands = [AntaCommand(command="show aaa methods accounting")]
+    config_only = True
 
     class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
         methods: List[AAAAuthMethod]
@@ -261,6 +267,7 @@ class VerifyAcctConsoleMethods(AntaTest):
     description = "Verifies the AAA accounting console method lists for different accounting types (system, exec, commands, dot1x)."
     categories = ["aaa"]
     commands = [AntaCommand(command="show aaa methods accounting")]
+    config_only = True
 
     class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
         methods: List[AAAAuthMethod]
@@ -23,6 +23,7 @@ class VerifyEOSVersion(AntaTest):
     description = "Verifies the device is running one of the allowed EOS version."
     categories = ["software"]
     commands = [AntaCommand(command="show version")]
+    config_only = True
 
     class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
         versions: List[str]
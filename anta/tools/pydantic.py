@@ -8,15 +8,15 @@ Toolkit for ANTA to play with Pydantic.
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
 
 if TYPE_CHECKING:
-    from anta.result_manager.models import ListResult
+    from anta.result_manager.models import TestResult
 
 logger = logging.getLogger(__name__)
 
 
-def pydantic_to_dict(pydantic_list: ListResult) -> list[dict[str, Sequence[Any]]]:
+def pydantic_to_dict(pydantic_list: Iterable[TestResult]) -> list[dict[str, Sequence[Any]]]:
     """
     Convert Pydantic object into a list of dict
 
@@ -28,8 +28,17 @@ def pydantic_to_dict(pydantic_list: ListResult) -> list[dict[str, Sequence[Any]]
     Returns:
         list[dict[str, str]]: The list of dict
     """
-    result = []
-    for device in pydantic_list:
-        dev_dict = {k: v if isinstance(v, list) else str(v) for k, v in device}
-        result.append(dev_dict)
-    return result
+    return [pydantic_result_to_dict(device) for device in pydantic_list]
+
+
+def pydantic_result_to_dict(result: TestResult) -> dict[str, Sequence[Any]]:
+    """
+    Convert a single Pydantic object into a dict, see `pydantic_to_dict()`
+
+    Args:
+        result: pydantic object
+
+    Returns:
+        dict[str, str]: The dict
+    """
+    return {k: v if isinstance(v, list) else str(v) for k, v in result}
@@ -0,0 +1,152 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Toolkit for ANTA to save command outputs to a snapshot directory.
+
+A snapshot directory has the following structure, as created by `anta exec snapshot`:
+    <root_dir>/<device name>/json/<command>.json
+    <root_dir>/<device name>/text/<command>.log
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import tarfile
+import zipfile
+from functools import cached_property
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Any, Union
+
+if TYPE_CHECKING:
+    from anta.models import AntaCommand
+
+logger = logging.getLogger(__name__)
+
+
+def command_output_path(root_dir: Path, device_name: str, command: AntaCommand) -> Path:
+    """
+    Return the path of the file storing the output of a command in a snapshot directory.
+
+    Args:
+        root_dir: Root directory of the snapshot
+        device_name: Name of the device the command has been collected from
+        command: The AntaCommand
+
+    Returns:
+        Path: The path of the output file
+    """
+    return root_dir.joinpath(*_command_output_parts(device_name, command))
+
+
+def _command_output_parts(device_name: str, command: AntaCommand) -> tuple[str, str, str]:
+    """Return the parts of the path of a command output file, relative to the snapshot root directory"""
+    # '/' is not allowed in a file name
+    filename = command.command.replace("/", "_")
+    if command.ofmt == "json":
+        return (device_name, "json", f"{filename}.json")
+    return (device_name, "text", f"{filename}.log")
+
+
+def save_command_output(root_dir: Path, device_name: str, command: AntaCommand) -> Path:
+    """
+    Save the output of a collected command in a snapshot directory.
+
+    Args:
+        root_dir: Root directory of the snapshot
+        device_name: Name of the device the command has been collected from
+        command: The collected AntaCommand
+
+    Returns:
+        Path: The path of the output file
+    """
+    outfile = command_output_path(root_dir, device_name, command)
+    outfile.parent.mkdir(parents=True, exist_ok=True)
+    content = json.dumps(command.json_output, indent=2) if command.ofmt == "json" else command.text_output
+    with outfile.open(mode="w", encoding="UTF-8") as f:
+        f.write(content)
+    return outfile
+
+
+class SnapshotReader:
+    """
+    Read command outputs from a snapshot directory or from a zip or tar archive of a snapshot directory.
+
+    Archives can contain the device directories at their root or in a single parent directory.
+
+    Attributes:
+        path: Path of the snapshot directory or archive
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Constructor of SnapshotReader
+
+        Args:
+            path: Path of the snapshot directory or archive
+
+        Raises:
+            ValueError: if the path is neither a directory nor a zip or tar archive
+        """
+        self.path = path
+        self._archive: Union[zipfile.ZipFile, tarfile.TarFile, None] = None
+        # Archive members indexed by their (device name, format, file name) path parts
+        self._members: dict[tuple[str, ...], str] = {}
+        if path.is_dir():
+            return
+        if zipfile.is_zipfile(path):
+            self._archive = zipfile.ZipFile(path)  # pylint: disable=consider-using-with
+            names = [info.filename for info in self._archive.infolist() if not info.is_dir()]
+        elif tarfile.is_tarfile(path):
+            self._archive = tarfile.open(path)  # pylint: disable=consider-using-with
+            names = [member.name for member in self._archive.getmembers() if member.isfile()]
+        else:
+            raise ValueError(f"Snapshot {path} is neither a directory nor a zip or tar archive")
+        for name in names:
+            parts = PurePosixPath(name).parts
+            if len(parts) >= 3:
+                self._members[parts[-3:]] = name
+
+    @cached_property
+    def devices(self) -> set[str]:
+        """Names of the devices with command outputs in the snapshot"""
+        if self._archive is None:
+            return {device_dir.name for device_dir in self.path.iterdir() if device_dir.is_dir()}
+        return {parts[0] for parts in self._members}
+
+    def read(self, device_name: str, command: AntaCommand) -> Any:
+        """
+        Read the output of a command from the snapshot.
+
+        Args:
+            device_name: Name of the device the command has been collected from
+            command: The AntaCommand
+
+        Returns:
+            The output of the command: a dictionary for JSON commands, a string for text commands.
+
+        Raises:
+            FileNotFoundError: if the output of this command is not in the snapshot
+        """
+        parts = _command_output_parts(device_name, command)
+        if self._archive is None:
+            content = self.path.joinpath(*parts).read_text(encoding="UTF-8")
+        else:
+            if parts not in self._members:
+                raise FileNotFoundError(f"{'/'.join(parts)} not found in snapshot {self.path}")
+            if isinstance(self._archive, zipfile.ZipFile):
+                content = self._archive.read(self._members[parts]).decode("UTF-8")
+            else:
+                file = self._archive.extractfile(self._members[parts])
+                if file is None:
+                    raise FileNotFoundError(f"{'/'.join(parts)} not found in snapshot {self.path}")
+                content = file.read().decode("UTF-8")
+        return json.loads(content) if command.ofmt == "json" else content
+
+    def close(self) -> None:
+        """
+        Close the snapshot archive.
+        """
+        if self._archive is not None:
+            self._archive.close()
@@ -0,0 +1,8 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+ANTA benchmarks
+
+Run `python -m tests.benchmark --help` from the repository root directory.
+"""
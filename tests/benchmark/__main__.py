@@ -0,0 +1,92 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Run the ANTA benchmarks and save the measures in a JSON file
+
+Example:
+    python -m tests.benchmark --devices 10,1000 --output benchmark.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from anta import __version__
+from tests.benchmark.benchmarks import BENCHMARKS, Measure, bench_runner
+
+
+def parse_args(args: list[str]) -> argparse.Namespace:
+    """
+    Parse the command line arguments
+    """
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmark", description="Run the ANTA benchmarks")
+    parser.add_argument("--devices", default="10,1000,10000", help="Comma separated list of numbers of devices (default: %(default)s)")
+    parser.add_argument("--tests", type=int, default=10, help="Number of tests per device (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latency in seconds of a fake device command collection (default: %(default)s)")
+    parser.add_argument("--payload-size", type=int, default=0, help="Size in bytes added to the fake devices JSON outputs (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of runs of each benchmark, the fastest run is kept (default: %(default)s)")
+    parser.add_argument(
+        "--benchmark", action="append", choices=list(BENCHMARKS), help="Benchmark to run, can be repeated (default: all benchmarks)", dest="benchmarks"
+    )
+    parser.add_argument("--output", type=Path, default=Path("benchmark.json"), help="JSON file to save the measures to (default: %(default)s)")
+    return parser.parse_args(args)
+
+
+def run(benchmark: Callable[[int, int], list[Measure]], devices: int, tests: int, repeat: int) -> list[Measure]:
+    """
+    Run a benchmark several times and keep the fastest run of each measure
+    """
+    best: dict[str, Measure] = {}
+    for _ in range(repeat):
+        for result in benchmark(devices, tests):
+            if result["benchmark"] not in best or result["seconds"] < best[result["benchmark"]]["seconds"]:
+                best[result["benchmark"]] = result
+    return list(best.values())
+
+
+def main(args: list[str]) -> None:
+    """
+    Run the benchmarks
+    """
+    options = parse_args(args)
+    runner: Callable[[int, int], list[Measure]] = partial(bench_runner, latency=options.latency, payload_size=options.payload_size)
+    benchmarks = dict(BENCHMARKS, runner=runner)
+    measures: list[Measure] = []
+    # Running ANTA at scale is very verbose
+    logging.disable(logging.WARNING)
+    try:
+        for devices in (int(value) for value in options.devices.split(",")):
+            for name in options.benchmarks or list(BENCHMARKS):
+                for result in run(benchmarks[name], devices, options.tests, options.repeat):
+                    duration = f"{result['seconds']:>10.3f}s {result['per_test_us']:>10.1f}us/test"
+                    print(f"{result['benchmark']:<24} devices={devices:<6} tests={result['tests']:<8} {duration}")
+                    measures.append(result)
+    finally:
+        logging.disable(logging.NOTSET)
+    report: dict[str, Any] = {
+        "metadata": {
+            "anta_version": __version__,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "tests_per_device": options.tests,
+            "latency": options.latency,
+            "payload_size": options.payload_size,
+            "repeat": options.repeat,
+        },
+        "measures": measures,
+    }
+    options.output.write_text(json.dumps(report, indent=2), encoding="UTF-8")
+    print(f"Measures saved to {options.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,175 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+ANTA benchmarks
+
+Each benchmark is a function taking the number of devices and the number of tests per device
+and returning a list of measures. A measure is a dictionary with the following keys:
+    - benchmark: Name of the measure
+    - devices: Number of devices
+    - tests: Number of operations measured (usually tests)
+    - seconds: Duration of the measure
+    - per_test_us: Duration per operation in microseconds
+    - ops_per_second: Number of operations per second
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from copy import deepcopy
+from typing import Any, Callable, Dict, Optional
+
+from anta.inventory import AntaInventory
+from anta.models import AntaCommand, AntaTest
+from anta.reporter import ReportTable
+from anta.result_manager import ResultManager
+from anta.result_manager.models import TestResult
+from anta.runner import main
+from tests.lib.fake import FakeDevice, FakeTestVersion, FakeTestVersionAndInterfaces
+
+Measure = Dict[str, Any]
+
+
+def measure(name: str, devices: int, operations: int, seconds: float) -> Measure:
+    """
+    Build a measure dictionary
+    """
+    return {
+        "benchmark": name,
+        "devices": devices,
+        "tests": operations,
+        "seconds": seconds,
+        "per_test_us": seconds / operations * 1e6 if operations else 0.0,
+        "ops_per_second": operations / seconds if seconds else 0.0,
+    }
+
+
+def timed(function: Callable[[], Any]) -> float:
+    """
+    Return the duration in seconds of a function call
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def build_catalog(tests_per_device: int) -> list[tuple[type[AntaTest], Optional[dict[str, Any]]]]:
+    """
+    Build a catalog of fake tests: one FakeTestVersion and FakeTestVersionAndInterfaces tests on different interfaces
+    """
+    catalog: list[tuple[type[AntaTest], Optional[dict[str, Any]]]] = [(FakeTestVersion, None)]
+    catalog.extend((FakeTestVersionAndInterfaces, {"interface": f"Ethernet{index}"}) for index in range(1, tests_per_device))
+    return catalog[:tests_per_device]
+
+
+def build_inventory(devices: int, latency: float = 0.0, payload_size: int = 0) -> AntaInventory:
+    """
+    Build an inventory of fake devices
+    """
+    inventory = AntaInventory()
+    for index in range(devices):
+        inventory.add_device(FakeDevice(name=f"device{index}", latency=latency, payload_size=payload_size))
+    return inventory
+
+
+def build_results(devices: int, tests_per_device: int) -> list[TestResult]:
+    """
+    Build test results for a number of devices: one test out of ten is failing
+    """
+    results = []
+    for device in range(devices):
+        for test in range(tests_per_device):
+            result = TestResult(name=f"device{device}", test=f"Test{test}", categories=["benchmark"], description="Benchmark test")
+            if test % 10:
+                result.is_success()
+            else:
+                result.is_failure("failure message")
+            results.append(result)
+    return results
+
+
+def bench_runner(devices: int, tests_per_device: int, latency: float = 0.0, payload_size: int = 0) -> list[Measure]:
+    """
+    Measure anta.runner.main end-to-end throughput with fake devices
+    """
+    inventory = build_inventory(devices, latency, payload_size)
+    catalog = build_catalog(tests_per_device)
+    manager = ResultManager()
+    seconds = timed(lambda: asyncio.run(main(manager, inventory, catalog)))
+    return [measure("runner", devices, len(manager), seconds)]
+
+
+def bench_anta_test(devices: int, tests_per_device: int) -> list[Measure]:
+    """
+    Measure the overhead of AntaTest.anta_test when the commands are already collected
+    """
+    device = FakeDevice()
+    tests = [FakeTestVersion(device, inputs=None, eos_data=[{"command": "show version"}]) for _ in range(devices * tests_per_device)]
+
+    async def run_tests() -> None:
+        for test in tests:
+            await test.test()
+
+    seconds = timed(lambda: asyncio.run(run_tests()))
+    return [measure("anta_test", devices, len(tests), seconds)]
+
+
+def bench_init_commands(devices: int, tests_per_device: int) -> list[Measure]:
+    """
+    Measure the instantiation of AntaTest objects, with inputs dictionaries or inputs validated once with AntaTest.validate_inputs,
+    and the cost of copying the class commands in AntaTest._init_commands: shallow copy used by AntaTest compared to a deep copy
+    """
+    device = FakeDevice()
+    instances = devices * tests_per_device
+    inputs = {"interface": "Ethernet1"}
+    instantiation = timed(lambda: [FakeTestVersionAndInterfaces(device, inputs=inputs) for _ in range(instances)])
+    validated = FakeTestVersionAndInterfaces.validate_inputs(inputs)
+    validated_instantiation = timed(lambda: [FakeTestVersionAndInterfaces(device, inputs=validated) for _ in range(instances)])
+    commands = FakeTestVersionAndInterfaces.commands
+    copy = timed(lambda: [[command.model_copy() for command in commands if isinstance(command, AntaCommand)] for _ in range(instances)])
+    deep_copy = timed(lambda: [[deepcopy(command) for command in commands if isinstance(command, AntaCommand)] for _ in range(instances)])
+    return [
+        measure("test_instantiation", devices, instances, instantiation),
+        measure("test_instantiation_validated", devices, instances, validated_instantiation),
+        measure("init_commands_copy", devices, instances, copy),
+        measure("init_commands_deepcopy", devices, instances, deep_copy),
+    ]
+
+
+def bench_result_manager(devices: int, tests_per_device: int) -> list[Measure]:
+    """
+    Measure the cost of adding results to a ResultManager and of building the reports
+    """
+    results = build_results(devices, tests_per_device)
+    manager = ResultManager()
+
+    def add() -> None:
+        for result in results:
+            manager.add_test_result(result)
+
+    report = ReportTable()
+    measures = [
+        measure("result_manager_add", devices, len(results), timed(add)),
+        measure("result_manager_add_bulk", devices, len(results), timed(lambda: ResultManager().add_test_results(results))),
+        measure("result_manager_add_compact", devices, len(results), timed(lambda: ResultManager(compact=True).add_test_results(results))),
+    ]
+    reports: dict[str, Callable[[], Any]] = {
+        "result_manager_status": manager.get_status,
+        "result_manager_json": lambda: manager.get_results(output_format="json"),
+        "report_all": lambda: report.report_all(manager),
+        "report_all_failures_only": lambda: report.report_all(manager, statuses=["failure", "error"]),
+        "report_all_first_page": lambda: next(report.report_all_pages(manager)),
+        "report_summary_tests": lambda: report.report_summary_tests(manager),
+        "report_summary_hosts": lambda: report.report_summary_hosts(manager),
+    }
+    measures.extend(measure(name, devices, len(results), timed(function)) for name, function in reports.items())
+    return measures
+
+
+BENCHMARKS: dict[str, Callable[[int, int], list[Measure]]] = {
+    "runner": bench_runner,
+    "anta_test": bench_anta_test,
+    "init_commands": bench_init_commands,
+    "result_manager": bench_result_manager,
+}
@@ -0,0 +1,42 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Smoke tests of the ANTA benchmarks
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from tests.benchmark.__main__ import main
+
+
+def test_benchmarks(tmp_path: Path) -> None:
+    """
+    Run all the benchmarks on a few devices and check the JSON output
+    """
+    output = tmp_path / "benchmark.json"
+    main(["--devices", "1,2", "--tests", "3", "--repeat", "2", "--output", str(output)])
+    report = json.loads(output.read_text(encoding="UTF-8"))
+    assert report["metadata"]["tests_per_device"] == 3
+    measures = {(measure["benchmark"], measure["devices"]): measure for measure in report["measures"]}
+    assert measures[("runner", 2)]["tests"] == 6
+    assert {name for name, _ in measures} == {
+        "runner",
+        "anta_test",
+        "test_instantiation",
+        "test_instantiation_validated",
+        "init_commands_copy",
+        "init_commands_deepcopy",
+        "result_manager_add",
+        "result_manager_add_bulk",
+        "result_manager_add_compact",
+        "result_manager_status",
+        "result_manager_json",
+        "report_all",
+        "report_all_failures_only",
+        "report_all_first_page",
+        "report_summary_tests",
+        "report_summary_hosts",
+    }
@@ -0,0 +1,104 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Fake AntaDevice and AntaTest implementations used by the unit tests and the benchmarks
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from anta.device import AntaDevice
+from anta.models import AntaCommand, AntaTemplate, AntaTest
+
+
+class FakeDevice(AntaDevice):  # pylint: disable=too-many-instance-attributes
+    """
+    AntaDevice implementation recording the collected commands
+
+    The output of a JSON command is `{"command": <command>}`, the output of a text command is the command itself,
+    unless an output is provided for this command.
+    """
+
+    def __init__(
+        self,
+        name: str = "fake",
+        tags: Optional[list[str]] = None,
+        fail: Optional[list[str]] = None,
+        latency: float = 0.0,
+        payload_size: int = 0,
+        outputs: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Args:
+            name: Device name
+            tags: List of tags for this device
+            fail: Commands flagged as failed when collected
+            latency: Time in seconds to collect a command
+            payload_size: Size of a string added to the JSON outputs under the 'payload' key
+            outputs: Outputs of the commands, by command
+        """
+        # pylint: disable=too-many-arguments
+        super().__init__(name, tags)
+        self.collected_commands: list[str] = []
+        self.fail = fail if fail is not None else []
+        self.latency = latency
+        self.payload = "x" * payload_size
+        self.outputs = outputs if outputs is not None else {}
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FakeDevice) and self.name == other.name
+
+    async def collect(self, command: AntaCommand) -> None:
+        self.collected_commands.append(command.command)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if command.command in self.fail:
+            command.failed = RuntimeError("fake failure")
+        elif command.command in self.outputs:
+            command.output = self.outputs[command.command]
+        elif command.ofmt == "json":
+            command.output = {"command": command.command, "payload": self.payload} if self.payload else {"command": command.command}
+        else:
+            command.output = command.command
+
+    async def refresh(self) -> None:
+        self.is_online = True
+        self.established = True
+
+
+class FakeTestVersion(AntaTest):
+    """ANTA test collecting show version"""
+
+    name = "FakeTestVersion"
+    description = "ANTA test collecting show version"
+    categories = []
+    commands = [AntaCommand(command="show version")]
+    config_only = True
+
+    @AntaTest.anta_test
+    def test(self) -> None:
+        self.result.is_success(self.instance_commands[0].json_output["command"])
+
+
+class FakeTestVersionAndInterfaces(AntaTest):
+    """ANTA test collecting show version and show interfaces"""
+
+    name = "FakeTestVersionAndInterfaces"
+    description = "ANTA test collecting show version and show interfaces"
+    categories = []
+    commands = [AntaCommand(command="show version"), AntaTemplate(template="show interfaces {interface}"), AntaCommand(command="show version", ofmt="text")]
+    config_only = True
+
+    class Input(AntaTest.Input):  # pylint: disable=missing-class-docstring
+        interface: str
+
+    inputs: FakeTestVersionAndInterfaces.Input
+
+    def render(self, template: AntaTemplate) -> list[AntaCommand]:
+        return [template.render(interface=self.inputs.interface)]
+
+    @AntaTest.anta_test
+    def test(self) -> None:
+        self.result.is_success(self.instance_commands[1].json_output["command"])
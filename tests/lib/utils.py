@@ -9,6 +9,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+from httpx import HTTPStatusError, Request, Response
+
 
 def generate_test_ids_dict(val: dict[str, Any], key: str = "name") -> str:
     """
@@ -47,3 +49,11 @@ def default_anta_env() -> dict[str, str]:
         "ANTA_INVENTORY": str(Path(__file__).parent.parent / "data" / "test_inventory.yml"),
         "ANTA_NRFU_CATALOG": str(Path(__file__).parent.parent / "data" / "test_catalog.yml"),
     }
+
+
+def http_status_error(status_code: int) -> HTTPStatusError:
+    """
+    Build the exception raised by aioeapi when eAPI returns an HTTP error status
+    """
+    request = Request("POST", "https://42.42.42.42/command-api")
+    return HTTPStatusError(f"HTTP {status_code}", request=request, response=Response(status_code, request=request))
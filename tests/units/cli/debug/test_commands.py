@@ -9,7 +9,7 @@ from __future__ import annotations
 
 from contextlib import nullcontext
 from typing import TYPE_CHECKING, Any, Literal
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import click
 import pytest
@@ -21,6 +21,8 @@ from anta.models import AntaCommand
 from tests.lib.utils import default_anta_env
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from click.testing import CliRunner
 
     from anta.inventory import AntaInventory
@@ -116,3 +118,15 @@ def test_run_cmd(
         )
     )
     assert result.exit_code == 0
+
+
+def test_run_cmd_output_cache(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test `anta --output-cache debug run-cmd`: the output collected by the first run is reused by the second run
+    """
+    env = default_anta_env()
+    cli_args = ["--output-cache", str(tmp_path), "debug", "run-cmd", "--command", "show version", "--device", "dummy"]
+    with patch("aioeapi.Device.cli", AsyncMock(return_value=[{"modelName": "cEOSLab"}])) as mocked_cli:
+        results = [click_runner.invoke(anta, cli_args, env=env, auto_envvar_prefix="ANTA") for _ in range(2)]
+    assert mocked_cli.await_count == 1
+    assert all(result.exit_code == 0 and "cEOSLab" in result.output for result in results)
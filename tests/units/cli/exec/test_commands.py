@@ -15,6 +15,7 @@ import pytest
 
 from anta.cli import anta
 from anta.cli.exec.commands import clear_counters, collect_tech_support, snapshot
+from anta.device import DEFAULT_PROBE_TIMEOUT
 from tests.lib.utils import default_anta_env
 
 if TYPE_CHECKING:
@@ -42,7 +43,7 @@ def test_clear_counters(click_runner: CliRunner, tags: str | None) -> None:
     Test `anta exec clear-counters`
     """
     env = default_anta_env()
-    cli_args = ["exec", "clear-counters"]
+    cli_args = ["--probe-timeout", "2", "exec", "clear-counters"]
     expected_tags = None
     if tags is not None:
         cli_args.extend(["--tags", tags])
@@ -50,7 +51,7 @@ def test_clear_counters(click_runner: CliRunner, tags: str | None) -> None:
     with patch("anta.cli.exec.commands.clear_counters_utils") as mocked_subcommand:
         mocked_subcommand.return_value = None
         result = click_runner.invoke(anta, cli_args, env=env, auto_envvar_prefix="ANTA")
-    mocked_subcommand.assert_called_once_with(ANY, tags=expected_tags)
+    mocked_subcommand.assert_called_once_with(ANY, tags=expected_tags, probe_timeout=2.0)
     assert result.exit_code == 0
 
 
@@ -108,9 +109,9 @@ def test_snapshot(click_runner: CliRunner, output: str | None, commands_path: Pa
         return
     # Successful scenarios
     if output is not None:
-        mocked_subcommand.assert_called_once_with(ANY, expected_commands, expected_path, tags=expected_tags)
+        mocked_subcommand.assert_called_once_with(ANY, expected_commands, expected_path, tags=expected_tags, probe_timeout=DEFAULT_PROBE_TIMEOUT)
     else:
-        mocked_subcommand.assert_called_once_with(ANY, expected_commands, ANY, tags=expected_tags)
+        mocked_subcommand.assert_called_once_with(ANY, expected_commands, ANY, tags=expected_tags, probe_timeout=DEFAULT_PROBE_TIMEOUT)
         # TODO should add check that path starts with "anta_snapshot_"
     assert result.exit_code == 0
 
@@ -155,5 +156,5 @@ def test_collect_tech_support(click_runner: CliRunner, output: str | None, lates
     with patch("anta.cli.exec.commands.collect_scheduled_show_tech") as mocked_subcommand:
         mocked_subcommand.return_value = None
         result = click_runner.invoke(anta, cli_args, env=env, auto_envvar_prefix="ANTA")
-    mocked_subcommand.assert_called_once_with(ANY, expected_path, configure, tags=expected_tags, latest=latest)
+    mocked_subcommand.assert_called_once_with(ANY, expected_path, configure, tags=expected_tags, latest=latest, probe_timeout=DEFAULT_PROBE_TIMEOUT)
     assert result.exit_code == 0
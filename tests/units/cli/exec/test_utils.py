@@ -63,7 +63,7 @@ async def test_clear_counters_utils(
     Test anta.cli.exec.utils.clear_counters_utils
     """
 
-    async def mock_connect_inventory() -> None:
+    async def mock_connect_inventory(probe_timeout: float) -> None:  # pylint: disable=unused-argument
         """
         mocking connect_inventory coroutine
         """
@@ -72,20 +72,20 @@ async def test_clear_counters_utils(
             device.established = inventory_state[name].get("established", device.is_online)
             device.hw_model = inventory_state[name].get("hw_model", "dummy")
 
-    async def dummy_collect(self: AntaDevice, command: AntaCommand) -> None:
+    async def dummy_collect_commands(self: AntaDevice, commands: list[AntaCommand]) -> None:
         """
-        mocking collect coroutine
+        mocking collect_commands coroutine
         """
-        command.output = per_device_command_output.get(self.name, "")
+        for command in commands:
+            command.output = per_device_command_output.get(self.name, "")
 
     # Need to patch the child device class
-    with patch("anta.device.AsyncEOSDevice.collect", side_effect=dummy_collect, autospec=True) as mocked_collect, patch(
-        # with patch.object(AsyncEOSDevice, "collect", autospec=True) as mocked_collect, patch(
+    with patch("anta.device.AsyncEOSDevice.collect_commands", side_effect=dummy_collect_commands, autospec=True) as mocked_collect, patch(
         "anta.inventory.AntaInventory.connect_inventory",
         side_effect=mock_connect_inventory,
     ) as mocked_connect_inventory:
         print(mocked_collect)
-        mocked_collect.side_effect = dummy_collect
+        mocked_collect.side_effect = dummy_collect_commands
         await clear_counters_utils(test_inventory, tags=tags)
 
     mocked_connect_inventory.assert_awaited_once()
@@ -94,41 +94,32 @@ async def test_clear_counters_utils(
         # Building the list of calls
         calls = []
         for device in devices_established:
-            calls.append(
-                call(
-                    device,
-                    **{
-                        "command": AntaCommand(
-                            command="clear counters",
-                            version="latest",
-                            revision=None,
-                            ofmt="json",
-                            output=per_device_command_output.get(device.name, ""),
-                            template=None,
-                            failed=None,
-                            params=None,
-                        )
-                    },
+            commands = [
+                AntaCommand(
+                    command="clear counters",
+                    version="latest",
+                    revision=None,
+                    ofmt="json",
+                    output=per_device_command_output.get(device.name, ""),
+                    template=None,
+                    failed=None,
+                    params=None,
                 )
-            )
+            ]
             if device.hw_model not in ["cEOSLab", "vEOS-lab"]:
-                calls.append(
-                    call(
-                        device,
-                        **{
-                            "command": AntaCommand(
-                                command="clear hardware counter drop",
-                                version="latest",
-                                revision=None,
-                                ofmt="json",
-                                output=per_device_command_output.get(device.name, ""),
-                                template=None,
-                                failed=None,
-                                params=None,
-                            )
-                        },
+                commands.append(
+                    AntaCommand(
+                        command="clear hardware counter drop",
+                        version="latest",
+                        revision=None,
+                        ofmt="json",
+                        output=per_device_command_output.get(device.name, ""),
+                        template=None,
+                        failed=None,
+                        params=None,
                     )
                 )
+            calls.append(call(device, commands=commands))
         mocked_collect.assert_has_awaits(calls)
         # Check error
         for key, value in per_device_command_output.items():
@@ -7,10 +7,17 @@ Tests for anta.cli.__init__
 
 from __future__ import annotations
 
+import gzip
+import json
+from pathlib import Path
+
+import pytest
 from click.testing import CliRunner
 from pytest import CaptureFixture
 
 from anta.cli import anta
+from anta.models import AntaCommand
+from anta.tools.snapshot import save_command_output
 from tests.lib.utils import default_anta_env
 
 
@@ -118,3 +125,157 @@ def test_anta_enable_password(click_runner: CliRunner) -> None:
     result = click_runner.invoke(anta, ["--enable-password", "blah", "get", "inventory"], env=env, auto_envvar_prefix="ANTA")
     assert result.exit_code == 2
     assert "Providing a password to access EOS Privileged EXEC mode requires '--enable' option." in result.output
+
+
+def test_anta_nrfu_replay(capsys: CaptureFixture[str], click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --replay
+    """
+    save_command_output(tmp_path, "dummy", AntaCommand(command="show version", output={"modelName": "cEOSLab", "version": "4.26.1F"}))
+    env = default_anta_env()
+    with capsys.disabled():
+        result = click_runner.invoke(anta, ["nrfu", "--replay", str(tmp_path), "text"], env=env, auto_envvar_prefix="ANTA")
+    assert result.exit_code == 2
+    assert "dummy :: VerifyEOSVersion :: SUCCESS" in result.output
+    assert "dummy2 ::" not in result.output
+
+    with capsys.disabled():
+        result = click_runner.invoke(anta, ["nrfu", "--replay", str(Path(env["ANTA_INVENTORY"])), "text"], env=env, auto_envvar_prefix="ANTA")
+    assert result.exit_code == 2
+    assert "Unable to read snapshot" in result.output
+
+
+def test_anta_nrfu_json_output(capsys: CaptureFixture[str], click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu json --output with a gzip-compressed NDJSON file
+    """
+    save_command_output(tmp_path, "dummy", AntaCommand(command="show version", output={"modelName": "cEOSLab", "version": "4.26.1F"}))
+    output = tmp_path / "report.ndjson.gz"
+    env = default_anta_env()
+    with capsys.disabled():
+        result = click_runner.invoke(anta, ["nrfu", "--replay", str(tmp_path), "json", "--ndjson", "--output", str(output)], env=env, auto_envvar_prefix="ANTA")
+    # Commands missing from the snapshot make the other tests fail with an error
+    assert result.exit_code == 2
+    lines = [json.loads(line) for line in gzip.decompress(output.read_bytes()).decode("utf-8").splitlines()]
+    assert {line["name"] for line in lines} == {"dummy"}
+    assert {(line["test"], line["result"]) for line in lines} >= {("VerifyEOSVersion", "success")}
+    # The results are also streamed to the console
+    console_lines = [json.loads(line) for line in result.output.splitlines() if line.startswith("{")]
+    assert console_lines == lines
+
+
+def test_anta_nrfu_diff(capsys: CaptureFixture[str], click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu diff
+    """
+    snapshot = tmp_path / "snapshot"
+    save_command_output(snapshot, "dummy", AntaCommand(command="show version", output={"modelName": "cEOSLab", "version": "4.26.1F"}))
+    results = tmp_path / "results.json"
+    env = default_anta_env()
+    args = ["nrfu", "--replay", str(snapshot), "diff", "--baseline", str(results), "--output", str(results)]
+
+    # First run against an empty baseline: all the tests are new
+    results.write_text("[]", encoding="utf-8")
+    with capsys.disabled():
+        result = click_runner.invoke(anta, args, env=env, auto_envvar_prefix="ANTA")
+    assert result.exit_code == 2
+    lines = json.loads(results.read_text(encoding="utf-8"))
+    assert f"{len(lines)} changes since {results}: " in " ".join(result.output.split())
+
+    # Second run: the saved results are the baseline
+    with capsys.disabled():
+        result = click_runner.invoke(anta, args, env=env, auto_envvar_prefix="ANTA")
+    assert f"0 changes since {results}" in " ".join(result.output.split())
+
+    # The baseline recorded a failure for VerifyEOSVersion
+    for line in lines:
+        if line["test"] == "VerifyEOSVersion":
+            line["result"] = "failure"
+    results.write_text(json.dumps(lines), encoding="utf-8")
+    with capsys.disabled():
+        result = click_runner.invoke(anta, args, env=env, auto_envvar_prefix="ANTA")
+    assert f"1 changes since {results}: 0 new failure, 1 recovery" in " ".join(result.output.split())
+
+
+def test_anta_nrfu_state_dir(capsys: CaptureFixture[str], click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --state-dir
+    """
+    snapshot = tmp_path / "snapshot"
+    save_command_output(snapshot, "dummy", AntaCommand(command="show version", output={"modelName": "cEOSLab", "version": "4.26.1F", "uptime": 10.0}))
+    save_command_output(snapshot, "dummy", AntaCommand(command="show running-config", ofmt="text", output="hostname dummy"))
+    save_command_output(snapshot, "dummy", AntaCommand(command="show interfaces status", output={"interfaceStatuses": {}}))
+    state = tmp_path / "state"
+    env = default_anta_env()
+    args = ["nrfu", "--replay", str(snapshot), "--state-dir", str(state), "json"]
+    with capsys.disabled():
+        first = click_runner.invoke(anta, args, env=env, auto_envvar_prefix="ANTA")
+    assert '"test":"VerifyEOSVersion"' in (state / "dummy.json").read_text(encoding="utf-8")
+    # The device has not changed: the results are read from the state directory
+    with capsys.disabled():
+        second = click_runner.invoke(anta, args, env=env, auto_envvar_prefix="ANTA")
+    assert "VerifyEOSVersion" in second.output
+    assert second.exit_code == first.exit_code
+
+
+def test_anta_nrfu_state_commands(capsys: CaptureFixture[str], click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --state-commands
+    """
+    snapshot = tmp_path / "snapshot"
+    save_command_output(snapshot, "dummy", AntaCommand(command="show version", output={"modelName": "cEOSLab", "version": "4.26.1F", "uptime": 10.0}))
+    state = tmp_path / "state"
+    env = default_anta_env()
+    args = ["nrfu", "--replay", str(snapshot), "--state-dir", str(state)]
+    # The default fingerprint commands are missing from the snapshot: no state is saved
+    with capsys.disabled():
+        click_runner.invoke(anta, args + ["json"], env=env, auto_envvar_prefix="ANTA")
+    assert not (state / "dummy.json").exists()
+    with capsys.disabled():
+        click_runner.invoke(anta, args + ["--state-commands", "show version", "json"], env=env, auto_envvar_prefix="ANTA")
+    assert '"test":"VerifyEOSVersion"' in (state / "dummy.json").read_text(encoding="utf-8")
+
+
+def test_anta_nrfu_catalog_cache(capsys: CaptureFixture[str], click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu --catalog-cache
+    """
+    save_command_output(tmp_path / "snapshot", "dummy", AntaCommand(command="show version", output={"modelName": "cEOSLab", "version": "4.26.1F"}))
+    cache = tmp_path / "cache"
+    env = default_anta_env()
+    args = ["nrfu", "--replay", str(tmp_path / "snapshot"), "--catalog-cache", str(cache), "text"]
+    with capsys.disabled():
+        first = click_runner.invoke(anta, args, env=env, auto_envvar_prefix="ANTA")
+    assert len(list(cache.iterdir())) == 1
+    with capsys.disabled():
+        second = click_runner.invoke(anta, args, env=env, auto_envvar_prefix="ANTA")
+    assert "dummy :: VerifyEOSVersion :: SUCCESS" in second.output
+    assert sorted(line for line in second.output.splitlines() if " :: " in line) == sorted(line for line in first.output.splitlines() if " :: " in line)
+
+
+@pytest.mark.parametrize("file_only", [False, True], ids=["console and file", "file only"])
+def test_anta_nrfu_tpl_report_output(capsys: CaptureFixture[str], click_runner: CliRunner, tmp_path: Path, file_only: bool) -> None:
+    """
+    Test anta nrfu tpl-report --output: the report is printed unless --file-only is set
+    """
+    save_command_output(tmp_path / "snapshot", "dummy", AntaCommand(command="show version", output={"modelName": "cEOSLab", "version": "4.26.1F"}))
+    template = tmp_path / "template.j2"
+    template.write_text("{% for d in data %}* {{ d.test }} on {{ d.name }}\n{% endfor %}", encoding="utf-8")
+    output = tmp_path / "report.txt"
+    env = default_anta_env()
+    args = ["nrfu", "--replay", str(tmp_path / "snapshot"), "tpl-report", "--template", str(template), "--output", str(output)]
+    with capsys.disabled():
+        result = click_runner.invoke(anta, args + ["--file-only"] if file_only else args, env=env, auto_envvar_prefix="ANTA")
+    assert "* VerifyEOSVersion on dummy" in output.read_text(encoding="utf-8")
+    assert ("* VerifyEOSVersion on dummy" in result.output) is not file_only
+
+
+def test_anta_nrfu_tpl_report_file_only_without_output(click_runner: CliRunner, tmp_path: Path) -> None:
+    """
+    Test anta nrfu tpl-report --file-only without --output
+    """
+    template = tmp_path / "template.j2"
+    template.write_text("{{ data | length }}", encoding="utf-8")
+    result = click_runner.invoke(anta, ["nrfu", "tpl-report", "--template", str(template), "--file-only"], env=default_anta_env(), auto_envvar_prefix="ANTA")
+    assert result.exit_code == 2
+    assert "'--file-only' requires '--output'" in result.output
@@ -4,14 +4,17 @@
 """ANTA Inventory unit tests."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+from unittest.mock import patch
 
 import pytest
 import yaml
 from pydantic import ValidationError
 
+from anta.device import DEFAULT_PROBE_TIMEOUT, AsyncEOSDevice
 from anta.inventory import AntaInventory
 from anta.inventory.exceptions import InventoryIncorrectSchema, InventoryRootKeyError
 from tests.data.json_data import ANTA_INVENTORY_TESTS_INVALID, ANTA_INVENTORY_TESTS_VALID
@@ -85,3 +88,50 @@ class Test_AntaInventory:
             logging.warning("Exception is: %s", exc)
         else:
             assert False
+
+    @pytest.mark.parametrize("keepalive_expiry", [None, 30.0], ids=["no expiry", "30s"])
+    def test_parse_keepalive_expiry(self, keepalive_expiry: Optional[float], tmp_path: Path) -> None:
+        """Test AntaInventory.parse: keepalive_expiry is passed to the devices, including None."""
+        inventory_file = tmp_path / "inventory.yml"
+        inventory_file.write_text(yaml.dump({"anta_inventory": {"hosts": [{"host": "192.168.0.17"}]}}))
+        inventory = AntaInventory.parse(inventory_file=str(inventory_file), username="arista", password="arista123", keepalive_expiry=keepalive_expiry)
+        device = inventory["192.168.0.17"]
+        assert isinstance(device, AsyncEOSDevice)
+        assert device._session._transport._pool._keepalive_expiry == keepalive_expiry  # pylint: disable=protected-access
+
+    def test_connect_inventory(self) -> None:
+        """Test AntaInventory.connect_inventory: only the devices answering the probe are refreshed."""
+        inventory = AntaInventory()
+        for host in ["10.0.0.1", "10.0.0.2", "10.0.0.3"]:
+            inventory.add_device(AsyncEOSDevice(host, "anta", "anta"))
+
+        async def probe(self: AsyncEOSDevice, timeout: float = DEFAULT_PROBE_TIMEOUT) -> bool:
+            timeouts.add(timeout)
+            if self.name == "10.0.0.3":
+                raise RuntimeError("probe failure")
+            return self.name == "10.0.0.1"
+
+        async def refresh(self: AsyncEOSDevice) -> None:
+            refreshed.append(self.name)
+            self.is_online = True
+            self.established = True
+
+        refreshed: list[str] = []
+        timeouts: set[float] = set()
+        with patch.object(AsyncEOSDevice, "probe", probe), patch.object(AsyncEOSDevice, "refresh", refresh):
+            asyncio.run(inventory.connect_inventory(probe_timeout=0.1, max_concurrency=1))
+        assert refreshed == ["10.0.0.1"]
+        assert list(inventory.get_inventory(established_only=True)) == ["10.0.0.1"]
+        assert timeouts == {0.1}
+
+        # The probe has its own default timeout
+        timeouts.clear()
+        with patch.object(AsyncEOSDevice, "probe", probe), patch.object(AsyncEOSDevice, "refresh", refresh):
+            asyncio.run(inventory.connect_inventory())
+        assert timeouts == {DEFAULT_PROBE_TIMEOUT}
+
+        # Without probe, all the devices are refreshed
+        refreshed.clear()
+        with patch.object(AsyncEOSDevice, "refresh", refresh):
+            asyncio.run(inventory.connect_inventory(probe=False, max_concurrency=None))
+        assert sorted(refreshed) == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
@@ -7,12 +7,20 @@ Test anta.report.__init__.py
 
 from __future__ import annotations
 
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
 import pytest
 from rich.table import Table
 from rich.text import Text
 
 from anta import RICH_COLOR_PALETTE
-from anta.reporter import ReportTable
+from anta.custom_types import TestStatus
+from anta.reporter import LazyResults, ReportJinja, ReportTable
+from anta.result_manager import ResultManager
+from anta.result_manager.models import ListResult
 
 
 class Test_ReportTable:
@@ -84,3 +92,130 @@ class Test_ReportTable:
         if output_type == "Text":
             expected_status = report.colors[0].style_rich()
         assert report._color_result(status, output_type) == expected_status
+
+    @pytest.mark.parametrize(
+        "host, testcase, statuses, expected_tests",
+        [
+            pytest.param(None, None, None, ["VerifyTest0", "VerifyTest1", "VerifyTest2", "VerifyTest3", "VerifyTest4"], id="all"),
+            pytest.param(None, None, ["failure", "error"], ["VerifyTest1", "VerifyTest3", "VerifyTest2"], id="failures only"),
+            pytest.param("device1", None, ["failure", "error"], ["VerifyTest1", "VerifyTest3"], id="host failures only"),
+            pytest.param(None, "VerifyTest0", None, ["VerifyTest0"], id="testcase"),
+        ],
+    )
+    def test_report_all(
+        self, list_result_factory: Callable[[int], ListResult], host: str | None, testcase: str | None, statuses: list[TestStatus] | None, expected_tests: list[str]
+    ) -> None:
+        """
+        test report_all
+        """
+        # pylint: disable=too-many-arguments
+        list_result = list_result_factory(5)
+        results: list[TestStatus] = ["success", "failure", "error", "failure", "skipped"]
+        for index, result in enumerate(list_result):
+            result.name = f"device{index % 2}"
+            result.result = results[index]
+        result_manager = ResultManager()
+        result_manager.add_test_results(list(list_result))
+        table = ReportTable().report_all(result_manager, host=host, testcase=testcase, statuses=statuses)
+        assert list(table.columns[1].cells) == expected_tests
+
+    @pytest.mark.parametrize(
+        "statuses, expected_hosts, expected_tests",
+        [
+            pytest.param(None, ["device0", "device1", "device2"], ["VerifyTest0", "VerifyTest1", "VerifyTest2"], id="all"),
+            pytest.param(["failure", "error"], ["device1", "device2"], ["VerifyTest1", "VerifyTest2"], id="failures only"),
+        ],
+    )
+    def test_report_summary(
+        self, list_result_factory: Callable[[int], ListResult], statuses: list[TestStatus] | None, expected_hosts: list[str], expected_tests: list[str]
+    ) -> None:
+        """
+        test report_summary_hosts and report_summary_tests
+        """
+        list_result = list_result_factory(3)
+        results: list[TestStatus] = ["success", "failure", "error"]
+        for index, result in enumerate(list_result):
+            result.name = f"device{index}"
+            result.result = results[index]
+        result_manager = ResultManager()
+        result_manager.add_test_results(list_result)
+        assert list(ReportTable().report_summary_hosts(result_manager, statuses=statuses).columns[0].cells) == expected_hosts
+        assert list(ReportTable().report_summary_tests(result_manager, statuses=statuses).columns[0].cells) == expected_tests
+
+    @pytest.mark.parametrize(
+        "size, page_size, expected_rows",
+        [
+            pytest.param(0, 2, [0], id="empty"),
+            pytest.param(3, 5, [3], id="one page"),
+            pytest.param(4, 2, [2, 2], id="full pages"),
+            pytest.param(5, 2, [2, 2, 1], id="last page"),
+        ],
+    )
+    def test_report_all_pages(self, result_manager_factory: Callable[[int], ResultManager], size: int, page_size: int, expected_rows: list[int]) -> None:
+        """
+        test report_all_pages
+        """
+        result_manager = result_manager_factory(size)
+        tables = list(ReportTable().report_all_pages(result_manager, page_size=page_size, title="Title"))
+        assert [table.row_count for table in tables] == expected_rows
+        if len(tables) == 1:
+            assert tables[0].title == "Title"
+        else:
+            assert [table.title for table in tables] == [f"Title ({page}/{len(tables)})" for page in range(1, len(tables) + 1)]
+        assert [cell for table in tables for cell in table.columns[1].cells] == [result.test for result in result_manager.get_results()]
+
+
+TEMPLATE = """{% for d in data %}
+* {{ d.test }} is {{ d.result | upper }} for {{ d.name }}
+{% endfor %}
+{{ data | length }} results, first: {{ data[0].test }}
+"""
+
+
+class Test_ReportJinja:
+    """
+    Test ReportJinja class
+    """
+
+    def test_lazy_results(self, result_manager_factory: Callable[[int], ResultManager]) -> None:
+        """
+        LazyResults provides the same data as ResultManager.get_results(output_format="json")
+        """
+        result_manager = result_manager_factory(3)
+        data = LazyResults(result_manager.get_results(output_format="list"))
+        expected = json.loads(result_manager.get_results(output_format="json"))
+        assert len(data) == 3
+        assert list(data) == expected
+        assert data[1] == expected[1]
+        assert data[1:] == expected[1:]
+
+    def test_render_and_generate(self, result_manager_factory: Callable[[int], ResultManager], tmp_path: Path) -> None:
+        """
+        test render and generate
+        """
+        template = tmp_path / "template.j2"
+        template.write_text(TEMPLATE, encoding="utf-8")
+        result_manager = result_manager_factory(2)
+        reporter = ReportJinja(template_path=template)
+        data = LazyResults(result_manager.get_results(output_format="list"))
+        expected = "* VerifyTest0 is UNSET for testdevice\n* VerifyTest1 is UNSET for testdevice\n2 results, first: VerifyTest0"
+        assert reporter.render(data) == expected
+        # The compiled template is shared by the ReportJinja instances
+        assert ReportJinja(template_path=template)._template(True, True) is reporter._template(True, True)  # pylint: disable=protected-access
+
+        output = tmp_path / "report.txt"
+        reporter.generate(data, output)
+        assert output.read_text(encoding="utf-8") == expected
+
+        # The template is reloaded when it is modified
+        template.write_text("{{ data | length }}", encoding="utf-8")
+        mtime = template.stat().st_mtime + 10
+        os.utime(template, (mtime, mtime))
+        assert reporter.render(data) == "2"
+
+    def test_template_not_found(self, tmp_path: Path) -> None:
+        """
+        test ReportJinja with a missing template
+        """
+        with pytest.raises(FileNotFoundError):
+            ReportJinja(template_path=tmp_path / "missing.j2")
@@ -15,7 +15,7 @@ import pytest
 
 from anta.custom_types import TestStatus
 from anta.result_manager import ResultManager
-from anta.result_manager.models import ListResult
+from anta.result_manager.models import CompactError, CompactTestResult, ListResult
 
 if TYPE_CHECKING:
     from anta.result_manager.models import TestResult
@@ -142,6 +142,13 @@ class Test_ResultManager:
         assert result_manager.status == "failure"
         assert result_manager.error_status is True
         assert len(result_manager) == 5
+        assert result_manager.get_counters() == {"success": 3, "error": 1, "failure": 1}
+
+        # Invalid statuses are still rejected
+        invalid_list = list_result_factory(1)
+        invalid_list[0].result = "unknown"
+        with pytest.raises(ValueError):
+            result_manager.add_test_results(invalid_list.root)
 
     @pytest.mark.parametrize(
         "status, error_status, ignore_error, expected_status",
@@ -192,8 +199,66 @@ class Test_ResultManager:
             elif _format == "native":
                 assert isinstance(res, ListResult)
 
-    # TODO
-    # get_result_by_test
-    # get_result_by_host
-    # get_testcases
-    # get_hosts
+    @pytest.mark.parametrize("compact", [pytest.param(False, id="standard"), pytest.param(True, id="compact")])
+    def test_indexes(self, test_result_factory: Callable[[int], TestResult], compact: bool) -> None:
+        """
+        test get_result_by_test, get_result_by_host, get_result_by_category, get_result_by_status,
+        get_testcases, get_hosts, get_categories and get_counters
+        """
+        result_manager = ResultManager(compact=compact)
+        results: list[tuple[str, str, list[str], TestStatus]] = [
+            ("leaf1", "VerifyUptime", ["system"], "success"),
+            ("leaf1", "VerifyBGP", ["routing", "bgp"], "failure"),
+            ("leaf2", "VerifyUptime", ["system"], "error"),
+            ("leaf2", "VerifyBGP", ["routing", "bgp"], "success"),
+        ]
+        for host, test, categories, status in results:
+            result = test_result_factory(0)
+            result.name, result.test, result.categories, result.result = host, test, categories, status
+            result_manager.add_test_result(result)
+
+        assert result_manager.get_hosts() == ["leaf1", "leaf2"]
+        assert result_manager.get_testcases() == ["VerifyUptime", "VerifyBGP"]
+        assert result_manager.get_categories() == ["system", "routing", "bgp"]
+        assert [result.test for result in result_manager.get_result_by_host("leaf2", output_format="list")] == ["VerifyUptime", "VerifyBGP"]
+        assert [result.name for result in result_manager.get_result_by_test("VerifyBGP")] == ["leaf1", "leaf2"]
+        assert isinstance(result_manager.get_result_by_test("VerifyBGP"), ListResult)
+        assert len(result_manager.get_result_by_category("bgp", output_format="list")) == 2
+        assert [result.name for result in result_manager.get_result_by_status("success", output_format="list")] == ["leaf1", "leaf2"]
+        assert result_manager.get_result_by_host("unknown", output_format="list") == []
+        assert result_manager.get_counters() == {"success": 2, "failure": 1, "error": 1}
+        assert result_manager.get_counters(host_ip="leaf1") == {"success": 1, "failure": 1}
+        assert result_manager.get_counters(test_name="VerifyUptime") == {"success": 1, "error": 1}
+        assert not result_manager.get_counters(host_ip="unknown")
+
+    def test_compact(self, list_result_factory: Callable[[int], ListResult]) -> None:
+        """
+        test ResultManager with compact results
+        """
+        list_result = list_result_factory(3)
+        list_result[0].is_success("message")
+        list_result[1].is_error("error", exception=ValueError("bad value"))
+        result_manager = ResultManager(compact=True)
+        result_manager.add_test_result(list_result[0])
+        result_manager.add_test_results([list_result[1], list_result[2]])
+        assert len(result_manager) == 3
+        assert result_manager.get_status() == "error"
+        assert all(isinstance(entry, CompactTestResult) for entry in result_manager._compact_entries)  # pylint: disable=protected-access
+        # Strings and categories are shared between the results
+        assert result_manager._compact_entries[0].categories is result_manager._compact_entries[2].categories  # pylint: disable=protected-access
+        # The categories are only shared between the results of the same ResultManager
+        other = ResultManager(compact=True)
+        other.add_test_result(list_result[2])
+        assert other._compact_entries[0].categories is not result_manager._compact_entries[2].categories  # pylint: disable=protected-access
+
+        results = result_manager.get_results(output_format="list")
+        assert [result.test for result in results] == ["VerifyTest0", "VerifyTest1", "VerifyTest2"]
+        assert results[0].messages == ["message"]
+        assert isinstance(results[1].error, CompactError)
+        assert str(results[1].error) == "bad value"
+        assert repr(results[1].error) == "ValueError('bad value')"
+        assert isinstance(result_manager.get_results(), ListResult)
+
+        standard = ResultManager()
+        standard.add_test_results(list(list_result))
+        assert result_manager.get_results(output_format="json") == standard.get_results(output_format="json")
@@ -0,0 +1,91 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Test anta.result_manager.columnar.py
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from anta.result_manager import ResultManager
+from anta.result_manager.columnar import ColumnarResults
+from anta.result_manager.models import ListResult
+
+
+@pytest.fixture(name="columnar_results")
+def columnar_results_fixture(list_result_factory: Callable[[int], ListResult]) -> ColumnarResults:
+    """
+    ColumnarResults populated by a ResultManager with 4 results on 2 devices
+    """
+    store = ColumnarResults()
+    result_manager = ResultManager(sinks=[store])
+    for index, result in enumerate(list_result_factory(4)):
+        result.name = f"device{index % 2}"
+        if index == 3:
+            result.is_error("error", exception=ValueError("bad value"))
+        else:
+            result.is_success()
+        result_manager.add_test_result(result)
+    return store
+
+
+class Test_ColumnarResults:
+    """
+    Test ColumnarResults class
+    """
+
+    def test_columns(self, columnar_results: ColumnarResults) -> None:
+        """
+        Values are dictionary-encoded and decoded back
+        """
+        assert len(columnar_results) == 4
+        assert columnar_results.dictionaries["name"] == ["device0", "device1"]
+        assert columnar_results.codes["name"].tolist() == [0, 1, 0, 1]
+        assert columnar_results.dictionaries["result"] == ["success", "error"]
+        assert columnar_results.column("name") == ["device0", "device1", "device0", "device1"]
+        assert columnar_results.column("test") == ["VerifyTest0", "VerifyTest1", "VerifyTest2", "VerifyTest3"]
+        assert columnar_results.column("error") == [None, None, None, "bad value"]
+        assert columnar_results.column("messages")[3] == ["error"]
+        assert columnar_results.counts("result") == {"success": 3, "error": 1}
+
+    def test_export_json(self, columnar_results: ColumnarResults, tmp_path: Path) -> None:
+        """
+        The gzip-compressed JSON export can be loaded back
+        """
+        path = tmp_path / "results.json.gz"
+        assert columnar_results.export(path, export_format="json") == "json"
+        loaded = ColumnarResults.load(path)
+        assert loaded.to_dict() == columnar_results.to_dict()
+        assert json.loads(json.dumps(columnar_results.to_dict())) == columnar_results.to_dict()
+        assert loaded.column("categories") == columnar_results.column("categories")
+        assert len(loaded) == 4
+
+    def test_close(self, columnar_results: ColumnarResults, tmp_path: Path) -> None:
+        """
+        The results are exported when the sink is closed, in Parquet format if pyarrow is installed
+        """
+        columnar_results.path = tmp_path / "results"
+        columnar_results.close()
+        assert columnar_results.path.exists()
+        try:
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            assert ColumnarResults.load(columnar_results.path).to_dict() == columnar_results.to_dict()
+        else:
+            assert pyarrow.parquet.read_table(columnar_results.path).column("name").to_pylist() == columnar_results.column("name")
+
+    def test_export_parquet(self, columnar_results: ColumnarResults, tmp_path: Path) -> None:
+        """
+        Test the Parquet export
+        """
+        pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "results.parquet"
+        assert columnar_results.export(path, export_format="parquet") == "parquet"
+        table = pyarrow_parquet.read_table(path)
+        for column in ("name", "test", "result", "description", "categories", "inputs_hash", "messages", "error", "custom_field"):
+            assert table.column(column).to_pylist() == columnar_results.column(column)
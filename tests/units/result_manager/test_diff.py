@@ -0,0 +1,70 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Test anta.result_manager.diff.py
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+import pytest
+
+from anta.result_manager import ResultManager
+from anta.result_manager.diff import diff_results
+
+BASELINE = [
+    {"name": "leaf1", "test": "VerifyUptime", "inputs_hash": "h1", "result": "success"},
+    {"name": "leaf1", "test": "VerifyBGP", "inputs_hash": "h2", "result": "failure"},
+    {"name": "leaf1", "test": "VerifyBGP", "inputs_hash": "h3", "result": "success"},
+    {"name": "leaf2", "test": "VerifyUptime", "inputs_hash": "h1", "result": "success"},
+    {"name": "leaf2", "test": "VerifyNTP", "inputs_hash": "None", "result": "skipped"},
+    {"name": "leaf2", "test": "VerifyNTP", "inputs_hash": "None", "result": "failure"},
+]
+
+
+@pytest.mark.parametrize(
+    "current, expected",
+    [
+        pytest.param(BASELINE, [], id="no change"),
+        pytest.param(
+            [
+                {"name": "leaf1", "test": "VerifyUptime", "inputs_hash": "h1", "result": "error"},
+                {"name": "leaf1", "test": "VerifyBGP", "inputs_hash": "h2", "result": "success"},
+                {"name": "leaf1", "test": "VerifyBGP", "inputs_hash": "h3", "result": "skipped"},
+                {"name": "leaf2", "test": "VerifyNTP", "inputs_hash": "None", "result": "skipped"},
+                {"name": "leaf2", "test": "VerifyNTP", "inputs_hash": "None", "result": "error"},
+                {"name": "leaf3", "test": "VerifyUptime", "inputs_hash": "h1", "result": "success"},
+                {"name": "leaf3", "test": "VerifyBGP", "inputs_hash": "h2", "result": "failure"},
+            ],
+            [
+                ("leaf1", "VerifyUptime", "h1", "new_failure", "success", "error"),
+                ("leaf1", "VerifyBGP", "h2", "recovery", "failure", "success"),
+                ("leaf1", "VerifyBGP", "h3", "status_change", "success", "skipped"),
+                ("leaf2", "VerifyNTP", None, "status_change", "failure", "error"),
+                ("leaf3", "VerifyUptime", "h1", "added", None, "success"),
+                ("leaf3", "VerifyBGP", "h2", "new_failure", None, "failure"),
+                ("leaf2", "VerifyUptime", "h1", "removed", "success", None),
+            ],
+            id="changes",
+        ),
+    ],
+)
+def test_diff_results(current: list[dict[str, Any]], expected: list[tuple[Any, ...]]) -> None:
+    """
+    Test anta.result_manager.diff.diff_results
+    """
+    changes = [(change.name, change.test, change.inputs_hash, change.change, change.before, change.after) for change in diff_results(BASELINE, current)]
+    assert changes == expected
+
+
+def test_diff_results_test_results(result_manager_factory: Callable[[int], ResultManager]) -> None:
+    """
+    TestResult instances and dictionaries from exported files can be compared
+    """
+    result_manager = result_manager_factory(3)
+    baseline = json.loads(result_manager.get_results(output_format="json"))
+    baseline[1]["result"] = "failure"
+    changes = list(diff_results(baseline, result_manager.get_results()))
+    assert [(change.test, change.change) for change in changes] == [("VerifyTest1", "recovery")]
@@ -0,0 +1,110 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Test anta.result_manager.export.py
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from anta.result_manager import ResultManager, export
+from anta.result_manager.export import export_results, read_results, write_results
+from anta.result_manager.models import ListResult
+
+
+@pytest.mark.parametrize("size", [0, 1, 3])
+def test_write_results_json(list_result_factory: Callable[[int], ListResult], size: int) -> None:
+    """
+    The JSON array is identical to ResultManager.get_results(output_format="json")
+    """
+    result_manager = ResultManager()
+    result_manager.add_test_results(list_result_factory(size))
+    file = io.StringIO()
+    assert write_results(result_manager.get_results(), file) == size
+    assert file.getvalue() == result_manager.get_results(output_format="json")
+
+    file = io.StringIO()
+    write_results(result_manager.get_results(), file, indent=None)
+    assert json.loads(file.getvalue()) == json.loads(result_manager.get_results(output_format="json"))
+
+
+def test_write_results_ndjson(list_result_factory: Callable[[int], ListResult]) -> None:
+    """
+    One test result per line with the ndjson format
+    """
+    result_manager = ResultManager()
+    result_manager.add_test_results(list_result_factory(3))
+    file = io.StringIO()
+    assert write_results(result_manager.get_results(), file, output_format="ndjson") == 3
+    lines = [json.loads(line) for line in file.getvalue().splitlines()]
+    assert lines == json.loads(result_manager.get_results(output_format="json"))
+
+
+@pytest.mark.parametrize(
+    "filename, compress, compressed",
+    [
+        pytest.param("results.json", None, False, id="plain"),
+        pytest.param("results.json.gz", None, True, id="gz suffix"),
+        pytest.param("results.json", True, True, id="compress"),
+        pytest.param("results.json.gz", False, False, id="no compress"),
+    ],
+)
+def test_export_results(tmp_path: Path, list_result_factory: Callable[[int], ListResult], filename: str, compress: bool | None, compressed: bool) -> None:
+    """
+    Test anta.result_manager.export.export_results
+    """
+    result_manager = ResultManager()
+    result_manager.add_test_results(list_result_factory(2))
+    path = tmp_path / filename
+    assert export_results(result_manager.get_results(), path, compress=compress) == 2
+    content = gzip.decompress(path.read_bytes()).decode("utf-8") if compressed else path.read_text(encoding="utf-8")
+    assert content == result_manager.get_results(output_format="json")
+
+
+@pytest.mark.parametrize("filename", ["results.json", "results.json.gz", "results.ndjson", "results.ndjson.gz"])
+@pytest.mark.parametrize("indent", [4, None])
+def test_read_results(tmp_path: Path, list_result_factory: Callable[[int], ListResult], monkeypatch: pytest.MonkeyPatch, filename: str, indent: int | None) -> None:
+    """
+    Exported files are read back, whatever the size of the chunks
+    """
+    # pylint: disable=too-many-arguments
+    monkeypatch.setattr(export, "READ_CHUNK_SIZE", 7)
+    result_manager = ResultManager()
+    result_manager.add_test_results(list_result_factory(3))
+    path = tmp_path / filename
+    export_results(result_manager.get_results(), path, output_format="ndjson" if "ndjson" in filename else "json", indent=indent)
+    assert list(read_results(path)) == json.loads(result_manager.get_results(output_format="json"))
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        pytest.param("", [], id="empty file"),
+        pytest.param(" []\n", [], id="empty array"),
+        pytest.param('\n{"a": 1}\n\n{"a": 2}\n', [{"a": 1}, {"a": 2}], id="json lines"),
+    ],
+)
+def test_read_results_content(tmp_path: Path, content: str, expected: list[dict[str, int]]) -> None:
+    """
+    Test anta.result_manager.export.read_results with edge cases
+    """
+    path = tmp_path / "results.json"
+    path.write_text(content, encoding="utf-8")
+    assert list(read_results(path)) == expected
+
+
+def test_read_results_truncated(tmp_path: Path) -> None:
+    """
+    A truncated JSON array raises a ValueError
+    """
+    path = tmp_path / "results.json"
+    path.write_text('[{"a": 1}, {"a":', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(read_results(path))
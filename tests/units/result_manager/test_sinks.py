@@ -0,0 +1,35 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Test anta.result_manager.sinks.py
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable
+
+from anta.result_manager import ResultManager
+from anta.result_manager.models import ListResult
+from anta.result_manager.sinks import JsonLinesSink
+
+
+def test_json_lines_sink(tmp_path: Path, list_result_factory: Callable[[int], ListResult]) -> None:
+    """
+    Test JsonLinesSink: the results are written as soon as they are added to the ResultManager
+    """
+    path = tmp_path / "results.jsonl"
+    sink = JsonLinesSink(path)
+    result_manager = ResultManager(sinks=[sink])
+    list_result = list_result_factory(3)
+    for index, result in enumerate(list_result):
+        result.result = "success"
+        result_manager.add_test_result(result)
+        # The file is flushed after each result
+        assert len(path.read_text(encoding="utf-8").splitlines()) == index + 1
+    sink.close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["test"] for line in lines] == ["VerifyTest0", "VerifyTest1", "VerifyTest2"]
+    assert lines == json.loads(result_manager.get_results(output_format="json"))
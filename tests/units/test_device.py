@@ -7,12 +7,23 @@ test anta.device.py
 
 from __future__ import annotations
 
+import asyncio
+from pathlib import Path
 from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from aioeapi import EapiCommandError
+from httpx import ConnectError, ConnectTimeout, ReadTimeout
 
-from anta.device import AsyncEOSDevice
-from tests.lib.utils import generate_test_ids_list
+from anta.device import DEFAULT_KEEPALIVE_EXPIRY, DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_KEEPALIVE_CONNECTIONS, DEFAULT_PROBE_TIMEOUT, AsyncEOSDevice, ReplayDevice
+from anta.facts import DeviceFacts, DeviceFactsCache
+from anta.models import AntaCommand
+from anta.output_cache import CommandOutputCache
+from anta.rate_limit import CircuitBreakerOpenError
+from anta.tools.snapshot import SnapshotReader, save_command_output
+from tests.lib.fake import FakeDevice
+from tests.lib.utils import generate_test_ids_list, http_status_error
 
 INIT_DEVICE_DATA: list[dict[str, Any]] = [
     {
@@ -92,3 +103,288 @@ class Test_AsyncEOSDevice:
         device = AsyncEOSDevice(host, username, password, **kwargs)
 
         assert device.name == device_data["expected"]["name"]
+
+    def test_collect_commands(self) -> None:
+        """
+        Commands are sent in a single eAPI request per output format and version, with a single enable command
+        """
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", enable=True, enable_password="enable")
+        commands = [
+            AntaCommand(command="show version"),
+            AntaCommand(command="show interfaces", revision=2),
+            AntaCommand(command="show running-config", ofmt="text"),
+            AntaCommand(command="show uptime"),
+        ]
+
+        async def cli(commands: list[dict[str, Any]], ofmt: str, version: Any) -> list[Any]:
+            # pylint: disable=unused-argument
+            return [{}] + [{"cmd": cmd["cmd"]} if ofmt == "json" else cmd["cmd"] for cmd in commands[1:]]
+
+        with patch.object(device._session, "cli", AsyncMock(side_effect=cli)) as mocked_cli:  # pylint: disable=protected-access
+            asyncio.run(device.collect_commands(commands))
+        assert mocked_cli.await_count == 2
+        json_request = mocked_cli.await_args_list[0].kwargs
+        assert json_request["ofmt"] == "json"
+        assert json_request["commands"] == [
+            {"cmd": "enable", "input": "enable"},
+            {"cmd": "show version"},
+            {"cmd": "show interfaces", "revision": 2},
+            {"cmd": "show uptime"},
+        ]
+        assert commands[0].output == {"cmd": "show version"}
+        assert commands[1].output == {"cmd": "show interfaces"}
+        assert commands[2].output == "show running-config"
+        assert commands[3].output == {"cmd": "show uptime"}
+
+    def test_collect_commands_max_batch_size(self) -> None:
+        """
+        Requests hold at most max_batch_size commands and a read timeout only fails the slow command
+        """
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", max_batch_size=4)
+        commands = [AntaCommand(command=f"show interfaces Ethernet{index}") for index in range(10)]
+
+        async def cli(commands: list[dict[str, Any]], ofmt: str, version: Any) -> list[Any]:
+            # pylint: disable=unused-argument
+            if any(cmd["cmd"] == "show interfaces Ethernet5" for cmd in commands):
+                raise ReadTimeout("timeout")
+            return [{"cmd": cmd["cmd"]} for cmd in commands]
+
+        with patch.object(device._session, "cli", AsyncMock(side_effect=cli)) as mocked_cli:  # pylint: disable=protected-access
+            asyncio.run(device.collect_commands(commands))
+        sizes = sorted(len(call.kwargs["commands"]) for call in mocked_cli.await_args_list)
+        # Batches of 4, 4 and 2 commands: the batch holding Ethernet5 is split in 2 then 1 command batches
+        assert sizes == [1, 1, 2, 2, 2, 4, 4]
+        assert isinstance(commands[5].failed, ReadTimeout)
+        assert all(command.output == {"cmd": command.command} for index, command in enumerate(commands) if index != 5)
+
+    def test_collect_commands_failure(self) -> None:
+        """
+        A failing command is flagged as failed and the commands that have not been executed are collected again
+        """
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", enable=True)
+        commands = [AntaCommand(command="show version"), AntaCommand(command="show bogus"), AntaCommand(command="show uptime")]
+        error = EapiCommandError(failed="show bogus", errmsg="Invalid input", passed=[{}, {"modelName": "cEOSLab"}], not_exec=[{"cmd": "show uptime"}])
+        mocked_cli = AsyncMock(side_effect=[error, [{}, {"upTime": 42}]])
+        with patch.object(device._session, "cli", mocked_cli):  # pylint: disable=protected-access
+            asyncio.run(device.collect_commands(commands))
+        assert mocked_cli.await_count == 2
+        assert mocked_cli.await_args_list[1].kwargs["commands"] == [{"cmd": "enable"}, {"cmd": "show uptime"}]
+        assert commands[0].output == {"modelName": "cEOSLab"}
+        assert commands[1].failed is error
+        assert commands[2].output == {"upTime": 42}
+
+    def test_collect_commands_connect_error(self) -> None:
+        """
+        All the commands of a request are flagged as failed when the device cannot be reached
+        """
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta")
+        commands = [AntaCommand(command="show version"), AntaCommand(command="show uptime")]
+        with patch.object(device._session, "cli", AsyncMock(side_effect=ConnectError("unreachable"))):  # pylint: disable=protected-access
+            asyncio.run(device.collect(commands[0]))
+            asyncio.run(device.collect_commands(commands[1:]))
+        assert all(isinstance(command.failed, ConnectError) for command in commands)
+
+    def test_collect_commands_output_cache(self) -> None:
+        """
+        Cached outputs are used and only the other commands are sent to the device
+        """
+        cache = CommandOutputCache()
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", name="leaf1", output_cache=cache)
+        mocked_cli = AsyncMock(side_effect=[[{"modelName": "cEOSLab"}], [{"upTime": 42}]])
+        with patch.object(device._session, "cli", mocked_cli):  # pylint: disable=protected-access
+            asyncio.run(device.collect(AntaCommand(command="show version")))
+            commands = [AntaCommand(command="show version"), AntaCommand(command="show uptime")]
+            asyncio.run(device.collect_commands(commands))
+            asyncio.run(device.collect(AntaCommand(command="show uptime")))
+        assert mocked_cli.await_count == 2
+        assert mocked_cli.await_args_list[1].kwargs["commands"] == [{"cmd": "show uptime"}]
+        assert commands[0].output == {"modelName": "cEOSLab"}
+        assert commands[1].output == {"upTime": 42}
+        assert cache.get("leaf1", AntaCommand(command="show uptime")) == {"upTime": 42}
+
+        # Failed commands are not cached
+        with patch.object(device._session, "cli", AsyncMock(side_effect=ConnectError("unreachable"))):  # pylint: disable=protected-access
+            asyncio.run(device.collect(AntaCommand(command="show interfaces")))
+        assert cache.get("leaf1", AntaCommand(command="show interfaces")) is None
+
+    def test_collect_commands_overload(self) -> None:
+        """
+        Requests failing because the device is overloaded are retried and the rate limit is reduced
+        """
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", rate_limit=100, max_retries=2)
+        overload = http_status_error(503)
+        command = AntaCommand(command="show version")
+        mocked_cli = AsyncMock(side_effect=[overload, ConnectTimeout("timeout"), [{"modelName": "cEOSLab"}]])
+        with patch.object(device._session, "cli", mocked_cli), patch("anta.device.backoff_delay", return_value=0.0):  # pylint: disable=protected-access
+            asyncio.run(device.collect(command))
+        assert mocked_cli.await_count == 3
+        assert command.output == {"modelName": "cEOSLab"}
+        assert device._rate_limiter is not None and device._rate_limiter.rate < 100  # pylint: disable=protected-access
+
+        # The number of retries is bounded, read timeouts and other HTTP errors are not retried
+        for side_effect, count in ((overload, 3), (ReadTimeout("timeout"), 1), (http_status_error(401), 1)):
+            command = AntaCommand(command="show version")
+            mocked_cli = AsyncMock(side_effect=side_effect)
+            with patch.object(device._session, "cli", mocked_cli), patch("anta.device.backoff_delay", return_value=0.0):  # pylint: disable=protected-access
+                asyncio.run(device.collect(command))
+            assert mocked_cli.await_count == count
+            assert command.failed is side_effect
+
+    def test_circuit_breaker(self) -> None:
+        """
+        No request is sent to the device once its circuit breaker is open
+        """
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", circuit_breaker_threshold=2)
+        commands = [AntaCommand(command=f"show {command}") for command in ("version", "uptime", "interfaces", "vlan")]
+        mocked_cli = AsyncMock(side_effect=ConnectError("unreachable"))
+        with patch.object(device._session, "cli", mocked_cli):  # pylint: disable=protected-access
+            for command in commands:
+                asyncio.run(device.collect(command))
+        assert mocked_cli.await_count == 2
+        assert all(isinstance(command.failed, ConnectError) for command in commands[:2])
+        assert all(isinstance(command.failed, CircuitBreakerOpenError) for command in commands[2:])
+
+        # Errors returned by EOS and read timeouts do not open the circuit breaker
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", circuit_breaker_threshold=1)
+        error = EapiCommandError(failed="show bogus", errmsg="Invalid input", passed=[], not_exec=[])
+        for side_effect in (error, ReadTimeout("timeout")):
+            with patch.object(device._session, "cli", AsyncMock(side_effect=side_effect)):  # pylint: disable=protected-access
+                asyncio.run(device.collect_commands([AntaCommand(command="show bogus"), AntaCommand(command="show bogus", ofmt="text")]))
+            assert device._circuit_breaker is not None and not device._circuit_breaker.is_open  # pylint: disable=protected-access
+
+    def test_connection_pool(self) -> None:
+        """
+        The HTTP connection pool of the device is configured with the provided limits
+        """
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", max_connections=4, keepalive_expiry=None)
+        pool = device._session._transport._pool  # pylint: disable=protected-access
+        assert pool._max_connections == 4  # pylint: disable=protected-access
+        assert pool._max_keepalive_connections == 4  # pylint: disable=protected-access
+        assert pool._keepalive_expiry is None  # pylint: disable=protected-access
+
+        # The httpx default limits are kept when max_connections is not provided
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta")
+        pool = device._session._transport._pool  # pylint: disable=protected-access
+        assert pool._max_connections == DEFAULT_MAX_CONNECTIONS  # pylint: disable=protected-access
+        assert pool._max_keepalive_connections == DEFAULT_MAX_KEEPALIVE_CONNECTIONS  # pylint: disable=protected-access
+        assert pool._keepalive_expiry == DEFAULT_KEEPALIVE_EXPIRY  # pylint: disable=protected-access
+
+    def test_http2_fallback(self, caplog: pytest.LogCaptureFixture) -> None:
+        """
+        HTTP/1.1 is used when HTTP/2 is requested but the 'h2' package is not installed
+        """
+        with patch("anta.device.importlib.util.find_spec", return_value=None):
+            device = AsyncEOSDevice("42.42.42.42", "anta", "anta", http2=True)
+        assert not device._session._transport._pool._http2  # pylint: disable=protected-access
+        assert "HTTP/2 is not available" in caplog.text
+
+    def test_probe(self) -> None:
+        """
+        Test AsyncEOSDevice.probe() against a listening and a closed local port
+        """
+
+        async def probe() -> tuple[bool, bool]:
+            server = await asyncio.start_server(lambda reader, writer: writer.close(), host="127.0.0.1", port=0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                listening = await AsyncEOSDevice("127.0.0.1", "anta", "anta", port=port, proto="http").probe(timeout=1)
+            closed = await AsyncEOSDevice("127.0.0.1", "anta", "anta", port=port, proto="http").probe(timeout=1)
+            return listening, closed
+
+        assert asyncio.run(probe()) == (True, False)
+
+        # The default timeout does not depend on the timeout of the device
+        for timeout in (None, 30):
+            device = AsyncEOSDevice("127.0.0.1", "anta", "anta", timeout=timeout)
+            with patch("anta.device.port_check_url", return_value=True) as port_check_url:
+                assert asyncio.run(device.probe())
+            port_check_url.assert_called_once_with(device._session.base_url, timeout=DEFAULT_PROBE_TIMEOUT)  # pylint: disable=protected-access
+
+    def test_refresh_facts_cache(self, tmp_path: Path) -> None:
+        """
+        Test AsyncEOSDevice.refresh() with a facts cache
+        """
+        cache = DeviceFactsCache(tmp_path)
+        show_version = {"modelName": "cEOSLab", "version": "4.30.1F", "serialNumber": "ABC", "uptime": 42.0}
+        device = AsyncEOSDevice("42.42.42.42", "anta", "anta", facts_cache=cache)
+        mocked_cli = AsyncMock(return_value=show_version)
+        with patch.object(device._session, "check_connection", AsyncMock(return_value=True)), patch.object(  # pylint: disable=protected-access
+            device._session, "cli", mocked_cli  # pylint: disable=protected-access
+        ):
+            # First refresh populates the cache and keeps the output for the tests
+            asyncio.run(device.refresh())
+            assert device.established
+            assert device.hw_model == "cEOSLab"
+            assert device.refresh_commands[0].json_output == show_version
+            assert cache.get("42.42.42.42", 443) == device.facts
+            # Next refresh uses the cache
+            device = AsyncEOSDevice("42.42.42.42", "anta", "anta", facts_cache=cache)
+        with patch.object(device._session, "check_connection", AsyncMock(return_value=True)), patch.object(  # pylint: disable=protected-access
+            device._session, "cli", mocked_cli  # pylint: disable=protected-access
+        ):
+            asyncio.run(device.refresh())
+            assert mocked_cli.await_count == 2
+            assert mocked_cli.await_args_list[1].kwargs == {"command": "show hostname"}
+            assert device.established
+            assert device.hw_model == "cEOSLab"
+            assert not device.refresh_commands
+        # Devices rejecting the eAPI requests are not established even if their facts are cached
+        device = AsyncEOSDevice("42.42.42.42", "anta", "wrong", facts_cache=cache)
+        with patch.object(device._session, "check_connection", AsyncMock(return_value=True)), patch.object(  # pylint: disable=protected-access
+            device._session, "cli", AsyncMock(side_effect=http_status_error(401))  # pylint: disable=protected-access
+        ):
+            asyncio.run(device.refresh())
+        assert not device.established
+        assert cache.get("42.42.42.42", 443) is None
+        cache.set("42.42.42.42", 443, DeviceFacts.from_show_version(show_version))
+        # Connection errors invalidate the cache
+        with patch.object(device._session, "cli", AsyncMock(side_effect=ConnectError("unreachable"))):  # pylint: disable=protected-access
+            asyncio.run(device.collect(AntaCommand(command="show uptime")))
+        assert cache.get("42.42.42.42", 443) is None
+
+
+class Test_ReplayDevice:
+    """
+    Test ReplayDevice
+    """
+
+    def test_collect_and_refresh(self, tmp_path: Path) -> None:
+        """
+        ReplayDevice serves the outputs recorded in a snapshot
+        """
+        save_command_output(tmp_path, "leaf1", AntaCommand(command="show version", output={"modelName": "cEOSLab"}))
+        save_command_output(tmp_path, "leaf1", AntaCommand(command="show uptime", ofmt="text", output="up 42 days"))
+        snapshot = SnapshotReader(tmp_path)
+        device = ReplayDevice("leaf1", snapshot, tags=["leaf"])
+        asyncio.run(device.refresh())
+        assert device.established
+        assert device.hw_model == "cEOSLab"
+        commands = [AntaCommand(command="show version"), AntaCommand(command="show uptime", ofmt="text"), AntaCommand(command="show bogus")]
+        asyncio.run(device.collect_commands(commands))
+        assert commands[0].json_output == {"modelName": "cEOSLab"}
+        assert commands[1].text_output == "up 42 days"
+        assert isinstance(commands[2].failed, FileNotFoundError)
+        assert device == ReplayDevice("leaf1", snapshot)
+
+        device = ReplayDevice("leaf2", snapshot)
+        asyncio.run(device.refresh())
+        assert not device.established
+
+
+def test_collect_commands_output_cache() -> None:
+    """
+    Test the output cache in the default implementation of AntaDevice.collect_commands
+    """
+    device = FakeDevice(fail=["show bogus"])
+    device.output_cache = CommandOutputCache()
+    asyncio.run(device.collect_commands([AntaCommand(command="show version"), AntaCommand(command="show bogus")]))
+    commands = [AntaCommand(command="show version"), AntaCommand(command="show bogus"), AntaCommand(command="show uptime", ofmt="text")]
+    asyncio.run(device.collect_commands(commands))
+    # Failed commands are not cached
+    assert device.collected_commands == ["show version", "show bogus", "show bogus", "show uptime"]
+    assert commands[0].output == {"command": "show version"}
+    assert commands[2].output == "show uptime"
+    # Commands changing the state of the device are always sent
+    for _ in range(2):
+        asyncio.run(device.collect_commands([AntaCommand(command="clear counters")]))
+    assert device.collected_commands[-2:] == ["clear counters", "clear counters"]
@@ -0,0 +1,62 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.facts.py
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from anta.facts import DeviceFacts, DeviceFactsCache
+
+SHOW_VERSION = {"modelName": "DCS-7280CR3-32P4-F", "version": "4.30.1F", "serialNumber": "JPE00000000", "uptime": 1000.5, "memTotal": 42}
+
+
+def test_device_facts_from_show_version() -> None:
+    """
+    Test DeviceFacts.from_show_version
+    """
+    facts = DeviceFacts.from_show_version(SHOW_VERSION)
+    assert facts.hw_model == "DCS-7280CR3-32P4-F"
+    assert facts.version == "4.30.1F"
+    assert facts.serial_number == "JPE00000000"
+    assert facts.uptime == 1000.5
+    with pytest.raises(KeyError):
+        DeviceFacts.from_show_version({"version": "4.30.1F"})
+
+
+class Test_DeviceFactsCache:
+    """
+    Test anta.facts.DeviceFactsCache
+    """
+
+    def test_set_get_invalidate(self, tmp_path: Path) -> None:
+        """Entries are keyed by host and port"""
+        cache = DeviceFactsCache(tmp_path / "cache")
+        facts = DeviceFacts.from_show_version(SHOW_VERSION)
+        assert cache.get("10.0.0.1", None) is None
+        cache.set("10.0.0.1", None, facts)
+        cache.set("fe80::1", 8443, facts)
+        assert cache.get("10.0.0.1", None) == facts
+        assert cache.get("fe80::1", 8443) == facts
+        assert cache.get("10.0.0.1", 443) is None
+        cache.invalidate("10.0.0.1", None)
+        cache.invalidate("10.0.0.1", None)
+        assert cache.get("10.0.0.1", None) is None
+
+    def test_ttl(self, tmp_path: Path) -> None:
+        """Expired entries are ignored"""
+        cache = DeviceFactsCache(tmp_path, ttl=60)
+        cache.set("10.0.0.1", None, DeviceFacts(hw_model="cEOSLab", timestamp=time.time() - 120))
+        assert cache.get("10.0.0.1", None) is None
+
+    def test_corrupted_entry(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """Corrupted entries are ignored"""
+        cache = DeviceFactsCache(tmp_path)
+        (tmp_path / "10.0.0.1_default.json").write_text("not json", encoding="UTF-8")
+        assert cache.get("10.0.0.1", None) is None
+        assert "Cannot read device facts cache entry" in caplog.text
@@ -0,0 +1,55 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.loader.py
+"""
+from __future__ import annotations
+
+import datetime
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from anta.loader import CatalogCache, parse_catalog
+from anta.tests.configuration import VerifyZeroTouch
+from anta.tests.software import VerifyEOSVersion
+
+CATALOG = {"anta.tests": {"software": [{"VerifyEOSVersion": {"versions": ["4.31.1F"]}}], "configuration": [{"VerifyZeroTouch": None}]}}
+
+
+class Test_CatalogCache:
+    """
+    Test anta.loader.CatalogCache
+    """
+
+    def test_set_get(self, tmp_path: Path) -> None:
+        """Entries are keyed by the catalog content"""
+        cache = CatalogCache(tmp_path / "cache")
+        tests = parse_catalog(CATALOG)
+        assert cache.get(b"catalog") is None
+        cache.set(b"catalog", tests)
+        assert cache.get(b"catalog") == [(VerifyEOSVersion, {"versions": ["4.31.1F"]}), (VerifyZeroTouch, None)]
+        assert cache.get(b"other catalog") is None
+
+    def test_not_json(self, tmp_path: Path) -> None:
+        """Catalogs with inputs which cannot be represented in JSON are not cached"""
+        cache = CatalogCache(tmp_path)
+        cache.set(b"catalog", [(VerifyEOSVersion, {"versions": [datetime.date(2023, 1, 1)]})])
+        # JSON object keys are strings: an integer key would be read back as a string
+        integer_key: dict[Any, Any] = {"versions": ["4.31.1F"], 1: "integer key"}
+        cache.set(b"catalog", [(VerifyEOSVersion, integer_key)])
+        assert not list(tmp_path.iterdir())
+
+    def test_invalid_entry(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """Invalid entries are ignored"""
+        cache = CatalogCache(tmp_path)
+        cache.set(b"catalog", parse_catalog(CATALOG))
+        path = next(tmp_path.iterdir())
+        path.write_text(json.dumps([["anta.tests.software", "VerifyUnknown", None]]), encoding="UTF-8")
+        assert cache.get(b"catalog") is None
+        path.write_text(json.dumps([["anta.loader", "CatalogCache", None]]), encoding="UTF-8")
+        assert cache.get(b"catalog") is None
+        assert "Cannot read catalog cache entry" in caplog.text
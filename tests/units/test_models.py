@@ -16,6 +16,7 @@ import pytest
 from pydantic import ValidationError
 
 from anta.models import AntaCommand, AntaTemplate, AntaTemplateRenderError, AntaTest
+from tests.lib.fake import FakeTestVersion
 from tests.lib.utils import generate_test_ids
 
 
@@ -266,3 +267,45 @@ class Test_AntaTest:
         # Test that the test() code works as expected
         if "message" in data["expected"]["test"]:
             assert data["expected"]["test"]["message"] in test.result.messages
+
+    def test_inputs_hash(self, mocked_device: MagicMock) -> None:
+        """Test the inputs hash of the TestResult"""
+        results = [FakeTestWithInput(mocked_device, inputs=inputs).result for inputs in ({"string": "a"}, {"string": "a"}, {"string": "b"})]
+        assert results[0].inputs_hash is not None
+        assert results[0].inputs_hash == results[1].inputs_hash != results[2].inputs_hash
+        # The inputs hash is set even if the inputs are not valid
+        assert FakeTestWithInput(mocked_device, inputs={"string": 1, "wrong": "input"}).result.inputs_hash is not None
+
+    def test_validate_inputs(self, mocked_device: MagicMock) -> None:
+        """Inputs validated once are shared by the test instances and have the same hash as the inputs dictionary"""
+        inputs = FakeTestWithInput.validate_inputs({"string": "a"})
+        tests = [FakeTestWithInput(mocked_device, inputs=inputs) for _ in range(2)]
+        assert tests[0].inputs is tests[1].inputs is inputs
+        assert tests[0].result.inputs_hash == FakeTestWithInput(mocked_device, inputs={"string": "a"}).result.inputs_hash
+        assert FakeTestWithInput(mocked_device, inputs=FakeTestWithInput.Input(string="a")).result.inputs_hash is not None
+        with pytest.raises(ValidationError):
+            FakeTestWithInput.validate_inputs({"string": 1})
+
+    def test_instance_commands(self, mocked_device: MagicMock) -> None:
+        """The class commands are copied: the outputs of a test instance are not shared with the class or other instances"""
+        tests = [FakeTestVersion(mocked_device, inputs=None) for _ in range(2)]
+        tests[0].instance_commands[0].output = {"modelName": "cEOSLab"}
+        tests[0].instance_commands[0].failed = RuntimeError("fake failure")
+        assert tests[0].instance_commands[0] is not FakeTestVersion.commands[0]
+        assert tests[1].instance_commands[0].output is None
+        assert tests[1].instance_commands[0].failed is None
+        class_command = FakeTestVersion.commands[0]
+        assert isinstance(class_command, AntaCommand)
+        assert class_command.output is None
+        assert tests[1].instance_commands[0] == class_command
+
+
+def test_anta_command_uid() -> None:
+    """
+    Test anta.models.AntaCommand.uid
+    """
+    assert AntaCommand(command="show version").uid == AntaCommand(command="show version", output={"modelName": "cEOSLab"}).uid
+    assert AntaCommand(command="show version").uid == AntaTemplate(template="show {cmd}").render(cmd="version").uid
+    assert AntaCommand(command="show version").uid != AntaCommand(command="show version", ofmt="text").uid
+    assert AntaCommand(command="show version").uid != AntaCommand(command="show version", version=1).uid
+    assert AntaCommand(command="show version").uid != AntaCommand(command="show version", revision=2).uid
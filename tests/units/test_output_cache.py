@@ -0,0 +1,136 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.output_cache.py
+"""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Literal, Optional
+from unittest.mock import patch
+
+import pytest
+
+from anta.models import AntaCommand
+from anta.output_cache import DEFAULT_OUTPUT_CACHE_SIZE, DEFAULT_OUTPUT_CACHE_TTL, CommandOutputCache, is_cacheable
+
+
+def collected(command: str, output: Any, ofmt: Literal["json", "text"] = "json") -> AntaCommand:
+    """Build a collected AntaCommand"""
+    return AntaCommand(command=command, output=output, ofmt=ofmt)
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        pytest.param("show version", True, id="show"),
+        pytest.param("show running-config | section router bgp", True, id="show with modifier"),
+        pytest.param("show interfaces | include Ethernet | no-more", True, id="show with modifiers"),
+        pytest.param("show running-config | redirect flash:backup", False, id="redirect"),
+        pytest.param("show version | tee flash:version", False, id="tee"),
+        pytest.param("show version |", False, id="empty modifier"),
+        pytest.param("clear counters", False, id="clear"),
+        pytest.param("configure", False, id="configure"),
+        pytest.param("bash timeout 10 ls", False, id="bash"),
+        pytest.param("", False, id="empty"),
+    ],
+)
+def test_is_cacheable(command: str, expected: bool) -> None:
+    """
+    Test anta.output_cache.is_cacheable
+    """
+    assert is_cacheable(AntaCommand(command=command)) is expected
+
+
+@pytest.mark.parametrize("directory", [None, "cache"], ids=["memory", "disk"])
+class Test_CommandOutputCache:
+    """
+    Test anta.output_cache.CommandOutputCache in memory and on disk
+    """
+
+    @staticmethod
+    def cache(tmp_path: Path, directory: Optional[str], ttl: float = DEFAULT_OUTPUT_CACHE_TTL, max_entries: int = DEFAULT_OUTPUT_CACHE_SIZE) -> CommandOutputCache:
+        """Build the cache to test"""
+        return CommandOutputCache(tmp_path / directory if directory is not None else None, ttl=ttl, max_entries=max_entries)
+
+    def test_set_get(self, tmp_path: Path, directory: Optional[str]) -> None:
+        """Entries are keyed by device name, command, output format, version and revision"""
+        cache = self.cache(tmp_path, directory)
+        assert cache.get("leaf1", AntaCommand(command="show version")) is None
+        cache.set("leaf1", collected("show version", {"modelName": "cEOSLab"}))
+        cache.set("leaf1", collected("show version", "cEOSLab", ofmt="text"))
+        cache.set("leaf1", AntaCommand(command="show uptime"))
+        assert cache.get("leaf1", AntaCommand(command="show version")) == {"modelName": "cEOSLab"}
+        assert cache.get("leaf1", AntaCommand(command="show version", ofmt="text")) == "cEOSLab"
+        assert cache.get("leaf1", AntaCommand(command="show version", version=1)) is None
+        assert cache.get("leaf1", AntaCommand(command="show version", revision=2)) is None
+        assert cache.get("leaf2", AntaCommand(command="show version")) is None
+        # Commands which are not collected are not cached
+        assert cache.get("leaf1", AntaCommand(command="show uptime")) is None
+        assert len(cache) == 2
+
+    def test_not_cacheable(self, tmp_path: Path, directory: Optional[str]) -> None:
+        """Commands which are not read-only are never cached"""
+        cache = self.cache(tmp_path, directory)
+        cache.set("leaf1", collected("clear counters", {}))
+        cache.set("leaf1", collected("bash timeout 10 ls", "", ofmt="text"))
+        assert cache.get("leaf1", AntaCommand(command="clear counters")) is None
+        assert len(cache) == 0
+
+    def test_ttl(self, tmp_path: Path, directory: Optional[str]) -> None:
+        """Expired entries are removed"""
+        cache = self.cache(tmp_path, directory, ttl=60)
+        cache.set("leaf1", collected("show version", {"modelName": "cEOSLab"}))
+        with patch("time.time", return_value=time.time() + 120):
+            assert cache.get("leaf1", AntaCommand(command="show version")) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, tmp_path: Path, directory: Optional[str]) -> None:
+        """The least recently used entries are evicted"""
+        cache = self.cache(tmp_path, directory, max_entries=2)
+        cache.set("leaf1", collected("show version", {}))
+        cache.set("leaf1", collected("show uptime", {}))
+        if cache.directory is not None:
+            # The time of the last use of an entry is the modification time of its file
+            for age, command in ((20, "show version"), (10, "show uptime")):
+                path = cache.directory / f"{cache.key('leaf1', AntaCommand(command=command))}.json"
+                os.utime(path, (time.time() - age, time.time() - age))
+        assert cache.get("leaf1", AntaCommand(command="show version")) == {}
+        cache.set("leaf1", collected("show interfaces", {}))
+        assert len(cache) == 2
+        assert cache.get("leaf1", AntaCommand(command="show uptime")) is None
+        assert cache.get("leaf1", AntaCommand(command="show version")) == {}
+        assert cache.get("leaf1", AntaCommand(command="show interfaces")) == {}
+
+    def test_batch_eviction(self, tmp_path: Path, directory: Optional[str]) -> None:
+        """The on-disk cache evicts a tenth of the entries at once and does not list the directory on each write"""
+        cache = self.cache(tmp_path, directory, max_entries=20)
+        for index in range(20):
+            cache.set("leaf1", collected(f"show interfaces Ethernet{index}", {}))
+        assert len(cache) == 20
+        cache.set("leaf1", collected("show version", {}))
+        assert len(cache) == (18 if cache.directory is not None else 20)
+        if cache.directory is not None:
+            with patch.object(Path, "glob") as glob:
+                cache.set("leaf1", collected("show uptime", {}))
+                cache.set("leaf1", collected("show version", {}))
+            glob.assert_not_called()
+            assert len(cache) == 19
+            # Deleting an expired entry is tracked
+            with patch("time.time", return_value=time.time() + 3600):
+                assert cache.get("leaf1", AntaCommand(command="show uptime")) is None
+            assert cache._disk_entries == len(cache) == 18  # pylint: disable=protected-access
+
+
+def test_corrupted_entry(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Corrupted entries of the on-disk cache are ignored
+    """
+    cache = CommandOutputCache(tmp_path)
+    command = AntaCommand(command="show version")
+    (tmp_path / f"{cache.key('leaf1', command)}.json").write_text("not json", encoding="UTF-8")
+    assert cache.get("leaf1", command) is None
+    assert "Cannot read command output cache entry" in caplog.text
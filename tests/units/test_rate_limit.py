@@ -0,0 +1,99 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.rate_limit.py
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from httpx import ConnectError, ConnectTimeout, PoolTimeout, ReadTimeout
+
+from anta.rate_limit import CircuitBreaker, TokenBucket, backoff_delay, is_overload
+from tests.lib.utils import http_status_error
+
+
+@pytest.mark.parametrize(
+    "exception, expected",
+    [
+        pytest.param(http_status_error(429), True, id="429"),
+        pytest.param(http_status_error(503), True, id="503"),
+        pytest.param(ConnectTimeout("timeout"), True, id="connect timeout"),
+        pytest.param(PoolTimeout("timeout"), True, id="pool timeout"),
+        pytest.param(ReadTimeout("timeout"), False, id="read timeout"),
+        pytest.param(http_status_error(401), False, id="401"),
+        pytest.param(ConnectError("unreachable"), False, id="connect error"),
+    ],
+)
+def test_is_overload(exception: Exception, expected: bool) -> None:
+    """
+    Test anta.rate_limit.is_overload
+    """
+    assert is_overload(exception) is expected
+
+
+def test_backoff_delay() -> None:
+    """
+    Test anta.rate_limit.backoff_delay
+    """
+    with patch("random.uniform", side_effect=lambda low, high: high):
+        assert [backoff_delay(attempt, base=0.5, maximum=3) for attempt in range(4)] == [0.5, 1, 2, 3]
+    assert all(0 <= backoff_delay(attempt) <= 10 for attempt in range(10))
+
+
+class Test_TokenBucket:
+    """
+    Test anta.rate_limit.TokenBucket
+    """
+
+    def test_acquire(self) -> None:
+        """Requests beyond the burst are delayed to respect the rate"""
+        bucket = TokenBucket(rate=100, burst=2)
+
+        async def acquire(count: int) -> float:
+            start = time.monotonic()
+            for _ in range(count):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        # 2 requests are sent at once, the 3 others are delayed by 10ms each
+        assert asyncio.run(acquire(5)) >= 0.025
+
+    def test_adaptive_rate(self) -> None:
+        """The rate is halved when the device is overloaded and increased back to the configured rate"""
+        bucket = TokenBucket(rate=10)
+        bucket.slow_down()
+        assert bucket.rate == 5
+        for _ in range(10):
+            bucket.slow_down()
+        assert bucket.rate == 1
+        bucket.speed_up()
+        assert bucket.rate == 2
+        for _ in range(20):
+            bucket.speed_up()
+        assert bucket.rate == 10
+
+
+def test_circuit_breaker() -> None:
+    """
+    Test anta.rate_limit.CircuitBreaker
+    """
+    breaker = CircuitBreaker("leaf1", threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+    # Requests are allowed again after the reset timeout: the circuit is opened again by a failure
+    with patch("time.monotonic", return_value=time.monotonic() + 120):
+        assert not breaker.is_open
+        breaker.record_failure()
+        assert breaker.is_open
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.failures == 0
@@ -0,0 +1,304 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.runner.py
+"""
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import weakref
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from anta.inventory import AntaInventory
+from anta.models import AntaCommand, AntaTest
+from anta.result_manager import ResultManager
+from anta.runner import collect_tests_commands, instantiate_tests, limit_concurrency, main, release_commands_outputs, run_device_tests, validate_catalog
+from anta.state import StateStore
+from anta.tests.hardware import VerifyTemperature
+from anta.tests.software import VerifyEOSVersion
+from anta.tests.system import VerifyMemoryUtilization
+from tests.lib.fake import FakeDevice, FakeTestVersion, FakeTestVersionAndInterfaces
+
+
+def run(coro: Any) -> Any:
+    """Run a coroutine in a new event loop"""
+    return asyncio.run(coro)
+
+
+class Test_collect_tests_commands:
+    """
+    Test anta.runner.collect_tests_commands
+    """
+
+    def test_deduplication(self) -> None:
+        """Identical commands are collected once and shared between tests"""
+        device = FakeDevice()
+        tests = [
+            FakeTestVersion(device, inputs=None),
+            FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet1"}),
+            FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet1"}),
+            FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet2"}),
+        ]
+        run(collect_tests_commands(device, tests))
+        assert sorted(device.collected_commands) == sorted(["show version", "show version", "show interfaces Ethernet1", "show interfaces Ethernet2"])
+        assert all(test.collected for test in tests)
+        assert tests[1].instance_commands[1].output is tests[2].instance_commands[1].output
+
+    def test_ignore_error_and_collected(self) -> None:
+        """Tests in error and commands with an output are not collected"""
+        device = FakeDevice()
+        tests = [
+            FakeTestVersion(device, inputs=None, eos_data=[{"command": "show version"}]),
+            FakeTestVersionAndInterfaces(device, inputs={"interface": 1}),
+        ]
+        assert tests[1].result.result == "error"
+        run(collect_tests_commands(device, tests))
+        assert not device.collected_commands
+
+    def test_shared_failure(self) -> None:
+        """A failed command is not collected again by each test"""
+        device = FakeDevice(fail=["show version"])
+        tests = [FakeTestVersion(device, inputs=None), FakeTestVersion(device, inputs=None)]
+        manager = ResultManager()
+        run(run_device_tests(manager, device, tests))
+        assert device.collected_commands == ["show version"]
+        assert [result.result for result in manager.get_results()] == ["error", "error"]
+
+    def test_skip_on_platforms(self) -> None:
+        """The commands of the tests skipped on the hardware model of the device are not collected"""
+        device = FakeDevice()
+        device.hw_model = "cEOSLab"
+        tests = [VerifyTemperature(device, inputs=None), FakeTestVersion(device, inputs=None)]
+        manager = ResultManager()
+        run(run_device_tests(manager, device, tests))
+        assert device.collected_commands == ["show version"]
+        assert sorted(result.result for result in manager.get_results()) == ["skipped", "success"]
+        # The test is run on other platforms
+        device = FakeDevice()
+        device.hw_model = "DCS-7280CR3-32P4-F"
+        run(collect_tests_commands(device, [VerifyTemperature(device, inputs=None)]))
+        assert device.collected_commands == ["show system environment temperature"]
+
+
+def test_run_device_tests() -> None:
+    """
+    Test anta.runner.run_device_tests
+    """
+    device = FakeDevice()
+    tests = [FakeTestVersion(device, inputs=None), FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet1"})]
+    manager = ResultManager()
+    run(run_device_tests(manager, device, tests))
+    assert len(manager) == 2
+    assert manager.get_status() == "success"
+    assert manager.get_result_by_test("FakeTestVersion", output_format="list")[0].messages == ["show version"]
+    assert manager.get_result_by_test("FakeTestVersionAndInterfaces", output_format="list")[0].messages == ["show interfaces Ethernet1"]
+    assert len(device.collected_commands) == 3
+
+
+class Test_limit_concurrency:
+    """
+    Test anta.runner.limit_concurrency
+    """
+
+    def test_limits(self) -> None:
+        """The number of coroutines running concurrently never exceeds the semaphores values"""
+        running = 0
+        max_running = 0
+
+        async def work() -> int:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return 42
+
+        async def run_all() -> list[int]:
+            device_semaphore = asyncio.Semaphore(3)
+            global_semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(*(limit_concurrency(work(), [device_semaphore, global_semaphore]) for _ in range(10)))
+
+        assert run(run_all()) == [42] * 10
+        assert max_running == 2
+
+    def test_release_on_error(self) -> None:
+        """Semaphores are released when the coroutine raises"""
+
+        async def fail() -> None:
+            raise RuntimeError("fail")
+
+        async def run_all() -> asyncio.Semaphore:
+            semaphore = asyncio.Semaphore(1)
+            results = await asyncio.gather(*(limit_concurrency(fail(), [semaphore]) for _ in range(3)), return_exceptions=True)
+            assert all(isinstance(result, RuntimeError) for result in results)
+            return semaphore
+
+        assert not run(run_all()).locked()
+
+
+def test_run_device_tests_concurrency() -> None:
+    """
+    Test anta.runner.run_device_tests with a per-device concurrency limit
+    """
+    device = FakeDevice()
+    tests = [FakeTestVersion(device, inputs=None) for _ in range(5)]
+    manager = ResultManager()
+    run(run_device_tests(manager, device, tests, max_device_concurrency=1, global_semaphore=None))
+    assert [result.result for result in manager.get_results()] == ["success"] * 5
+    assert device.collected_commands == ["show version"]
+
+
+def test_release_commands_outputs(tmp_path: Path) -> None:
+    """
+    Test anta.runner.release_commands_outputs
+    """
+    device = FakeDevice()
+    tests = [FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet1/1"}) for _ in range(2)]
+    manager = ResultManager()
+    run(run_device_tests(manager, device, tests, spool_dir=tmp_path))
+    assert manager.get_status() == "success"
+    assert all(command.output is None for test in tests for command in test.instance_commands)
+    assert json.loads((tmp_path / "fake" / "json" / "show version.json").read_text(encoding="utf-8")) == {"command": "show version"}
+    assert json.loads((tmp_path / "fake" / "json" / "show interfaces Ethernet1_1.json").read_text(encoding="utf-8")) == {"command": "show interfaces Ethernet1/1"}
+    assert (tmp_path / "fake" / "text" / "show version.log").read_text(encoding="utf-8") == "show version"
+
+    # Without spool directory, outputs are only released
+    test = FakeTestVersion(device, inputs=None, eos_data=[{"command": "show version"}])
+    release_commands_outputs(test)
+    assert test.instance_commands[0].output is None
+
+
+def test_collect_tests_commands_refresh_commands() -> None:
+    """
+    Commands already collected by refresh() are not collected again
+    """
+    device = FakeDevice()
+    device.refresh_commands = [AntaCommand(command="show version", output={"command": "refresh"})]
+    tests = [FakeTestVersion(device, inputs=None), FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet1"})]
+    run(collect_tests_commands(device, tests))
+    assert sorted(device.collected_commands) == ["show interfaces Ethernet1", "show version"]
+    assert tests[0].instance_commands[0].json_output == {"command": "refresh"}
+    assert tests[1].instance_commands[2].text_output == "show version"
+
+
+def test_run_device_tests_state_store(tmp_path: Path) -> None:
+    """
+    Test anta.runner.run_device_tests with a state store
+    """
+    store = StateStore(tmp_path)
+
+    def run_tests(device: FakeDevice) -> ResultManager:
+        tests = [FakeTestVersion(device, inputs=None), FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet1"})]
+        manager = ResultManager()
+        run(run_device_tests(manager, device, tests, state_store=store))
+        return manager
+
+    # First run: the fingerprint commands are shared with the tests
+    device = FakeDevice()
+    manager = run_tests(device)
+    assert manager.get_status() == "success"
+    assert sorted(device.collected_commands) == ["show interfaces Ethernet1", "show interfaces status", "show running-config", "show version", "show version"]
+
+    # Same fingerprint: the stored results are reused
+    device = FakeDevice()
+    reused = run_tests(device)
+    assert sorted(device.collected_commands) == ["show interfaces status", "show running-config", "show version"]
+    assert sorted(reused.get_results(), key=lambda result: result.test) == sorted(manager.get_results(), key=lambda result: result.test)
+
+    # The device state has changed: all the tests are run
+    device = FakeDevice(payload_size=1)
+    assert run_tests(device).get_status() == "success"
+    assert "show interfaces Ethernet1" in device.collected_commands
+
+    # The fingerprint cannot be collected: all the tests are run and the state is not updated
+    device = FakeDevice(fail=["show running-config"])
+    state = store.get("fake")
+    run_tests(device)
+    assert "show interfaces Ethernet1" in device.collected_commands
+    assert store.get("fake") == state
+
+
+def test_run_device_tests_state_store_config_only(tmp_path: Path) -> None:
+    """
+    Test anta.runner.run_device_tests with a state store: the tests depending on the operational state are always run
+    """
+    store = StateStore(tmp_path)
+    fingerprints = []
+    for mem_free, expected in ((90, "success"), (10, "failure")):
+        device = FakeDevice(outputs={"show version": {"version": "4.30.1F", "memTotal": 100, "memFree": mem_free}})
+        tests = [VerifyEOSVersion(device, inputs={"versions": ["4.30.1F"]}), VerifyMemoryUtilization(device, inputs=None)]
+        manager = ResultManager()
+        run(run_device_tests(manager, device, tests, state_store=store))
+        assert {result.test: result.result for result in manager.get_results()} == {"VerifyEOSVersion": "success", "VerifyMemoryUtilization": expected}
+        fingerprints.append(store.get("fake").fingerprint)  # type: ignore[union-attr]
+    # memFree is not part of the fingerprint: only the result of VerifyEOSVersion has been reused
+    assert fingerprints[0] == fingerprints[1]
+
+
+def test_validate_catalog() -> None:
+    """
+    Test anta.runner.validate_catalog and anta.runner.instantiate_tests
+    """
+    catalog = validate_catalog(
+        [(FakeTestVersion, None), (FakeTestVersionAndInterfaces, {"interface": "Ethernet1"}), (FakeTestVersionAndInterfaces, {"interface": 1})]
+    )
+    assert isinstance(catalog[1][1], FakeTestVersionAndInterfaces.Input)
+    # Invalid inputs are kept as is
+    assert catalog[2][1] == {"interface": 1}
+
+    tests = [instantiate_tests(FakeDevice(name=name), catalog) for name in ("leaf1", "leaf2")]
+    assert tests[0][1].inputs is tests[1][1].inputs
+    assert [test.result.result for test in tests[0]] == ["unset", "unset", "error"]
+    # Errors when creating a test are logged
+    assert len(instantiate_tests(FakeDevice(), [(None, None)])) == 0  # type: ignore[list-item]
+
+
+def test_run_device_tests_lazy() -> None:
+    """
+    Test anta.runner.run_device_tests instantiating the tests once a slot is available
+    """
+    device = FakeDevice()
+    manager = ResultManager()
+
+    async def run_tests() -> None:
+        semaphore = asyncio.Semaphore(1)
+
+        def build_tests() -> list[AntaTest]:
+            assert semaphore.locked()
+            return [FakeTestVersion(device, inputs=None)]
+
+        await run_device_tests(manager, device, build_tests, global_semaphore=semaphore)
+
+    run(run_tests())
+    assert manager.get_status() == "success"
+
+
+def test_main_devices_in_flight() -> None:
+    """
+    Test anta.runner.main only keeping the tests of `max_concurrency` devices in memory
+    """
+    inventory = AntaInventory()
+    for index in range(20):
+        inventory.add_device(FakeDevice(name=f"leaf{index}", latency=0.001))
+    catalog: list[tuple[type[AntaTest], Any]] = [(FakeTestVersion, None)] * 3
+    manager = ResultManager()
+    live: weakref.WeakSet[AntaTest] = weakref.WeakSet()
+    peak = 0
+    init = FakeTestVersion.__init__
+
+    def counting_init(self: FakeTestVersion, *args: Any, **kwargs: Any) -> None:
+        nonlocal peak
+        init(self, *args, **kwargs)
+        live.add(self)
+        gc.collect()
+        peak = max(peak, len(live))
+
+    with patch.object(FakeTestVersion, "__init__", counting_init):
+        run(main(manager, inventory, catalog, max_concurrency=2))
+    assert len(manager) == 60
+    assert peak <= 2 * len(catalog)
@@ -0,0 +1,117 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+test anta.state.py
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from anta.models import AntaCommand
+from anta.result_manager.models import TestResult
+from anta.state import DeviceState, StateStore, StoredResult, device_fingerprint
+from tests.lib.fake import FakeDevice, FakeTestVersion, FakeTestVersionAndInterfaces
+
+
+def test_device_fingerprint() -> None:
+    """
+    Test anta.state.device_fingerprint
+    """
+    commands = [
+        AntaCommand(command="show version", output={"version": "4.30.1F", "uptime": 10.0}),
+        AntaCommand(command="show running-config", ofmt="text", output="!"),
+    ]
+    fingerprint = device_fingerprint(commands)
+    assert fingerprint is not None
+    # Volatile keys are ignored
+    commands[0].output = {"version": "4.30.1F", "uptime": 20.0}
+    assert device_fingerprint(commands) == fingerprint
+    commands[1].output = "hostname leaf1"
+    assert device_fingerprint(commands) != fingerprint
+    # The results stored by another ANTA version are not reused
+    with patch("anta.state.__version__", "v0.0.0"):
+        assert device_fingerprint(commands) not in (None, fingerprint)
+    commands[1].failed = RuntimeError("fake failure")
+    assert device_fingerprint(commands) is None
+
+
+class Test_StateStore:
+    """
+    Test anta.state.StateStore
+    """
+
+    def test_set_get(self, tmp_path: Path) -> None:
+        """States are keyed by device name"""
+        store = StateStore(tmp_path / "state")
+        result = TestResult(name="leaf1", test="FakeTestVersion", categories=[], description="", result="success", inputs_hash="42")
+        state = DeviceState(fingerprint="fingerprint", results=[StoredResult(timestamp=1.0, result=result)])
+        assert store.get("leaf1") is None
+        store.set("leaf1", state)
+        store.set("pod1/leaf1", state)
+        assert store.get("leaf1") == state
+        assert store.get("pod1/leaf1") == state
+        assert store.get("leaf2") is None
+
+    def test_corrupted_state(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """Corrupted states are ignored"""
+        store = StateStore(tmp_path)
+        (tmp_path / "leaf1.json").write_text("not json", encoding="UTF-8")
+        assert store.get("leaf1") is None
+        assert "Cannot read state file" in caplog.text
+
+    def test_collect_fingerprint(self) -> None:
+        """Commands collected by refresh() are reused"""
+        device = FakeDevice()
+        device.refresh_commands = [AntaCommand(command="show version", output={"command": "refresh"})]
+        commands = asyncio.run(StateStore(Path()).collect_fingerprint(device))
+        assert device.collected_commands == ["show running-config", "show interfaces status"]
+        assert [command.output for command in commands] == [{"command": "refresh"}, "show running-config", {"command": "show interfaces status"}]
+        assert device_fingerprint(commands) is not None
+
+        device = FakeDevice(fail=["show running-config"])
+        assert device_fingerprint(asyncio.run(StateStore(Path()).collect_fingerprint(device))) is None
+
+    def test_reuse(self, tmp_path: Path) -> None:
+        """Stored results are reused if the fingerprint and the inputs are the same and the result is not too old"""
+        store = StateStore(tmp_path, max_age=60)
+        device = FakeDevice()
+        version = FakeTestVersion(device, inputs=None)
+        ethernet1 = FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet1"})
+        ethernet2 = FakeTestVersionAndInterfaces(device, inputs={"interface": "Ethernet2"})
+        tests = [version, ethernet1, ethernet2]
+
+        # No state
+        assert store.reuse("fake", "fingerprint", tests) == (tests, [])
+
+        results = [test.result.model_copy() for test in tests]
+        results[0].is_success()
+        results[1].is_error("error")
+        results[2].is_failure("failure")
+        store.update("fake", "fingerprint", [StoredResult(timestamp=time.time(), result=result) for result in results])
+        # Results in error are not stored
+        assert [entry.result.test for entry in store.get("fake").results] == ["FakeTestVersion", "FakeTestVersionAndInterfaces"]  # type: ignore[union-attr]
+
+        to_run, reused = store.reuse("fake", "fingerprint", tests)
+        assert to_run == [ethernet1]
+        assert [entry.result.result for entry in reused] == ["success", "failure"]
+        assert reused[1].result.inputs_hash == ethernet2.result.inputs_hash
+
+        # The results of the tests which do not only depend on the configuration are not reused
+        with patch.object(FakeTestVersion, "config_only", False):
+            to_run, reused = store.reuse("fake", "fingerprint", tests)
+        assert to_run == [version, ethernet1]
+        assert [entry.result.test for entry in reused] == ["FakeTestVersionAndInterfaces"]
+
+        # Device fingerprint has changed
+        assert store.reuse("fake", "other", tests) == (tests, [])
+        assert store.reuse("fake", None, tests) == (tests, [])
+
+        # Stored results are too old
+        store.update("fake", "fingerprint", [StoredResult(timestamp=time.time() - 120, result=result) for result in results])
+        assert store.reuse("fake", "fingerprint", tests) == (tests, [])
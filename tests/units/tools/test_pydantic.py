@@ -26,6 +26,7 @@ EXPECTED_ONE_ENTRY = [
         "result": "unset",
         "messages": [],
         "custom_field": "None",
+        "inputs_hash": "None",
     }
 ]
 EXPECTED_THREE_ENTRIES = [
@@ -38,6 +39,7 @@ EXPECTED_THREE_ENTRIES = [
         "result": "unset",
         "messages": [],
         "custom_field": "None",
+        "inputs_hash": "None",
     },
     {
         "name": "testdevice",
@@ -48,6 +50,7 @@ EXPECTED_THREE_ENTRIES = [
         "result": "unset",
         "messages": [],
         "custom_field": "None",
+        "inputs_hash": "None",
     },
     {
         "name": "testdevice",
@@ -58,6 +61,7 @@ EXPECTED_THREE_ENTRIES = [
         "result": "unset",
         "messages": [],
         "custom_field": "None",
+        "inputs_hash": "None",
     },
 ]
 
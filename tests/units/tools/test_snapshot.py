@@ -0,0 +1,72 @@
+# Copyright (c) 2023 Arista Networks, Inc.
+# Use of this source code is governed by the Apache License 2.0
+# that can be found in the LICENSE file.
+"""
+Tests for anta.tools.snapshot
+"""
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from anta.models import AntaCommand
+from anta.tools.snapshot import SnapshotReader, command_output_path, save_command_output
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        pytest.param(AntaCommand(command="show version"), Path("dev/json/show version.json"), id="json"),
+        pytest.param(AntaCommand(command="show version", ofmt="text"), Path("dev/text/show version.log"), id="text"),
+        pytest.param(AntaCommand(command="show ip route 10.0.0.0/8"), Path("dev/json/show ip route 10.0.0.0_8.json"), id="slash"),
+    ],
+)
+def test_command_output_path(tmp_path: Path, command: AntaCommand, expected: Path) -> None:
+    """
+    Test command_output_path
+    """
+    assert command_output_path(tmp_path, "dev", command) == tmp_path / expected
+
+
+def test_save_command_output(tmp_path: Path) -> None:
+    """
+    Test save_command_output
+    """
+    path = save_command_output(tmp_path, "dev", AntaCommand(command="show version", ofmt="text", output="EOS"))
+    assert path.read_text(encoding="utf-8") == "EOS"
+    with pytest.raises(RuntimeError):
+        save_command_output(tmp_path, "dev", AntaCommand(command="show version"))
+
+
+@pytest.mark.parametrize("archive", [None, "zip", "gztar"])
+def test_snapshot_reader(tmp_path: Path, archive: Optional[str]) -> None:
+    """
+    Test SnapshotReader with a snapshot directory and archives
+    """
+    root = tmp_path / "snapshot" / "anta_snapshot"
+    save_command_output(root, "dev", AntaCommand(command="show version", output={"modelName": "cEOSLab"}))
+    save_command_output(root, "dev", AntaCommand(command="show ip route 10.0.0.0/8", ofmt="text", output="routes"))
+    save_command_output(root, "dev2", AntaCommand(command="show uptime", output={"upTime": 42}))
+    path = root if archive is None else Path(shutil.make_archive(str(tmp_path / "archive"), archive, root_dir=tmp_path / "snapshot"))
+    reader = SnapshotReader(path)
+    try:
+        assert reader.devices == {"dev", "dev2"}
+        assert reader.read("dev", AntaCommand(command="show version")) == {"modelName": "cEOSLab"}
+        assert reader.read("dev", AntaCommand(command="show ip route 10.0.0.0/8", ofmt="text")) == "routes"
+        with pytest.raises(FileNotFoundError):
+            reader.read("dev2", AntaCommand(command="show version"))
+    finally:
+        reader.close()
+
+
+def test_snapshot_reader_invalid(tmp_path: Path) -> None:
+    """
+    Test SnapshotReader with a file that is not an archive
+    """
+    path = tmp_path / "snapshot.txt"
+    path.write_text("not an archive", encoding="utf-8")
+    with pytest.raises(ValueError):
+        SnapshotReader(path)